@@ -19,7 +19,7 @@ cdef extern from *:
     void ifdef_win32 "#ifdef _WIN32"()
 
 cdef extern from "_isnan.h":
-    int isnan (float)
+    int isnan (float) nogil
 
 
 # Inline max and min functions used below
@@ -122,6 +122,55 @@ def map_colors(
 
     return rgba.reshape(shape)
 
+ctypedef fused color_data:
+    np.float32_t
+    np.float64_t
+
+ctypedef fused index_data:
+    np.uint8_t
+    np.uint16_t
+
+
+@cython.wraparound(False)
+@cython.boundscheck(False)
+@cython.cdivision(True)
+cdef void _map_colors_uint8(color_data[::1] data,
+                            int steps,
+                            float low,
+                            float range_diff,
+                            np.uint8_t[:] red_lut,
+                            np.uint8_t[:] green_lut,
+                            np.uint8_t[:] blue_lut,
+                            np.uint8_t[:] alpha_lut,
+                            np.uint8_t[:, ::1] rgba) noexcept nogil:
+    cdef Py_ssize_t i
+    cdef int idx
+    cdef float value, norm_value
+
+    for i in range(data.shape[0]):
+        # The data is mapped in single precision, whatever its type
+        value = <float> data[i]
+        if isnan(value):
+            rgba[i, 0] = 0
+            rgba[i, 1] = 0
+            rgba[i, 2] = 0
+            rgba[i, 3] = 0
+        else:
+            # range_diff has already been confirmed as non-zero
+            norm_value = (value - low) / range_diff
+            if norm_value > 1:
+                idx = steps - 1
+            elif norm_value < 0:
+                idx = 0
+            else:
+                idx = <int> ((steps - 1) * norm_value)
+
+            rgba[i, 0] = red_lut[idx]
+            rgba[i, 1] = green_lut[idx]
+            rgba[i, 2] = blue_lut[idx]
+            rgba[i, 3] = alpha_lut[idx]
+
+
 @cython.wraparound(False)
 @cython.boundscheck(False)
 @cython.cdivision(True)
@@ -129,14 +178,18 @@ def map_colors_uint8(data_array not None,
                int steps,
                float low,
                float high,
-               np.ndarray[np.uint8_t] red_lut not None,
-               np.ndarray[np.uint8_t] green_lut not None,
-               np.ndarray[np.uint8_t] blue_lut not None,
-               np.ndarray[np.uint8_t] alpha_lut not None
+               np.uint8_t[:] red_lut not None,
+               np.uint8_t[:] green_lut not None,
+               np.uint8_t[:] blue_lut not None,
+               np.uint8_t[:] alpha_lut not None,
+               out=None
                ):
     '''
     Map colors from color lookup tables to a data array.
 
+    The GIL is released while the colors are mapped, so that different parts
+    of an array can be mapped in parallel threads.
+
     Parameters
     ----------
     data_array : ndarray
@@ -155,6 +208,9 @@ def map_colors_uint8(data_array not None,
         The blue channel lookup table
     alpha_lut : ndarray of uint8
         The alpha channel lookup table
+    out : ndarray of uint8, optional
+        A C-contiguous array of shape data_array.shape + (4,) to write the
+        colors into.
 
     Returns
     -------
@@ -163,11 +219,15 @@ def map_colors_uint8(data_array not None,
         of this array is equal to data_array.shape + (4,).
 
     '''
-    shape = data_array.shape + (4,)
-    cdef int i, idx, N = data_array.size
-    cdef float norm_value, range_diff
-    cdef char red, green, blue, alpha
-    cdef np.ndarray[np.uint8_t, ndim=2] rgba = np.empty((N, 4), np.uint8)
+    data_array = np.asarray(data_array)
+    rgba_array = _uint8_output(data_array, out)
+    cdef np.uint8_t[:, ::1] rgba = rgba_array.reshape(-1, 4)
+    cdef Py_ssize_t i, N = rgba.shape[0]
+    cdef int idx
+    cdef float range_diff
+    cdef np.uint8_t red, green, blue, alpha
+    cdef np.float32_t[::1] data32
+    cdef np.float64_t[::1] data64
 
     range_diff = high - low
 
@@ -180,39 +240,372 @@ def map_colors_uint8(data_array not None,
         green = green_lut[idx]
         blue = blue_lut[idx]
         alpha = alpha_lut[idx]
-        for i in range(N):
-            rgba[i, 0] = red
-            rgba[i, 1] = green
-            rgba[i, 2] = blue
-            rgba[i, 3] = alpha
-        return rgba.reshape(shape)
+        with nogil:
+            for i in range(N):
+                rgba[i, 0] = red
+                rgba[i, 1] = green
+                rgba[i, 2] = blue
+                rgba[i, 3] = alpha
+        return rgba_array
+
+    # Double precision data is read directly, other types are copied into a
+    # float32 array so we can use fast iteration.
+    if data_array.dtype == np.float64:
+        data64 = np.ascontiguousarray(data_array).reshape(-1)
+        with nogil:
+            _map_colors_uint8(data64, steps, low, range_diff, red_lut,
+                              green_lut, blue_lut, alpha_lut, rgba)
+    else:
+        data32 = np.ascontiguousarray(
+            data_array, dtype=np.float32
+        ).reshape(-1)
+        with nogil:
+            _map_colors_uint8(data32, steps, low, range_diff, red_lut,
+                              green_lut, blue_lut, alpha_lut, rgba)
+
+    return rgba_array
 
-    # Copy the data into a float32 array so we can use fast iteration.
-    cdef np.ndarray[np.float32_t] norm_data = np.empty(N, np.float32)
-    norm_data[:] = data_array.flat
 
-    for i in range(N):
-        if isnan(norm_data[i]):
-            rgba[i, 0] = 0
-            rgba[i, 1] = 0
-            rgba[i, 2] = 0
-            rgba[i, 3] = 0
-        else:
-            # range_diff has already been confirmed as non-zero
-            norm_value = (norm_data[i] - low) / range_diff
-            if norm_value > 1:
-                idx = steps - 1
-            elif norm_value < 0:
-                idx = 0
+@cython.wraparound(False)
+@cython.boundscheck(False)
+cdef void _gather_colors_uint8(index_data[::1] data,
+                               np.uint32_t[::1] lut,
+                               np.uint32_t[::1] rgba) noexcept nogil:
+    cdef Py_ssize_t i
+    for i in range(data.shape[0]):
+        rgba[i] = lut[data[i]]
+
+
+def gather_colors_uint8(data_array not None, lut not None, out=None):
+    '''
+    Map integer data to colors by looking each value up in a color table.
+
+    The GIL is released while the colors are gathered, so that different
+    parts of an array can be mapped in parallel threads.
+
+    Parameters
+    ----------
+    data_array : ndarray of uint8 or uint16
+        The data array
+    lut : ndarray of uint8
+        The rgba color of every possible data value, as a (256, 4) array for
+        uint8 data or a (65536, 4) array for uint16 data.
+    out : ndarray of uint8, optional
+        A C-contiguous array of shape data_array.shape + (4,) to write the
+        colors into.
+
+    Returns
+    -------
+    rgba: ndarray of uint8
+        The rgba values of data_array according to the lookup table. The shape
+        of this array is equal to data_array.shape + (4,).
+
+    '''
+    data_array = np.asarray(data_array)
+    if data_array.dtype not in (np.uint8, np.uint16):
+        raise ValueError("data_array must be of type uint8 or uint16")
+    lut = np.ascontiguousarray(lut, dtype=np.uint8)
+    n_colors = 1 << (8 * data_array.itemsize)
+    if lut.shape != (n_colors, 4):
+        raise ValueError("lut must be a ({}, 4) array".format(n_colors))
+    rgba_array = _uint8_output(data_array, out)
+    cdef np.uint32_t[::1] lut32 = lut.view(np.uint32).reshape(-1)
+    cdef np.uint32_t[::1] rgba = rgba_array.view(np.uint32).reshape(-1)
+    cdef np.uint8_t[::1] data8
+    cdef np.uint16_t[::1] data16
+
+    if data_array.dtype == np.uint8:
+        data8 = np.ascontiguousarray(data_array).reshape(-1)
+        with nogil:
+            _gather_colors_uint8(data8, lut32, rgba)
+    else:
+        data16 = np.ascontiguousarray(data_array).reshape(-1)
+        with nogil:
+            _gather_colors_uint8(data16, lut32, rgba)
+
+    return rgba_array
+
+
+def _uint8_output(data_array, out):
+    """ The array of rgba colors to write the colors of data_array into """
+    shape = data_array.shape + (4,)
+    if out is None:
+        return np.empty(shape, np.uint8)
+    if (out.shape != shape or out.dtype != np.uint8
+            or not out.flags.c_contiguous):
+        raise ValueError(
+            "out must be a C-contiguous uint8 array of shape {}".format(shape)
+        )
+    return out
+
+
+@cython.wraparound(False)
+@cython.boundscheck(False)
+def intersect_range(x not None, double low, double high, mask=None):
+    '''Discard 1D intervals outside of range, with optional mask
+
+    This computes the same result as the NumPy implementation in a single
+    pass, without building the intermediate boolean arrays.
+
+    Parameters
+    ----------
+    x : 1d array
+        The array of connected interval endpoints.
+    low : float
+        The low end of the range.
+    high : float
+        The high end of the range.
+    mask : 1d array of bools or None
+        The mask of points to consider, or None.  If None then any non-finite
+        points will be ignored.
+
+    Returns
+    -------
+    mask : 1d array of bools
+        A mask array of points which are endpoints of intervals which
+        potentially intersect the range.
+    '''
+    cdef double[:] data = np.ascontiguousarray(x, dtype=np.float64)
+    cdef Py_ssize_t i, N = data.shape[0]
+    result_array = np.zeros(N, dtype=bool)
+    if N == 0:
+        return result_array
+
+    cdef np.uint8_t[:] result = result_array.view(np.uint8)
+    cdef np.uint8_t[:] mask_data
+    cdef bint use_mask = mask is not None
+    if use_mask:
+        mask_data = np.ascontiguousarray(mask, dtype=bool).view(np.uint8)
+
+    cdef double value
+    cdef np.uint8_t valid, not_low, not_high, crossing
+    cdef np.uint8_t prev_not_low = 0, prev_not_high = 0
+
+    # The flags are combined with bitwise operators rather than branches,
+    # as the comparisons are unpredictable for unsorted data.
+    with nogil:
+        for i in range(N):
+            value = data[i]
+            if use_mask:
+                valid = mask_data[i] != 0
             else:
-                idx = <int> ((steps - 1) * norm_value)
+                # false for both NaN and infinite values
+                valid = (value - value) == 0.0
+            not_low = valid & (value >= low)
+            not_high = valid & (value <= high)
 
-            rgba[i, 0] = red_lut[idx]
-            rgba[i, 1] = green_lut[idx]
-            rgba[i, 2] = blue_lut[idx]
-            rgba[i, 3] = alpha_lut[idx]
+            # does the interval from the previous point intersect the range?
+            crossing = (prev_not_low & not_high) | (prev_not_high & not_low)
+            result[i] = (not_low & not_high) | crossing
+            if i > 0:
+                result[i - 1] |= crossing
 
-    return rgba.reshape(shape)
+            prev_not_low = not_low
+            prev_not_high = not_high
+
+    return result_array
+
+
+@cython.wraparound(False)
+@cython.boundscheck(False)
+def scatterplot_gather_points_and_mask(
+        index not None,
+        double index_low,
+        double index_high,
+        value not None,
+        double value_low,
+        double value_high,
+        index_mask=None,
+        value_mask=None,
+        selection_mask=None):
+    '''Find the points which are inside the ranges and are not masked.
+
+    This computes the same result as the NumPy implementation in a single
+    pass, writing the points straight into the returned array.
+
+    Parameters
+    ----------
+    index : 1d array
+        The index values of the points.
+    index_low, index_high : float
+        The range of index values to keep, inclusive.
+    value : 1d array
+        The values of the points.
+    value_low, value_high : float
+        The range of values to keep, inclusive.
+    index_mask, value_mask : 1d array of bools or None
+        The masks of the index and value data sources, or None.
+    selection_mask : 1d array of bools or None
+        The mask of the selected points, or None.
+
+    Returns
+    -------
+    points : float array (Nx2)
+        The points which are finite, inside the ranges and in both masks.
+    point_mask : bool array (1D)
+        The mask of the positions of *points* in the index and value arrays.
+    selections : bool array (1D) or None
+        The mask of the selected points in *points*, if *selection_mask* was
+        given.
+    '''
+    cdef double[:] x = np.ascontiguousarray(index, dtype=np.float64)
+    cdef double[:] y = np.ascontiguousarray(value, dtype=np.float64)
+    cdef Py_ssize_t i, count = 0, N = x.shape[0]
+    if y.shape[0] != N:
+        raise ValueError("index and value must have the same length")
+
+    points_array = np.empty((N, 2), dtype=np.float64)
+    point_mask_array = np.empty(N, dtype=bool)
+    cdef double[:, :] points = points_array
+    cdef np.uint8_t[:] point_mask = point_mask_array.view(np.uint8)
+
+    cdef np.uint8_t[:] index_mask_data, value_mask_data
+    cdef np.uint8_t[:] selection_data, selections
+    cdef bint use_index_mask = index_mask is not None
+    cdef bint use_value_mask = value_mask is not None
+    cdef bint use_selection = selection_mask is not None
+    if use_index_mask:
+        index_mask_data = np.ascontiguousarray(
+            index_mask, dtype=bool).view(np.uint8)
+    if use_value_mask:
+        value_mask_data = np.ascontiguousarray(
+            value_mask, dtype=bool).view(np.uint8)
+    if use_selection:
+        selection_data = np.ascontiguousarray(
+            selection_mask, dtype=bool).view(np.uint8)
+        selections_array = np.empty(N, dtype=bool)
+        selections = selections_array.view(np.uint8)
+
+    cdef double xi, yi
+    cdef np.uint8_t keep
+
+    with nogil:
+        for i in range(N):
+            xi = x[i]
+            yi = y[i]
+            # comparisons with NaN are false, and the differences are only
+            # zero for finite values
+            keep = (
+                ((xi - xi) == 0.0) & ((yi - yi) == 0.0)
+                & (xi >= index_low) & (xi <= index_high)
+                & (yi >= value_low) & (yi <= value_high)
+            )
+            if use_index_mask:
+                keep = keep & (index_mask_data[i] != 0)
+            if use_value_mask:
+                keep = keep & (value_mask_data[i] != 0)
+            point_mask[i] = keep
+            if keep:
+                points[count, 0] = xi
+                points[count, 1] = yi
+                if use_selection:
+                    selections[count] = selection_data[i] != 0
+                count += 1
+
+    if use_selection:
+        return points_array[:count], point_mask_array, selections_array[:count]
+    return points_array[:count], point_mask_array, None
+
+
+@cython.wraparound(False)
+@cython.boundscheck(False)
+@cython.cdivision(True)
+def bin_points(
+        points not None,
+        double x_low,
+        double y_low,
+        double bin_size,
+        Py_ssize_t width,
+        Py_ssize_t height,
+        values=None,
+        reduction="count"):
+    '''Bin points into a 2D grid, counting them or reducing their values.
+
+    This computes the same result as the NumPy implementation in a single
+    pass, without holding the GIL.
+
+    Parameters
+    ----------
+    points : float array (Nx2)
+        The x and y coordinates of the points.
+    x_low, y_low : float
+        The coordinates of the lower left corner of the grid.
+    bin_size : float
+        The width and height of the bins.
+    width, height : int
+        The number of columns and rows of the grid.
+    values : 1d array or None
+        The value of each point, which is required unless *reduction* is
+        "count".  Points with a NaN value are ignored.
+    reduction : "count", "mean" or "max"
+        Whether each bin holds the number of points in it, or the mean or
+        maximum of their values.
+
+    Returns
+    -------
+    bins : float array (height x width)
+        The count, mean or maximum of each bin.  The mean and maximum of an
+        empty bin are NaN.  Points outside the grid are ignored.
+    '''
+    cdef int mode
+    if reduction == "count":
+        mode = 0
+    elif reduction == "mean":
+        mode = 1
+    elif reduction == "max":
+        mode = 2
+    else:
+        raise ValueError("unknown reduction {!r}".format(reduction))
+
+    cdef double[:, :] xy = np.ascontiguousarray(
+        points, dtype=np.float64).reshape(-1, 2)
+    cdef Py_ssize_t i, row, col, N = xy.shape[0]
+    cdef double[:] vals
+    if mode != 0:
+        if values is None:
+            raise ValueError("values are required for a {} reduction"
+                             .format(reduction))
+        vals = np.ascontiguousarray(values, dtype=np.float64)
+        if vals.shape[0] != N:
+            raise ValueError("points and values must have the same length")
+
+    result_array = np.zeros((height, width), dtype=np.float64)
+    if mode == 2:
+        result_array.fill(-np.inf)
+    counts_array = np.zeros((height, width), dtype=np.float64)
+    cdef double[:, :] result = result_array
+    cdef double[:, :] counts = counts_array
+    cdef double fx, fy, value
+
+    with nogil:
+        for i in range(N):
+            fx = (xy[i, 0] - x_low) / bin_size
+            fy = (xy[i, 1] - y_low) / bin_size
+            # comparisons with NaN are false
+            if not (fx >= 0 and fx < width and fy >= 0 and fy < height):
+                continue
+            col = <Py_ssize_t>fx
+            row = <Py_ssize_t>fy
+            if mode == 0:
+                counts[row, col] += 1.0
+                continue
+            value = vals[i]
+            # NaN is the only value which differs from itself
+            if value != value:
+                continue
+            counts[row, col] += 1.0
+            if mode == 1:
+                result[row, col] += value
+            elif value > result[row, col]:
+                result[row, col] = value
+
+    if mode == 0:
+        return counts_array
+    with np.errstate(invalid="ignore"):
+        if mode == 1:
+            result_array /= counts_array
+    result_array[counts_array == 0] = np.nan
+    return result_array
 
 
 @cython.wraparound(False)
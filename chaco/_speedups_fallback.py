@@ -14,14 +14,15 @@ _speedups extension module.
 """
 
 from numpy import (
+    asarray,
     clip,
+    column_stack,
     invert,
+    isfinite,
     isnan,
     isinf,
-    array,
-    transpose,
+    seterr,
     zeros,
-    compress,
     where,
     take,
     float32,
@@ -47,6 +48,87 @@ def array_combine(a, b, op=operator.and_, func=lambda x: x):
         return None
 
 
+def scatterplot_gather_points_and_mask(
+    index,
+    index_low,
+    index_high,
+    value,
+    value_low,
+    value_high,
+    index_mask=None,
+    value_mask=None,
+    selection_mask=None,
+):
+    """
+    Takes index and value arrays, masks, and an optional selection mask,
+    and returns the points which are inside the ranges and not masked,
+    together with the mask of those points and their selection mask.
+
+    Parameters
+    ----------
+    index : float array (1D)
+       Array of indexes of the points
+    index_low : float
+       The minimum acceptable value in the index array
+    index_high : float
+       The maximum acceptable value in the index array
+    value : float array (1D)
+       Array of values of the points
+    value_low : float
+       The minimum acceptable value in the value array
+    value_high : float
+       The maximum acceptable value in the value array
+
+    Optional Parameters
+    -------------------
+    index_mask : bool array (1D)
+      Mask array for the indexes
+    value_mask : bool array (1D)
+       Mask array for the values
+    selection_mask : bool array (1D)
+       A mask array with True values indicating which points are selected
+
+    Returns
+    -------
+    points : float array (Nx2)
+       The points that match all the masking criteria
+    point_mask : bool array (1D)
+       Mask indicating which positions of the index and value arrays are in
+       **points**
+    sel_mask : bool array (1D) or None
+       Mask indicating which indices in **points** are selected, if a
+       selection mask was given
+    """
+    index = asarray(index, dtype=float)
+    value = asarray(value, dtype=float)
+    if len(index) != len(value):
+        raise ValueError("index and value must have the same length")
+
+    point_mask = (
+        isfinite(index)
+        & isfinite(value)
+        & (index >= index_low)
+        & (index <= index_high)
+        & (value >= value_low)
+        & (value <= value_high)
+    )
+    if index_mask is not None:
+        point_mask &= index_mask
+    if value_mask is not None:
+        point_mask &= value_mask
+
+    if point_mask.all():
+        points = column_stack([index, value])
+    else:
+        points = column_stack([index[point_mask], value[point_mask]])
+
+    if selection_mask is None:
+        selections = None
+    else:
+        selections = asarray(selection_mask, dtype=bool)[point_mask]
+    return points, point_mask, selections
+
+
 def scatterplot_gather_points(
     index,
     index_low,
@@ -66,19 +148,24 @@ def scatterplot_gather_points(
     and returns the list of points and corresponding selection mask for
     those points.
 
+    This is the interface ScatterPlot used before
+    scatterplot_gather_points_and_mask, which it now calls.  The ranges are
+    inclusive and, if both are given, the index selection takes precedence
+    over the value selection.
+
     Parameters
     ----------
     index : float array (1D)
        Array of indexes of the points
-    index_low : float or None
+    index_low : float
        The minimum acceptable value in the index array
-    index_high : float or None
+    index_high : float
        The maximum acceptable value in the index array
     value : float array (1D)
        Array of values of the points
-    value_low : float or None
+    value_low : float
        The minimum acceptable value in the value array
-    value_high : float or None
+    value_high : float
        The maximum acceptable value in the value array
 
     Optional Parameters
@@ -103,47 +190,150 @@ def scatterplot_gather_points(
     sel_mask : bool array (1D)
        Mask indicating which indices in **points** are selected
     """
+    selection_mask = array_combine(index_sel_mask, value_sel_mask)
+    positions = index_sel if index_sel is not None else value_sel
+    if positions is not None:
+        selected = zeros(len(index), dtype=bool)
+        selected[positions] = True
+        if selection_mask is None:
+            selection_mask = selected
+        else:
+            selection_mask = asarray(selection_mask, dtype=bool) & selected
+
+    points, point_mask, selections = scatterplot_gather_points_and_mask(
+        index,
+        index_low,
+        index_high,
+        value,
+        value_low,
+        value_high,
+        index_mask=None if index_mask is None else asarray(index_mask, bool),
+        value_mask=None if value_mask is None else asarray(value_mask, bool),
+        selection_mask=selection_mask,
+    )
+    return points, selections
 
-    index_range_mask = (index_low < index) & (index < index_high)
-    value_range_mask = (value_low < value) & (value < value_high)
 
-    nan_mask = array_combine(
-        index_mask, value_mask, func=lambda x: invert(isnan(x)) & x
-    )
+def intersect_range(x, low, high, mask=None):
+    """Discard 1D intervals outside of range, with optional mask
 
-    if nan_mask is not None:
-        point_mask = nan_mask & index_range_mask & value_range_mask
-    else:
-        point_mask = index_range_mask & value_range_mask
-    points = transpose(array((index, value)))
+    Parameters
+    ----------
+    x : 1d array
+        The array of connected interval endpoints.
+    low : number
+        The low end of the range.
+    high : number
+        The high end of the range.
+    mask : 1d array of bools or None
+        The mask of points to consider, or None.  If None then any non-finite
+        points will be ignored.
 
-    # Handle the selection mask
-    selection_mask = array_combine(index_sel_mask, value_sel_mask)
+    Returns
+    -------
+    mask : 1d array of bools
+        A mask array of points which are endpoints of intervals which
+        potentially intersect the range.
+    """
+    if mask is None:
+        mask = isfinite(x)
+
+    # find relationships to range bounds
+    old_err = seterr(invalid="ignore")
+    try:
+        not_low_x = (x >= low) & mask
+        not_high_x = (x <= high) & mask
+    finally:
+        seterr(**old_err)
+
+    # a point is in if it is not low and not high
+    result = not_low_x & not_high_x
+
+    if x.shape[0] >= 2:
+        # interval intersects range if one end not low and other end not high
+        interval_mask = (not_low_x[:-1] & not_high_x[1:]) | (
+            not_high_x[:-1] & not_low_x[1:]
+        )
+
+        # point is also in if at least one of its interval is in
+        result[1:-1] |= interval_mask[:-1] | interval_mask[1:]
+        result[0] |= interval_mask[0]
+        result[-1] |= interval_mask[-1]
+
+    return result
+
+
+def bin_points(
+    points,
+    x_low,
+    y_low,
+    bin_size,
+    width,
+    height,
+    values=None,
+    reduction="count",
+):
+    """
+    Bins points into a 2D grid, counting them or reducing their values.
 
-    if index_sel is None and value_sel is None:
-        pass
-    else:
-        if index_sel is not None and value_sel is not None:
-            mask2 = zeros(len(index), int)
-            mask2[index_sel] = 1
-            mask2[value_sel] &= 1
-        elif index_sel is not None:
-            mask2 = zeros(len(index), int)
-            mask2[index_sel] = 1
-        elif value_sel is not None:
-            mask2 = zeros(len(index), int)
-            mask2[value_sel] = 1
-        if selection_mask is None:
-            selection_mask = mask2
-        else:
-            selection_mask &= mask2
+    Parameters
+    ----------
+    points : float array (Nx2)
+       The x and y coordinates of the points
+    x_low, y_low : float
+       The coordinates of the lower left corner of the grid
+    bin_size : float
+       The width and height of the bins
+    width, height : int
+       The number of columns and rows of the grid
 
-    points = compress(point_mask, points, axis=0)
-    if selection_mask is not None:
-        selections = compress(point_mask, selection_mask)
+    Optional Parameters
+    -------------------
+    values : float array (1D)
+       The value of each point, which is required unless **reduction** is
+       "count".  Points with a NaN value are ignored.
+    reduction : "count", "mean" or "max"
+       Whether each bin holds the number of points in it, or the mean or
+       maximum of their values
+
+    Returns
+    -------
+    bins : float array (height x width)
+       The count, mean or maximum of each bin.  The mean and maximum of an
+       empty bin are NaN.  Points outside the grid are ignored.
+    """
+    if reduction not in ("count", "mean", "max"):
+        raise ValueError("unknown reduction {!r}".format(reduction))
+    points = asarray(points, dtype=float).reshape(-1, 2)
+    if reduction != "count":
+        if values is None:
+            raise ValueError("values are required for a {} reduction"
+                             .format(reduction))
+        values = asarray(values, dtype=float)
+        if len(values) != len(points):
+            raise ValueError("points and values must have the same length")
+
+    with np.errstate(invalid="ignore"):
+        cols = (points[:, 0] - x_low) / bin_size
+        rows = (points[:, 1] - y_low) / bin_size
+        inside = (cols >= 0) & (cols < width) & (rows >= 0) & (rows < height)
+    if reduction != "count":
+        inside &= ~isnan(values)
+        values = values[inside]
+    bins = rows[inside].astype(np.intp) * width + cols[inside].astype(np.intp)
+
+    size = width * height
+    counts = np.bincount(bins, minlength=size).astype(float)
+    if reduction == "count":
+        result = counts
+    elif reduction == "mean":
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result = np.bincount(bins, weights=values, minlength=size) / counts
     else:
-        selections = None
-    return points, selections
+        result = np.full(size, -np.inf)
+        np.maximum.at(result, bins, values)
+        result[counts == 0] = np.nan
+    return result.reshape(height, width)
 
 
 def apply_selection_fade(mapped_image, mask, fade_alpha, fade_background):
@@ -227,7 +417,15 @@ def map_colors(
 
 
 def map_colors_uint8(
-    data_array, steps, low, high, red_lut, green_lut, blue_lut, alpha_lut
+    data_array,
+    steps,
+    low,
+    high,
+    red_lut,
+    green_lut,
+    blue_lut,
+    alpha_lut,
+    out=None,
 ):
     """Map colors from color lookup tables to a data array.
 
@@ -251,6 +449,9 @@ def map_colors_uint8(
         The blue channel lookup table
     alpha_lut : ndarray of uint8
         The alpha channel lookup table
+    out : ndarray of uint8, optional
+        A C-contiguous array of shape data_array.shape + (4,) to write the
+        colors into.
 
     Returns
     -------
@@ -259,6 +460,7 @@ def map_colors_uint8(
         of this array is equal to data_array.shape + (4,).
 
     """
+    data_array = asarray(data_array)
     range_diff = high - low
 
     if range_diff == 0.0 or isinf(range_diff):
@@ -270,10 +472,66 @@ def map_colors_uint8(
 
     nanmask = isnan(norm_data)
     norm_data = where(nanmask, 0, (norm_data * (steps - 1)).astype("uint8"))
-    rgba = zeros(norm_data.shape + (4,), dtype="uint8")
+    rgba = _uint8_output(data_array, out)
     rgba[..., 0] = where(nanmask, 0, take(red_lut, norm_data))
     rgba[..., 1] = where(nanmask, 0, take(green_lut, norm_data))
     rgba[..., 2] = where(nanmask, 0, take(blue_lut, norm_data))
     rgba[..., 3] = where(nanmask, 0, take(alpha_lut, norm_data))
 
     return rgba
+
+
+def gather_colors_uint8(data_array, lut, out=None):
+    """Map integer data to colors by looking each value up in a color table.
+
+    This is used in ColorMapper.map_uint8 for uint8 and uint16 data.
+
+    Parameters
+    ----------
+    data_array : ndarray of uint8 or uint16
+        The data array
+    lut : ndarray of uint8
+        The rgba color of every possible data value, as a (256, 4) array for
+        uint8 data or a (65536, 4) array for uint16 data.
+    out : ndarray of uint8, optional
+        A C-contiguous array of shape data_array.shape + (4,) to write the
+        colors into.
+
+    Returns
+    -------
+    rgba: ndarray of uint8
+        The rgba values of data_array according to the lookup table. The shape
+        of this array is equal to data_array.shape + (4,).
+
+    """
+    data_array = asarray(data_array)
+    if data_array.dtype not in (np.uint8, np.uint16):
+        raise ValueError("data_array must be of type uint8 or uint16")
+    lut = np.ascontiguousarray(lut, dtype=np.uint8)
+    n_colors = 1 << (8 * data_array.itemsize)
+    if lut.shape != (n_colors, 4):
+        raise ValueError("lut must be a ({}, 4) array".format(n_colors))
+    rgba = _uint8_output(data_array, out)
+    # Gather each color as a single 32 bit value
+    take(
+        lut.view(np.uint32).reshape(-1),
+        data_array,
+        out=rgba.view(np.uint32).reshape(data_array.shape),
+    )
+    return rgba
+
+
+def _uint8_output(data_array, out):
+    """The array of rgba colors to write the colors of data_array into"""
+    shape = data_array.shape + (4,)
+    if out is None:
+        return zeros(shape, dtype="uint8")
+    if (
+        out.shape != shape
+        or out.dtype != np.uint8
+        or not out.flags.c_contiguous
+    ):
+        raise ValueError(
+            "out must be a C-contiguous uint8 array of shape {}".format(shape)
+        )
+    return out
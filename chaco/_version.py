@@ -0,0 +1,25 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+# THIS FILE IS GENERATED FROM SETUP.PY
+
+#: The full version of the package, including a development suffix
+#: for unreleased versions of the package.
+version = '5.1.0.dev0'
+
+#: The full version of the package, same as 'version'
+#: Kept for backward compatibility
+full_version = version
+
+#: The Git revision from which this release was made.
+git_revision = 'Unknown'
+
+#: Flag whether this is a final release
+is_released = False
@@ -61,6 +61,19 @@ class AbstractOverlay(PlotComponent):
         else:
             super()._draw(gc, view_bounds, mode)
 
+    def invalidate_draw(self, damaged_regions=None, self_relative=False):
+        """Overrides Enable Component.
+
+        Underlays are drawn as part of their component, so the component is
+        invalidated too.
+        """
+        super().invalidate_draw(damaged_regions, self_relative)
+        component = self.component
+        if component is not None and self in getattr(
+            component, "underlays", ()
+        ):
+            component.invalidate_draw()
+
     def _request_redraw(self):
         """Overrides Enable Component."""
         if self.component is not None:
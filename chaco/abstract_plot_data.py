@@ -24,7 +24,9 @@ class AbstractPlotData(HasTraits):
 
     #: Indicates that some of the data has changed.  The event object must
     #: be a dict with keys "added", "removed", "changed" and values that are
-    #: lists of strings. This event is used by consumers of this data.
+    #: lists of strings. This event is used by consumers of this data.  The
+    #: optional key "appended" lists the data whose new values only extend
+    #: the old ones.
     data_changed = Event
 
     # -------------------------------------------------------------------------
@@ -37,10 +37,13 @@ Data Model
 - :class:`~.ImageData`
 - :class:`~.MultiArrayDataSource`
 - :class:`~.PointDataSource`
+- :class:`~.RingBufferDataSource`
+- :class:`~.MultiRingBufferDataSource`
 - :class:`~.AbstractDataRange`
 - :class:`~.BaseDataRange`
 - :class:`~.DataRange1D`
 - :class:`~.DataRange2D`
+- :func:`~.deferred_refresh`
 
 Mappers
 -------
@@ -64,6 +67,7 @@ Visual Components / Overlays
 - :class:`~.AbstractOverlay`
 - :class:`~.BasePlotContainer`
 - :class:`~.DataView`
+- :class:`~.FrameScheduler`
 - :class:`~.PlotComponent`
 - :class:`~.PlotGraphicsContext`
 - :class:`~.PlotGraphicsContextMixin`
@@ -297,8 +301,12 @@ from .grid_data_source import GridDataSource
 from .image_data import ImageData
 from .multi_array_data_source import MultiArrayDataSource
 from .point_data_source import PointDataSource
+from .ring_buffer_data_source import (
+    MultiRingBufferDataSource,
+    RingBufferDataSource,
+)
 from .abstract_data_range import AbstractDataRange
-from .base_data_range import BaseDataRange
+from .base_data_range import BaseDataRange, deferred_refresh
 from .data_range_1d import DataRange1D
 from .data_range_2d import DataRange2D
 
@@ -319,6 +327,7 @@ from .abstract_plot_renderer import AbstractPlotRenderer
 from .abstract_overlay import AbstractOverlay
 from .base_plot_container import BasePlotContainer
 from .data_view import DataView
+from .frame_scheduler import FrameScheduler
 from .plot_component import PlotComponent
 from .plot_graphics_context import (
     PlotGraphicsContext,
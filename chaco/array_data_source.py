@@ -11,14 +11,19 @@
 """ Defines the ArrayDataSource class."""
 
 # Major library imports
-from numpy import array, empty, isfinite, ones, ndarray
+from numpy import append, array, empty, isfinite, isnan, ones, ndarray
 import numpy as np
 
 # Enthought library imports
 from traits.api import Any, Constant, Int, Tuple
 
 # Chaco imports
-from .base import NumericalSequenceTrait, reverse_map_1d, SortOrderTrait
+from .base import (
+    buffered_append,
+    NumericalSequenceTrait,
+    reverse_map_1d,
+    SortOrderTrait,
+)
 from .abstract_data_source import AbstractDataSource
 
 
@@ -111,6 +116,10 @@ class ArrayDataSource(AbstractDataSource):
     # typechecks numpy.int64 on 64-bit Windows systems.
     _max_index = Any
 
+    # The storage with spare capacity that **_data** is a view of, once data
+    # has been appended.
+    _buffer = Any(transient=True)
+
     # ------------------------------------------------------------------------
     # Public methods
     # ------------------------------------------------------------------------
@@ -130,11 +139,44 @@ class ArrayDataSource(AbstractDataSource):
             The sort order of the data
         """
         self._data = newdata
+        self._buffer = None
         if sort_order is not None:
             self.sort_order = sort_order
         self._compute_bounds()
         self.data_changed = True
 
+    def append(self, values):
+        """Appends values to the end of the data.
+
+        The data is stored in a buffer with spare capacity, so appending a
+        small chunk of values does not copy the existing data, and the bounds
+        are updated from the new values alone.  Arrays previously returned by
+        get_data() are not modified.
+
+        The data_changed event is fired with a dictionary whose "appended" key
+        gives the (start, end) positions of the new values, so that listeners
+        can extend any caches they hold rather than rebuilding them.
+
+        Parameters
+        ----------
+        values : array
+            The values to append.  They must have the same sort order as the
+            existing data, and continue it.
+        """
+        data = self.get_data()
+        start = len(data)
+        self._data, self._buffer = buffered_append(data, self._buffer, values)
+        end = len(self._data)
+        if end == start:
+            return
+
+        if self._cached_mask is not None:
+            self._cached_mask = append(
+                self._cached_mask, ones(end - start, dtype=bool)
+            )
+        self._append_bounds(start)
+        self.data_changed = {"appended": (start, end)}
+
     def set_mask(self, mask):
         """Sets the mask for this data source."""
         self._cached_mask = mask
@@ -292,6 +334,39 @@ class ArrayDataSource(AbstractDataSource):
                 data[self._max_index],
             )
 
+    def _append_bounds(self, start):
+        """Updates the bounds after values were appended from *start* on.
+
+        Only the new values are examined.
+        """
+        data = self._data
+        if start == 0 or self._cached_bounds in (None, (), 0.0):
+            self._compute_bounds()
+            return
+        if self.sort_order != "none" or not np.issubdtype(
+            data.dtype, np.number
+        ):
+            # Sorted data just moves the end point, and the bounds of
+            # non-numeric data are not meaningful.
+            self._compute_bounds()
+            return
+
+        # The stored indices may be negative, so normalize them to positions.
+        min_index = self._min_index % start
+        max_index = self._max_index % start
+        new = data[start:].view(ndarray)
+        new_min = start + bounded_nanargmin(new)
+        new_max = start + bounded_nanargmax(new) % len(new)
+        # Ties keep the earlier position, and values which are NaN lose to
+        # any value which is not.
+        if data[new_min] < data[min_index] or isnan(data[min_index]):
+            min_index = new_min
+        if data[new_max] > data[max_index] or isnan(data[max_index]):
+            max_index = new_max
+        self._min_index = min_index
+        self._max_index = max_index
+        self._cached_bounds = (data[min_index], data[max_index])
+
     # ------------------------------------------------------------------------
     # Event handlers
     # ------------------------------------------------------------------------
@@ -17,6 +17,7 @@ from traits.api import Dict
 
 # Local, relative imports
 from .abstract_plot_data import AbstractPlotData
+from .base import buffered_append
 from .abstract_data_source import AbstractDataSource
 
 
@@ -42,6 +43,10 @@ class ArrayPlotData(AbstractPlotData):
     #: Consumers can write data to this object (overrides AbstractPlotData).
     writable = True
 
+    # The storage with spare capacity of the arrays which have been appended
+    # to, keyed by name.
+    _buffers = Dict(transient=True)
+
     def __init__(self, *data, **kw):
         """ArrayPlotData can be constructed by passing in arrays.
 
@@ -98,6 +103,7 @@ class ArrayPlotData(AbstractPlotData):
 
         if name in self.arrays:
             del self.arrays[name]
+            self._buffers.pop(name, None)
             self.data_changed = {"removed": [name]}
         else:
             raise KeyError("Data series '%s' does not exist." % name)
@@ -170,6 +176,43 @@ class ArrayPlotData(AbstractPlotData):
         self._update_data(data)
         self.data_changed = event
 
+    def append_data(self, name, new_data):
+        """Appends values to the end of the array with the given name.
+
+        The array is stored in a buffer with spare capacity, so appending a
+        small chunk of values to a large array is cheap.  If the name is
+        associated with a data source rather than an array, the values are
+        appended to the data source.  If there is no data with the given name,
+        this is the same as calling set_data().
+
+        A `data_changed` event is fired with the name listed under the
+        "appended" key, so that consumers can append the new values to their
+        own copy of the data rather than replacing it.
+
+        Parameters
+        ----------
+        name : string
+            The name of the array to extend.
+        new_data : array
+            The values to append.
+        """
+        if not self.writable:
+            return None
+
+        if name not in self.arrays:
+            self.set_data(name, new_data)
+            return
+
+        data = self.arrays[name]
+        if isinstance(data, AbstractDataSource):
+            data.append(new_data)
+        else:
+            data, self._buffers[name] = buffered_append(
+                data, self._buffers.get(name), new_data
+            )
+            self.arrays[name] = data
+        self.data_changed = {"appended": [name]}
+
     def set_selection(self, name, selection):
         """Overrides AbstractPlotData to do nothing and not raise an error."""
         pass
@@ -207,5 +250,6 @@ class ArrayPlotData(AbstractPlotData):
                 data[name] = array(value)
             else:
                 data[name] = value
+            self._buffers.pop(name, None)
 
         self.arrays.update(data)
@@ -36,6 +36,7 @@ from traits.api import (
     Trait,
     Unicode,
     Bool,
+    Dict,
     Event,
     List,
     Array,
@@ -207,6 +208,10 @@ class PlotAxis(AbstractOverlay):
     ticklabel_cache = List(transient=True)
     _cache_valid = Bool(False, transient=True)
 
+    # The tick labels and their bounding boxes, by text, which are reused
+    # while the tick label styles don't change.
+    _tick_labels_by_text = Dict(transient=True)
+
     # ------------------------------------------------------------------------
     # Public methods
     # ------------------------------------------------------------------------
@@ -526,18 +531,12 @@ class PlotAxis(AbstractOverlay):
             else:
                 tick_list, labels = tmp
             # compute the labels here
-            self.ticklabel_cache = [
-                Label(
-                    text=lab,
-                    font=self.tick_label_font,
-                    color=self.tick_label_color,
-                )
-                for lab in labels
-            ]
-            self._tick_label_bounding_boxes = [
-                array(ticklabel.get_bounding_box(gc), float64)
-                for ticklabel in self.ticklabel_cache
-            ]
+            self._update_tick_labels(
+                gc,
+                labels,
+                font=self.tick_label_font,
+                color=self.tick_label_color,
+            )
         else:
             scale = "log" if isinstance(self.mapper, LogMapper) else "linear"
             if self.small_haxis_style:
@@ -580,23 +579,41 @@ class PlotAxis(AbstractOverlay):
             return
 
         formatter = self.tick_label_formatter
+        if formatter is None:
+            formatter = str
+
+        self._update_tick_labels(
+            gc,
+            [formatter(val) for val in self._tick_label_list],
+            font=self.tick_label_font,
+            color=self.tick_label_color,
+            rotate_angle=self.tick_label_rotate_angle,
+            margin=self.tick_label_margin,
+        )
 
-        def build_label(val):
-            tickstring = formatter(val) if formatter is not None else str(val)
-            return Label(
-                text=tickstring,
-                font=self.tick_label_font,
-                color=self.tick_label_color,
-                rotate_angle=self.tick_label_rotate_angle,
-                margin=self.tick_label_margin,
-            )
+    def _update_tick_labels(self, gc, texts, **label_traits):
+        """Sets the tick labels and their bounding boxes to those of texts.
 
-        self.ticklabel_cache = [
-            build_label(val) for val in self._tick_label_list
-        ]
+        The labels of texts which were already tick labels are reused, so
+        they are not measured again.
+        """
+        old_labels = self._tick_labels_by_text
+        new_labels = {}
+        for text in texts:
+            if text in new_labels:
+                continue
+            if text in old_labels:
+                new_labels[text] = old_labels[text]
+            else:
+                label = Label(text=text, **label_traits)
+                new_labels[text] = (
+                    label,
+                    array(label.get_bounding_box(gc), float64),
+                )
+        self._tick_labels_by_text = new_labels
+        self.ticklabel_cache = [new_labels[text][0] for text in texts]
         self._tick_label_bounding_boxes = [
-            array(ticklabel.get_bounding_box(gc), float)
-            for ticklabel in self.ticklabel_cache
+            new_labels[text][1] for text in texts
         ]
 
     def _calculate_geometry(self):
@@ -832,6 +849,7 @@ class PlotAxis(AbstractOverlay):
         "ensure_ticks_bounded",
     ])
     def _invalidate_on_changed_visual_attr(self, event):
+        self._tick_labels_by_text = {}
         self._invalidate()
 
     # ------------------------------------------------------------------------
@@ -19,6 +19,7 @@ from math import radians, sqrt
 from numpy import (
     array,
     argsort,
+    asarray,
     concatenate,
     cos,
     diff,
@@ -26,11 +27,10 @@ from numpy import (
     dtype,
     empty,
     float32,
-    isfinite,
     nonzero,
     pi,
+    result_type,
     searchsorted,
-    seterr,
     sin,
     int8,
 )
@@ -38,6 +38,9 @@ from numpy import (
 # Enthought library imports
 from traits.api import Enum, ArrayOrNone
 
+# Local relative imports
+from .speedups import intersect_range as _intersect_range
+
 delta = {"ascending": 1, "descending": -1, "flat": 0}
 
 rgba_dtype = dtype(
@@ -307,31 +310,91 @@ def intersect_range(x, low, high, mask=None):
         A mask array of points which are endpoints of intervals which
         potentially intersect the range.
     """
-    # TODO: write a fast Cython version
-    # TODO: write an optimized version for ordered data
-    if mask is None:
-        mask = isfinite(x)
-
-    # find relationships to range bounds
-    old_err = seterr(invalid="ignore")
-    try:
-        not_low_x = (x >= low) & mask
-        not_high_x = (x <= high) & mask
-    finally:
-        seterr(**old_err)
-
-    # a point is in if it is not low and not high
-    result = not_low_x & not_high_x
-
-    if x.shape[0] >= 2:
-        # interval intersects range if one end not low and other end not high
-        interval_mask = (not_low_x[:-1] & not_high_x[1:]) | (
-            not_high_x[:-1] & not_low_x[1:]
-        )
-
-        # point is also in if at least one of its interval is in
-        result[1:-1] |= interval_mask[:-1] | interval_mask[1:]
-        result[0] |= interval_mask[0]
-        result[-1] |= interval_mask[-1]
+    return _intersect_range(x, low, high, mask)
 
-    return result
+
+def arg_range_window(x, low, high, sort_order):
+    """Find the slice of sorted data which can intersect a range
+
+    For sorted data, the points which :func:`intersect_range` can keep are
+    the points inside the range plus one neighbour on each side, so they
+    can be found with two binary searches rather than by testing every
+    point.  Restricting ``intersect_range`` to ``x[start:end]`` then gives
+    the same points as running it on all of ``x``.
+
+    Parameters
+    ----------
+    x : 1d array
+        The sorted array of connected interval endpoints.  Non-finite values
+        may only appear at the end of the array for ascending data, or at
+        the start for descending data.
+    low : number
+        The low end of the range.
+    high : number
+        The high end of the range.
+    sort_order : string
+        "ascending" or "descending"
+
+    Returns
+    -------
+    start, end : int
+        The bounds of the slice of *x* which can intersect the range.
+    """
+    n_points = len(x)
+    if sort_order == "ascending":
+        start = searchsorted(x, low, "left") - 1
+        end = searchsorted(x, high, "right") + 1
+    elif sort_order == "descending":
+        ascending_x = x[::-1]
+        start = n_points - searchsorted(ascending_x, high, "right") - 1
+        end = n_points - searchsorted(ascending_x, low, "left") + 1
+    else:
+        raise NotImplementedError("arg_range_window() requires a sorted array")
+    return max(start, 0), min(end, n_points)
+
+
+def buffered_append(data, buffer, values):
+    """Append values to an array which may be the start of a larger buffer
+
+    Arrays that grow one small chunk at a time are stored at the start of a
+    buffer with spare capacity, and the capacity is doubled whenever it runs
+    out, so that appending is amortized O(1) per value rather than copying
+    the whole array every time.  The returned array is a view of the start
+    of the returned buffer; appending only writes past its end, so arrays
+    returned by earlier calls keep their values.
+
+    Parameters
+    ----------
+    data : array
+        The current array: either the array returned by the previous call,
+        or any array if *buffer* is None.
+    buffer : array or None
+        The buffer returned by the previous call, or None to allocate a new
+        buffer.
+    values : array
+        The values to append along the first axis of *data*.
+
+    Returns
+    -------
+    data, buffer : array
+        The extended array and the buffer which holds it.
+    """
+    values = asarray(values)
+    n_old = len(data)
+    n_new = n_old + len(values)
+    if n_old == 0:
+        value_dtype = values.dtype
+    else:
+        value_dtype = result_type(data, values)
+
+    if (
+        buffer is None
+        or data.base is not buffer
+        or buffer.dtype != value_dtype
+        or len(buffer) < n_new
+    ):
+        capacity = max(2 * n_new, 16)
+        buffer = empty((capacity,) + values.shape[1:], dtype=value_dtype)
+        buffer[:n_old] = data
+    buffer[n_old:n_new] = values
+    return buffer[:n_new], buffer
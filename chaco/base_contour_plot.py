@@ -8,11 +8,20 @@
 #
 # Thanks for using Enthought open source!
 
-from numpy import array, isscalar, issubsctype, linspace, number
+from numpy import (
+    array,
+    isfinite,
+    isscalar,
+    issubsctype,
+    linspace,
+    number,
+    transpose,
+)
 
 # Enthought library imports
 from enable.api import ColorTrait
 from traits.api import (
+    Any,
     Bool,
     Instance,
     Int,
@@ -27,6 +36,8 @@ from traits.api import (
 # Local relative imports
 from .base_2d_plot import Base2DPlot
 from .color_mapper import ColorMapper
+from .plots.contour.contour import Cntr
+from .thread_pool import get_thread_pool
 
 
 class BaseContourPlot(Base2DPlot):
@@ -59,6 +70,11 @@ class BaseContourPlot(Base2DPlot):
     #: A global alpha value to apply to all the contours
     alpha = Trait(1.0, Range(0.0, 1.0))
 
+    #: The number of threads tracing the contours of different levels at the
+    #: same time.  If 0, all the threads of the shared thread pool, one per
+    #: CPU, may be used.
+    trace_threads = Int(0)
+
     # ------------------------------------------------------------------------
     # Private traits
     # ------------------------------------------------------------------------
@@ -75,6 +91,14 @@ class BaseContourPlot(Base2DPlot):
     # List of colors
     _colors = List
 
+    # The contour tracer of the current data, or None if it needs to be
+    # created.  It is reused for all the levels.
+    _tracer = Any(transient=True)
+
+    # Incremented whenever the index or value data changes.  Cached traces
+    # are keyed by the data version they were traced from.
+    _data_version = Int(0, transient=True)
+
     # Mapped trait used to convert user-suppied color values to AGG-acceptable
     # ones. (Mapped traits in lists are not supported, must be converted one at
     # a time.)
@@ -98,6 +122,77 @@ class BaseContourPlot(Base2DPlot):
         self._level_cache_valid = True
         self._colors_cache_valid = False
 
+    def _get_tracer(self):
+        """ Returns the contour tracer of the current data. """
+        if self._tracer is None:
+            if self.value.is_masked():
+                # XXX masked data and get_data_mask not currently implemented
+                data, mask = self.value.get_data_mask()
+                mask &= isfinite(data)
+            else:
+                data = self.value.get_data()
+                mask = isfinite(data)
+
+            x_data, y_data = self.index.get_data()
+            # The grid is rectilinear, so the tracer only needs the 1D
+            # coordinates of its columns and rows.
+            # note: contour wants mask True in invalid locations
+            self._tracer = Cntr(
+                x_data.get_data(), y_data.get_data(), data, ~mask
+            )
+        return self._tracer
+
+    def _trace(self, level_args):
+        """ Traces the contours for each item of a list of levels.
+
+        Each item is the tuple of arguments of ``Cntr.trace``: a level for
+        contour lines, or a pair of levels for the polygons between them.
+        The levels are traced in parallel threads, and a list of the lists of
+        (N, 2) arrays of points of their contours is returned.
+        """
+        tracer = self._get_tracer()
+
+        def trace(args):
+            return [transpose(trace) for trace in tracer.trace(*args)]
+
+        def trace_batch(batch):
+            return [trace(args) for args in batch]
+
+        n_batches = min(self.trace_threads or len(level_args), len(level_args))
+        if n_batches < 2:
+            return trace_batch(level_args)
+        # Consecutive levels are traced in the same batch, so that no more
+        # than trace_threads batches run at the same time.
+        edges = [len(level_args) * i // n_batches for i in range(n_batches + 1)]
+        batches = get_thread_pool().map(
+            trace_batch,
+            [level_args[start:end] for start, end in zip(edges, edges[1:])],
+        )
+        return [traces for batch in batches for traces in batch]
+
+    def _update_traces(self, cache, level_args):
+        """ Returns a cache of the traces of a list of levels.
+
+        ``cache`` maps ``(data version, item)`` to the traces of an item of
+        the arguments of ``Cntr.trace``, as returned by :meth:`_trace`.  The
+        items of ``level_args`` already in the cache for the current data are
+        reused and only the others are traced, so that editing a few levels
+        does not retrace all of them.  The returned dictionary only holds the
+        items of ``level_args``.
+        """
+        version = self._data_version
+        new_cache = {}
+        missing = []
+        for args in level_args:
+            traces = cache.get((version, args))
+            if traces is None:
+                missing.append(args)
+            else:
+                new_cache[version, args] = traces
+        for args, traces in zip(missing, self._trace(missing)):
+            new_cache[version, args] = traces
+        return new_cache
+
     def _update_colors(self, numcolors=None):
         """Update the colors cache using our color mapper and based
         on our number of levels.  The **mode** parameter accounts for fenceposting:
@@ -155,12 +250,16 @@ class BaseContourPlot(Base2DPlot):
     def _index_data_changed_fired(self):
         # If the index data has changed, the reset the levels cache (which
         # also triggers all the other caches to reset).
+        self._tracer = None
+        self._data_version += 1
         self._level_cache_valid = False
         self.invalidate_and_redraw()
 
     def _value_data_changed_fired(self):
         # If the index data has changed, the reset the levels cache (which
         # also triggers all the other caches to reset).
+        self._tracer = None
+        self._data_version += 1
         self._level_cache_valid = False
         self.invalidate_and_redraw()
 
@@ -12,10 +12,53 @@
 Defines the BaseDataRange class.
 """
 
+# Standard library imports
+from contextlib import contextmanager
+from threading import local
+
 # Local relative imports
 from .abstract_data_range import AbstractDataRange
 
 
+class _DeferredRefreshState(local):
+    """The deferred_refresh blocks of the current thread"""
+
+    def __init__(self):
+        #: The number of nested deferred_refresh blocks being executed.
+        self.depth = 0
+
+        #: The ranges waiting to be refreshed at the end of the outermost
+        #: block, in the order their refreshes were deferred.
+        self.pending = {}
+
+
+#: The deferral state, which is separate for each thread so that a block
+#: only defers the refreshes of the ranges updated by its own thread.
+_deferred_refresh_state = _DeferredRefreshState()
+
+
+@contextmanager
+def deferred_refresh():
+    """Context manager that coalesces the refreshes of data ranges
+
+    Inside the block, a range whose data sources change is not refreshed
+    right away; instead each such range is refreshed once when the
+    outermost block exits.  Changing many data sources that share a range
+    then recomputes its bounds, and fires its **updated** event, only once.
+    Only the changes made by the thread executing the block are deferred.
+    """
+    state = _deferred_refresh_state
+    state.depth += 1
+    try:
+        yield
+    finally:
+        state.depth -= 1
+        if state.depth == 0:
+            pending, state.pending = state.pending, {}
+            for data_range in pending:
+                data_range.refresh()
+
+
 class BaseDataRange(AbstractDataRange):
     """Ranges represent sub-regions of data space.
 
@@ -42,3 +85,15 @@ class BaseDataRange(AbstractDataRange):
         for datasource in datasources:
             if datasource in self.sources:
                 self.sources.remove(datasource)
+
+    # ------------------------------------------------------------------------
+    # Event handlers
+    # ------------------------------------------------------------------------
+
+    def _source_data_changed(self, event=None):
+        """Refreshes the range, or defers it in a deferred_refresh block"""
+        state = _deferred_refresh_state
+        if state.depth > 0:
+            state.pending[self] = None
+        else:
+            self.refresh()
@@ -17,6 +17,7 @@ from enable.api import Container
 from traits.api import Bool, Instance, Property, Str, Tuple
 
 # Local, relative imports
+from .frame_scheduler import FrameScheduler, find_frame_scheduler
 from .plot_component import DEFAULT_DRAWING_ORDER, PlotComponent
 
 
@@ -47,3 +48,14 @@ class BasePlotContainer(Container):
 
     draw_order = Instance(list, args=(DEFAULT_DRAWING_ORDER,))
     draw_layer = Str("plot")
+    frame_scheduler = Instance(FrameScheduler)
+
+    def request_redraw(self):
+        """Requests that the container redraw itself.
+
+        If there is a frame scheduler, the request is deferred to its next
+        frame.
+        """
+        scheduler = find_frame_scheduler(self)
+        if scheduler is None or not scheduler.defer_redraw(self):
+            super().request_redraw()
@@ -10,12 +10,17 @@
 
 """ Defines the base class for XY plots.
 """
+from functools import partial
 from math import sqrt
 from numpy import around, array, empty, isnan, transpose
 
 # Enthought library imports
 from enable.api import black_color_trait
-from traits.api import Any, Array, Bool, Enum, Float, Instance, Property, Range
+from kiva.agg import GraphicsContextArray
+from traits.api import (
+    Any, Array, Bool, Callable, Enum, Float, Instance, Int, observe, Property,
+    Range
+)
 
 
 # Local relative imports
@@ -25,8 +30,11 @@ from .abstract_data_source import AbstractDataSource
 from .array_data_source import ArrayDataSource
 from .axis import PlotAxis
 from .base import point_line_distance, reverse_map_1d
+from .frame_scheduler import default_call_later
 from .grid import PlotGrid
 from .overlays.plot_label import PlotLabel
+from .progressive_render import ProgressiveRender
+from .subdivision_grid import SubdivisionGrid
 
 
 class BaseXYPlot(AbstractPlotRenderer):
@@ -105,14 +113,39 @@ class BaseXYPlot(AbstractPlotRenderer):
     # ------------------------------------------------------------------------
 
     #: Does the plot use downsampling?
-    #: This is not used right now.  It needs an implementation of robust, fast
-    #: downsampling, which does not exist yet.
+    #: Only renderers which implement :meth:`_downsample`, such as
+    #: :class:`~chaco.plots.lineplot.LinePlot`, reduce their points to the
+    #: screen resolution; for the others this has no effect.
     use_downsampling = Bool(False)
 
     #: Does the plot use a spatial subdivision structure for fast hit-testing?
     #: This makes data updates slower, but makes hit-tests extremely fast.
     use_subdivision = Bool(False)
 
+    #: Does the plot draw its points progressively?
+    #: Renderers which split their points into chunks, such as
+    #: :class:`~chaco.plots.lineplot.LinePlot` and the markers of
+    #: :class:`~chaco.plots.scatterplot.ScatterPlot`, then draw a coarse
+    #: subset of the points right away when they have more than
+    #: **progressive_chunk_size** points in view, and draw the rest one chunk
+    #: at a time on timer callbacks, so that the user interface is not
+    #: blocked.  Any change to the plot, such as a new data range, starts the
+    #: drawing over.  Images of the plot rendered before all the chunks are
+    #: drawn do not show all the points.
+    use_progressive_rendering = Bool(False)
+
+    #: The number of points drawn in each chunk by progressive rendering.
+    progressive_chunk_size = Int(1000000)
+
+    #: The fraction of the chunks of a progressive rendering which are drawn,
+    #: from 0.0 to 1.0.  Overlays can observe it to show the progress.
+    render_progress = Range(0.0, 1.0, 1.0)
+
+    #: The function called as ``call_later(delay, callback)`` to draw the
+    #: next chunk of a progressive rendering in ``delay`` milliseconds.  By
+    #: default, a single shot timer of the current Pyface toolkit.
+    call_later = Callable(default_call_later)
+
     #: Overrides the default background color trait in PlotComponent.
     bgcolor = "transparent"
 
@@ -145,7 +178,15 @@ class BaseXYPlot(AbstractPlotRenderer):
     _screen_cache_valid = Bool(False, transient=True)
 
     # Reference to a spatial subdivision acceleration structure.
-    _subdivision = Any
+    _subdivision = Any(transient=True)
+
+    # The (low, high) bounds of the index data to gather the points in, while
+    # a strip of the plot is drawn by draw_index_strip(), or None to gather
+    # the points of the whole index range.
+    _gather_index_bounds = Any(None, transient=True)
+
+    # The ProgressiveRender of the points in view, or None.
+    _progressive = Any(None, transient=True)
 
     # ------------------------------------------------------------------------
     # Abstract methods that subclasses must implement
@@ -485,15 +526,95 @@ class BaseXYPlot(AbstractPlotRenderer):
         else:
             return self.map_screen(self._cached_data_pts)
 
+    def draw_index_strip(self, gc, low, high, mode="normal"):
+        """Draws the 'plot' layer between two screen positions on the index
+        axis.
+
+        Renderers which support it only gather the points whose index is in
+        the data range of the strip, widened by the size of their markers, so
+        that drawing a thin strip of a long series is cheap.  This is used to
+        draw the strips uncovered while panning.
+        """
+        margin = self._index_strip_margin()
+        data_bounds = self.index_mapper.map_data(
+            array([low - margin, high + margin])
+        )
+        if self.orientation == "h":
+            clip_rect = (low, self.y, high - low, self.height)
+        else:
+            clip_rect = (self.x, low, self.width, high - low)
+
+        self._gather_index_bounds = (data_bounds.min(), data_bounds.max())
+        try:
+            with gc:
+                gc.clip_to_rect(*clip_rect)
+                self._dispatch_draw("plot", gc, None, mode)
+        finally:
+            self._gather_index_bounds = None
+
     # ------------------------------------------------------------------------
     # PlotComponent interface
     # ------------------------------------------------------------------------
 
+    def invalidate_draw(self, damaged_regions=None, self_relative=False):
+        """Invalidates the drawing, and starts any progressive rendering
+        over.
+
+        Overrides Component.
+        """
+        self._progressive = None
+        super().invalidate_draw(damaged_regions, self_relative)
+
     def _draw_plot(self, gc, view_bounds=None, mode="normal"):
         """Draws the 'plot' layer."""
+        if (
+            self.use_progressive_rendering
+            and self._gather_index_bounds is None
+            and isinstance(gc, GraphicsContextArray)
+        ):
+            self._draw_plot_progressive(gc)
+            return
         pts = self.get_screen_points()
         self._render(gc, pts)
 
+    def _draw_plot_progressive(self, gc):
+        """Draws the chunks of the points drawn so far, over the coarse
+        points until all the chunks are drawn.
+
+        The first chunk is drawn right away, and the next ones on timer
+        callbacks.
+        """
+        if self.window is not None:
+            pixel_scale = self.window.base_pixel_scale
+        else:
+            pixel_scale = 1.0
+        rect = (self.x, self.y, self.width, self.height)
+        key = (rect, pixel_scale)
+
+        state = self._progressive
+        if state is None or state.key != key:
+            self._progressive = None
+            pts = self.get_screen_points()
+            chunks = self._get_progressive_chunks(pts)
+            if chunks is None or len(chunks) < 2:
+                self.render_progress = 1.0
+                self._render(gc, pts)
+                return
+            state = ProgressiveRender(
+                key,
+                rect,
+                pixel_scale,
+                chunks,
+                coarse=self._get_progressive_coarse(pts),
+            )
+            state.draw_coarse(self._render_progressive_chunk)
+            state.draw_next_chunk(self._render_progressive_chunk)
+            self._progressive = state
+            self.render_progress = state.progress
+            self.call_later(0, partial(self._refine_progressive, state))
+
+        state.draw(gc)
+
     def _draw_default_axes(self, gc):
         if not self.origin_axis_visible:
             return
@@ -525,8 +646,73 @@ class BaseXYPlot(AbstractPlotRenderer):
         self._cache_valid = False
         self._screen_cache_valid = False
 
+    def _get_gather_index_bounds(self):
+        """The (low, high) bounds of the index data to gather points in"""
+        low, high = self.index_range.low, self.index_range.high
+        if self._gather_index_bounds is not None:
+            strip_low, strip_high = self._gather_index_bounds
+            low, high = max(low, strip_low), min(high, strip_high)
+        return low, high
+
+    def _index_strip_margin(self):
+        """How far, in pixels, a point can be drawn from its position"""
+        return 0.0
+
+    def _get_progressive_chunks(self, points):
+        """Splits the screen points into the chunks of a progressive
+        rendering.
+
+        Returns None if the renderer draws all its points at once.
+        """
+        return None
+
+    def _get_progressive_coarse(self, points):
+        """A coarse chunk drawn below the chunks until they are all drawn,
+        or None.
+        """
+        return None
+
+    def _render_progressive_chunk(self, gc, chunk, last):
+        """Draws a chunk of a progressive rendering"""
+        self._render(gc, chunk)
+
+    def _refine_progressive(self, state):
+        """Draws the next chunk of a progressive rendering"""
+        if self._progressive is not state:
+            # The plot changed, and the rendering started over.
+            return
+        state.draw_next_chunk(self._render_progressive_chunk)
+        if not state.finished:
+            self.call_later(0, partial(self._refine_progressive, state))
+        # Invalidating the plot drops the rendering, which is still current.
+        self.invalidate_draw()
+        self._progressive = state
+        self.render_progress = state.progress
+        self.request_redraw()
+
+    def _set_up_subdivision(self):
+        self._update_subdivision()
+
     def _update_subdivision(self):
-        pass
+        """Rebuilds the spatial subdivision structure from the current
+        index and value data.
+        """
+        self._subdivision = None
+        if not self.use_subdivision:
+            return
+        if self.index is None or self.value is None:
+            return
+
+        index_data = self.index.get_data()
+        value_data = self.value.get_data()
+        if (
+            len(index_data) != len(value_data)
+            or getattr(value_data, "ndim", 1) != 1
+        ):
+            # Can happen transiently while index and value are being
+            # updated one after the other; the next data change rebuilds.
+            return
+        self._subdivision = SubdivisionGrid(index_data, value_data)
 
     # ------------------------------------------------------------------------
     # Properties
@@ -656,6 +842,8 @@ class BaseXYPlot(AbstractPlotRenderer):
         self._either_data_updated()
 
     def _either_data_updated(self, event=None):
+        if self.use_subdivision:
+            self._update_subdivision()
         self.invalidate_draw()
         self._cache_valid = False
         self._screen_cache_valid = False
@@ -717,6 +905,11 @@ class BaseXYPlot(AbstractPlotRenderer):
         self.invalidate_draw()
         self.request_redraw()
 
+    @observe("_gather_index_bounds")
+    def _gather_index_bounds_updated(self, event):
+        self._cache_valid = False
+        self._screen_cache_valid = False
+
     def _visible_changed(self, old, new):
         if new:
             self._layout_needed = True
@@ -727,6 +920,8 @@ class BaseXYPlot(AbstractPlotRenderer):
     def _use_subdivision_changed(self, old, new):
         if new:
             self._set_up_subdivision()
+        else:
+            self._subdivision = None
 
     # ------------------------------------------------------------------------
     # Persistence
@@ -742,4 +937,5 @@ class BaseXYPlot(AbstractPlotRenderer):
         self.invalidate_draw()
         self._cache_valid = False
         self._screen_cache_valid = False
+        self._update_subdivision()
         self._update_mappers()
@@ -11,6 +11,9 @@
 """ Defines the ColorMapper and ColorMapTemplate classes.
 """
 
+# Standard library imports
+import os
+
 # Major library imports
 from numpy import (
     arange,
@@ -18,6 +21,7 @@ from numpy import (
     asarray,
     clip,
     divide,
+    empty,
     float32,
     int8,
     isinf,
@@ -28,6 +32,7 @@ from numpy import (
     sort,
     take,
     uint8,
+    uint16,
     where,
     zeros,
     linspace,
@@ -53,7 +58,11 @@ from traits.api import (
 from .abstract_colormap import AbstractColormap
 from .data_range_1d import DataRange1D
 
-from .speedups import map_colors, map_colors_uint8
+from .speedups import gather_colors_uint8, map_colors, map_colors_uint8
+from .thread_pool import get_thread_pool
+
+# The smallest number of values that map_uint8 maps in a separate thread.
+_MIN_THREAD_SIZE = 1 << 16
 
 
 class ColorMapTemplate(HasTraits):
@@ -129,9 +138,18 @@ class ColorMapper(AbstractColormap):
     #: on this mapper for visual output should do a redraw or repaint.
     updated = Event
 
+    #: The number of threads of the shared thread pool mapping large arrays
+    #: in :meth:`map_uint8`.  If 0, one thread per CPU is used; if 1, arrays
+    #: are mapped in the calling thread.
+    map_threads = Int(0)
+
     # Are the mapping arrays out of date?
     _dirty = Bool(True)
 
+    # The colors of every uint8 or uint16 value for the current range, keyed
+    # by data type, as a tuple of (low, high, steps) and the color table.
+    _uint8_luts = Dict
+
     # The raw segment data for creating the mapping array.
     _segmentdata = Dict  # (Str, Tuple | List)
 
@@ -317,20 +335,61 @@ class ColorMapper(AbstractColormap):
         self._recalculate()
 
     def map_uint8(self, data_array):
-        """Maps an array of data values to an array of colors."""
+        """Maps an array of data values to an array of colors.
+
+        Large uint8 and uint16 arrays are mapped by looking their values up in
+        a table of the colors of every possible value, which is computed once
+        per colormap and range.  Large arrays are split into blocks of rows
+        which are mapped in parallel threads.
+        """
         if self._dirty:
             self._recalculate()
 
-        rgba = map_colors_uint8(
-            data_array,
-            self.steps,
-            self.range.low,
-            self.range.high,
-            self._red_lut_uint8,
-            self._green_lut_uint8,
-            self._blue_lut_uint8,
-            self._alpha_lut_uint8,
-        )
+        data_array = asarray(data_array)
+        if (
+            data_array.dtype in (uint8, uint16)
+            and data_array.size >= 1 << (8 * data_array.itemsize)
+        ):
+            lut = self._get_uint8_lut(data_array.dtype)
+
+            def map_block(data, rgba):
+                gather_colors_uint8(data, lut, out=rgba)
+
+        else:
+            low = self.range.low
+            high = self.range.high
+
+            def map_block(data, rgba):
+                map_colors_uint8(
+                    data,
+                    self.steps,
+                    low,
+                    high,
+                    self._red_lut_uint8,
+                    self._green_lut_uint8,
+                    self._blue_lut_uint8,
+                    self._alpha_lut_uint8,
+                    out=rgba,
+                )
+
+        rgba = empty(data_array.shape + (4,), dtype=uint8)
+        n_blocks = 1
+        if data_array.ndim > 0:
+            n_blocks = min(
+                self.map_threads or os.cpu_count() or 1,
+                data_array.size // _MIN_THREAD_SIZE,
+                len(data_array),
+            )
+        if n_blocks <= 1:
+            map_block(data_array, rgba)
+        else:
+            edges = linspace(0, len(data_array), n_blocks + 1).astype(int)
+            pool = get_thread_pool()
+            for future in [
+                pool.submit(map_block, data_array[start:end], rgba[start:end])
+                for start, end in zip(edges[:-1], edges[1:])
+            ]:
+                future.result()
 
         return rgba
 
@@ -338,6 +397,24 @@ class ColorMapper(AbstractColormap):
     # Private methods
     # ------------------------------------------------------------------------
 
+    def _get_uint8_lut(self, dtype):
+        """Gets the colors of every value of a uint8 or uint16 data type."""
+        key = (self.range.low, self.range.high, self.steps)
+        cached_key, lut = self._uint8_luts.get(dtype.str, (None, None))
+        if cached_key != key:
+            lut = map_colors_uint8(
+                arange(1 << (8 * dtype.itemsize), dtype=dtype),
+                self.steps,
+                self.range.low,
+                self.range.high,
+                self._red_lut_uint8,
+                self._green_lut_uint8,
+                self._blue_lut_uint8,
+                self._alpha_lut_uint8,
+            )
+            self._uint8_luts[dtype.str] = (key, lut)
+        return lut
+
     def _get_color_bands(self):
         """Gets the color bands array."""
         if self._dirty:
@@ -370,6 +447,7 @@ class ColorMapper(AbstractColormap):
         self._green_lut_uint8 = (self._green_lut * 255.0).astype("uint8")
         self._blue_lut_uint8 = (self._blue_lut * 255.0).astype("uint8")
         self._alpha_lut_uint8 = (self._alpha_lut * 255.0).astype("uint8")
+        self._uint8_luts = {}
         self.updated = True
         self._dirty = False
 
@@ -388,16 +388,20 @@ class DataRange1D(BaseDataRange):
     def _sources_items_changed(self, event):
         self.refresh()
         for source in event.removed:
-            source.observe(self.refresh, "data_changed", remove=True)
+            source.observe(
+                self._source_data_changed, "data_changed", remove=True
+            )
         for source in event.added:
-            source.observe(self.refresh, "data_changed")
+            source.observe(self._source_data_changed, "data_changed")
 
     def _sources_changed(self, old, new):
         self.refresh()
         for source in old:
-            source.observe(self.refresh, "data_changed", remove=True)
+            source.observe(
+                self._source_data_changed, "data_changed", remove=True
+            )
         for source in new:
-            source.observe(self.refresh, "data_changed")
+            source.observe(self._source_data_changed, "data_changed")
 
     # ------------------------------------------------------------------------
     # Serialization interface
@@ -220,9 +220,11 @@ class DataRange2D(BaseDataRange):
 
     def _sources_items_changed(self, event):
         for source in event.removed:
-            source.observe(self.refresh, "data_changed", remove=True)
+            source.observe(
+                self._source_data_changed, "data_changed", remove=True
+            )
         for source in event.added:
-            source.observe(self.refresh, "data_changed")
+            source.observe(self._source_data_changed, "data_changed")
         # the _xdata and _ydata of the sources may be created anew on every
         # access, so we can't just add/delete from _xrange and _yrange sources
         # based on object identity. So recreate lists each time:
@@ -232,9 +234,11 @@ class DataRange2D(BaseDataRange):
 
     def _sources_changed(self, old, new):
         for source in old:
-            source.observe(self.refresh, "data_changed", remove=True)
+            source.observe(
+                self._source_data_changed, "data_changed", remove=True
+            )
         for source in new:
-            source.observe(self.refresh, "data_changed")
+            source.observe(self._source_data_changed, "data_changed")
         # the _xdata and _ydata of the sources may be created anew on every
         # access, so we can't just add/delete from _xrange and _yrange sources
         # based on object identity. So recreate lists each time:
@@ -11,20 +11,25 @@
 """ Defines the DataView class, and associated property traits and property
 functions.
 """
-from numpy import array, empty, transpose
+from numpy import around, array, empty, transpose
 
-from traits.api import Bool, Enum, Instance, Int, observe, Property, Union
+from traits.api import (
+    Any, Bool, Enum, Instance, Int, observe, Property, Str, Union
+)
 from enable.api import color_table
+from kiva.agg import GraphicsContextArray
 
 from .abstract_overlay import AbstractOverlay
 from .axis import PlotAxis
 from .base_1d_mapper import Base1DMapper
 from .base_2d_plot import Base2DPlot
+from .base_xy_plot import BaseXYPlot
 from .data_range_2d import DataRange2D
 from .grid import PlotGrid
 from .linear_mapper import LinearMapper
 from .log_mapper import LogMapper
 from .plot_containers import OverlayPlotContainer
+from .plot_graphics_context import PlotGraphicsContext
 
 
 # -----------------------------------------------------------------------------
@@ -285,6 +290,39 @@ class DataView(OverlayPlotContainer):
 
     border_visible = True
 
+    # ------------------------------------------------------------------------
+    # Layer cache
+    # ------------------------------------------------------------------------
+
+    #: Whether to keep the layers of **draw_order** up to and including
+    #: **cached_layer** in an off-screen bitmap.  The bitmap is drawn again,
+    #: instead of the layers, until one of their components is invalidated
+    #: or the view is resized, so that changes which only affect the later
+    #: layers, such as moving an inspector overlay, do not render the plots
+    #: again.  The bitmap is opaque, and is only used with Agg graphics
+    #: contexts.
+    use_layer_cache = Bool(False)
+
+    #: The last layer kept in the layer cache.
+    cached_layer = Str("plot")
+
+    #: Whether the view is being panned, for instance by a
+    #: :class:`~chaco.tools.pan_tool.PanTool` with **blit_panning**.  While
+    #: it is, the layer cache is used, and if all the components are x-y
+    #: plots, their plot area is shifted by the distance panned and only the
+    #: uncovered strips are drawn.  The view is drawn in full again once this
+    #: is set back to False.
+    blit_panning = Bool(False)
+
+    # The off-screen bitmap of the cached layers
+    _layer_cache = Any(transient=True)
+
+    # The position, bounds, pixel scale and mode of the cached layers
+    _layer_cache_key = Any(transient=True)
+
+    # The mappers of the cached layers, with the ranges they had
+    _layer_cache_ranges = Any(transient=True)
+
     # ------------------------------------------------------------------------
     # Public methods
     # ------------------------------------------------------------------------
@@ -329,6 +367,240 @@ class DataView(OverlayPlotContainer):
     # Private methods
     # ------------------------------------------------------------------------
 
+    def _draw(self, gc, view_bounds=None, mode="default"):
+        """Draws the component, using the layer cache if it is enabled.
+
+        Overrides Enable Component.
+        """
+        if (
+            not (self.use_layer_cache or self.blit_panning)
+            or self.use_backbuffer
+            or not self.visible
+            or self.cached_layer not in self.draw_order
+            or not isinstance(gc, GraphicsContextArray)
+        ):
+            super()._draw(gc, view_bounds, mode)
+            return
+
+        if self.layout_needed:
+            self.do_layout()
+        self.drawn_outer_position = list(self.outer_position[:])
+        self.drawn_outer_bounds = list(self.outer_bounds[:])
+
+        x, y = self.outer_position
+        width, height = self.outer_bounds
+        if self.window is not None:
+            pixel_scale = self.window.base_pixel_scale
+        else:
+            pixel_scale = 1.0
+        split = self.draw_order.index(self.cached_layer) + 1
+        layers = self.draw_order[:split]
+
+        key = (x, y, width, height, pixel_scale, mode)
+        if not self.draw_valid or self._layer_cache_key != key:
+            offset = None
+            if self.blit_panning and self._layer_cache_key == key:
+                offset = self._get_pan_offset(pixel_scale)
+            bitmap = PlotGraphicsContext(
+                (width, height), dpi=72.0 * pixel_scale
+            )
+            if self.window is not None:
+                bitmap.clear(self.window.bgcolor_)
+            bitmap.translate_ctm(-x, -y)
+            if offset is None:
+                for layer in layers:
+                    self._dispatch_draw(layer, bitmap, None, mode)
+            else:
+                self._draw_panned_layers(bitmap, layers, offset, mode)
+            self._layer_cache = bitmap
+            self._layer_cache_key = key
+            self._layer_cache_ranges = self._get_mapper_ranges()
+            self.draw_valid = True
+
+        with gc:
+            gc.set_image_interpolation("nearest")
+            self._draw_layer_cache(gc, 0.0, 0.0)
+        for layer in self.draw_order[split:]:
+            self._dispatch_draw(layer, gc, view_bounds, mode)
+
+    def _draw_layer_cache(self, gc, dx, dy):
+        """Draws the layer cache, shifted by (dx, dy)"""
+        # The pixels of the bitmap are offset by half a pixel, like those of
+        # the graphics context, so that they line up exactly.
+        bitmap = self._layer_cache
+        pixel_scale = self._layer_cache_key[4]
+        x, y = self.outer_position
+        gc.draw_image(
+            bitmap,
+            (
+                x - 0.5 / pixel_scale + dx,
+                y - 0.5 / pixel_scale + dy,
+                bitmap.width() / pixel_scale,
+                bitmap.height() / pixel_scale,
+            ),
+        )
+
+    def _get_mapper_ranges(self):
+        """The mappers of the view and of its plots, with their current
+        ranges and the screen positions of these.
+
+        Returns None if the layers cannot be shifted while panning, because
+        some of the components are not x-y plots filling the view, or not all
+        the mappers are linear or logarithmic.
+        """
+        mappers = [("x", self.x_mapper), ("y", self.y_mapper)]
+        for component in self.components:
+            if not component.visible:
+                continue
+            if (
+                not isinstance(component, BaseXYPlot)
+                or len(component.underlays) > 0
+                or list(component.outer_position) != [0, 0]
+                or list(component.outer_bounds) != list(self.bounds)
+            ):
+                return None
+            mappers.append(("x", component.x_mapper))
+            mappers.append(("y", component.y_mapper))
+
+        ranges = []
+        for axis, mapper in mappers:
+            if not isinstance(mapper, (LinearMapper, LogMapper)):
+                return None
+            data = array([mapper.range.low, mapper.range.high])
+            ranges.append((axis, mapper, data, mapper.map_screen(data)))
+        return ranges
+
+    def _get_pan_offset(self, pixel_scale):
+        """The (dx, dy) distance the view was panned by since the layer cache
+        was drawn.
+
+        Returns None unless all the mappers were translated by the same whole
+        number of pixels, less than the size of the view.
+        """
+        previous = self._layer_cache_ranges
+        current = self._get_mapper_ranges()
+        if (
+            previous is None
+            or current is None
+            or [r[1] for r in previous] != [r[1] for r in current]
+        ):
+            return None
+
+        offsets = {"x": set(), "y": set()}
+        for axis, mapper, data, screen in previous:
+            shift = (mapper.map_screen(data) - screen) * pixel_scale
+            pixels = around(shift)
+            if abs(shift - pixels).max() > 1e-3 or pixels[0] != pixels[1]:
+                return None
+            offsets[axis].add(pixels[0])
+        if len(offsets["x"]) != 1 or len(offsets["y"]) != 1:
+            return None
+
+        dx = offsets["x"].pop() / pixel_scale
+        dy = offsets["y"].pop() / pixel_scale
+        if abs(dx) >= self.width or abs(dy) >= self.height:
+            return None
+        return dx, dy
+
+    def _draw_panned_layers(self, bitmap, layers, offset, mode):
+        """Draws the cached layers after the view was panned by offset
+
+        The plot area of the previous layer cache is shifted by the offset,
+        and only the padding and the strips of the plot area which were
+        uncovered are drawn.
+        """
+        dx, dy = offset
+        x, y = self.position
+        width, height = self.bounds
+        outer_x, outer_y = self.outer_position
+        outer_x2 = outer_x + self.outer_bounds[0]
+        outer_y2 = outer_y + self.outer_bounds[1]
+
+        with bitmap:
+            bitmap.clip_to_rect(x, y, width, height)
+            bitmap.set_image_interpolation("nearest")
+            self._draw_layer_cache(bitmap, dx, dy)
+
+        # The plot components only draw in the plot area.
+        padding_layers = [
+            layer for layer in layers if layer not in ("image", "plot")
+        ]
+        padding_rects = [
+            (outer_x, outer_y, x - outer_x, outer_y2 - outer_y),
+            (x + width, outer_y, outer_x2 - x - width, outer_y2 - outer_y),
+            (x, outer_y, width, y - outer_y),
+            (x, y + height, width, outer_y2 - y - height),
+        ]
+        for rect in padding_rects:
+            if rect[2] > 0 and rect[3] > 0:
+                with bitmap:
+                    bitmap.clip_to_rect(*rect)
+                    for layer in padding_layers:
+                        self._dispatch_draw(layer, bitmap, None, mode)
+
+        # The strips also cover the antialiased edges of the previous plot
+        # area, which were clipped, and the ticks that the axes draw inside
+        # the plot area, which do not move with the data across the axes.
+        border = 2.0
+        for axis in self.underlays:
+            if isinstance(axis, PlotAxis) and axis.visible:
+                border = max(border, 2.0 + axis.tick_in + axis.tick_weight)
+        if dx != 0:
+            self._draw_strip(
+                bitmap, layers, "x", x, x + border + max(dx, 0), mode
+            )
+            self._draw_strip(
+                bitmap,
+                layers,
+                "x",
+                x + width - border - max(-dx, 0),
+                x + width,
+                mode,
+            )
+        if dy != 0:
+            self._draw_strip(
+                bitmap, layers, "y", y, y + border + max(dy, 0), mode
+            )
+            self._draw_strip(
+                bitmap,
+                layers,
+                "y",
+                y + height - border - max(-dy, 0),
+                y + height,
+                mode,
+            )
+
+    def _draw_strip(self, bitmap, layers, axis, low, high, mode):
+        """Draws the cached layers in a strip of the plot area
+
+        The plots only gather the points in the strip when it is across their
+        index axis.
+        """
+        x, y = self.position
+        if axis == "x":
+            rect = (low, y, high - low, self.height)
+        else:
+            rect = (x, low, self.width, high - low)
+
+        with bitmap:
+            bitmap.clip_to_rect(*rect)
+            for layer in layers:
+                if layer != "plot":
+                    self._dispatch_draw(layer, bitmap, None, mode)
+                    continue
+                origin = x if axis == "x" else y
+                with bitmap:
+                    bitmap.translate_ctm(x, y)
+                    for plot in self.components:
+                        if not plot.visible:
+                            continue
+                        if axis == ("x" if plot.orientation == "h" else "y"):
+                            plot.draw_index_strip(
+                                bitmap, low - origin, high - origin, mode
+                            )
+                        else:
+                            plot._dispatch_draw("plot", bitmap, None, mode)
+
     def _init_components(self):
         # Since this is called after the HasTraits constructor, we have to make
         # sure that we don't blow away any components that the caller may have
@@ -477,6 +749,22 @@ class DataView(OverlayPlotContainer):
     def _bgcolor_changed(self):
         self.invalidate_draw()
 
+    def _underlays_items_changed(self, event):
+        self.invalidate_draw()
+
+    def _use_layer_cache_changed(self, new):
+        if not new:
+            self._layer_cache = None
+            self._layer_cache_key = None
+
+    def _blit_panning_changed(self, new):
+        if not new:
+            self._layer_cache_ranges = None
+            if not self.use_layer_cache:
+                self._layer_cache = None
+                self._layer_cache_key = None
+            self.invalidate_and_redraw()
+
     def _x_grid_changed(self, old, new):
         self._underlay_change_helper(old, new)
 
@@ -0,0 +1,82 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+cimport cython
+
+from numpy import empty
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def m4(double[:, :] points not None, Py_ssize_t[:] bucket_starts not None):
+    """ Keep the first, last, minimum and maximum point of each bucket
+
+    Parameters
+    ----------
+    points : N, 2 array of float
+        The points as a N by 2 array of floats.  The index values (column 0)
+        must be monotone.
+    bucket_starts : array of int
+        The index of the first point of each bucket, followed by N.  Must be
+        non-decreasing.
+
+    Returns
+    -------
+    sampled : M, 2 array of float
+        The downsampled points, in their original order.
+    """
+    cdef Py_ssize_t n_buckets = bucket_starts.shape[0] - 1
+    cdef Py_ssize_t b, i, start, end, i_min, i_max, lo, hi, last
+    cdef Py_ssize_t count = 0
+    cdef double y
+    result = empty(shape=(4 * n_buckets, 2), dtype=float)
+    cdef double[:, :] sampled = result
+
+    with nogil:
+        for b in range(n_buckets):
+            start = bucket_starts[b]
+            end = bucket_starts[b + 1]
+            if end <= start:
+                continue
+
+            i_min = start
+            i_max = start
+            for i in range(start + 1, end):
+                y = points[i, 1]
+                if y < points[i_min, 1]:
+                    i_min = i
+                if y > points[i_max, 1]:
+                    i_max = i
+
+            if i_min < i_max:
+                lo = i_min
+                hi = i_max
+            else:
+                lo = i_max
+                hi = i_min
+            last = end - 1
+
+            sampled[count, 0] = points[start, 0]
+            sampled[count, 1] = points[start, 1]
+            count += 1
+            if lo > start:
+                sampled[count, 0] = points[lo, 0]
+                sampled[count, 1] = points[lo, 1]
+                count += 1
+            if hi > lo:
+                sampled[count, 0] = points[hi, 0]
+                sampled[count, 1] = points[hi, 1]
+                count += 1
+            if last > hi:
+                sampled[count, 0] = points[last, 0]
+                sampled[count, 1] = points[last, 1]
+                count += 1
+
+    return result[:count]
@@ -0,0 +1,102 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+cimport cython
+
+from numpy import empty, intp, zeros
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def douglas_peucker_mask(double[:, :] points not None,
+                         Py_ssize_t[:] offsets not None,
+                         double tolerance):
+    """ Which points of concatenated polylines are kept by Douglas-Peucker
+
+    Parameters
+    ----------
+    points : N, 2 array of float
+        The points of all the polylines, one after the other.
+    offsets : array of int
+        The index of the first point of each polyline, followed by N.
+    tolerance : float
+        The largest distance allowed between a removed point and the
+        simplified polyline.
+
+    Returns
+    -------
+    keep : N array of bool
+        Whether each point is kept.
+    """
+    cdef Py_ssize_t n_points = points.shape[0]
+    cdef Py_ssize_t n_polylines = offsets.shape[0] - 1
+    cdef Py_ssize_t p, i, start, end, farthest, top
+    cdef double tolerance2 = tolerance * tolerance
+    cdef double dx, dy, length2, ox, oy, t, ex, ey, distance2, max_distance2
+    result = zeros(n_points, dtype=bool)
+    cdef char[:] keep = result.view("int8")
+    # A stack of the segments left to check, as pairs of point indices
+    stack_array = empty(2 * n_points + 2, dtype=intp)
+    cdef Py_ssize_t[:] stack = stack_array
+
+    with nogil:
+        for p in range(n_polylines):
+            start = offsets[p]
+            end = offsets[p + 1] - 1
+            if end < start:
+                continue
+            keep[start] = 1
+            keep[end] = 1
+            top = 0
+            stack[0] = start
+            stack[1] = end
+            top = 2
+            while top > 0:
+                top -= 2
+                start = stack[top]
+                end = stack[top + 1]
+                if end - start < 2:
+                    continue
+
+                dx = points[end, 0] - points[start, 0]
+                dy = points[end, 1] - points[start, 1]
+                length2 = dx * dx + dy * dy
+                farthest = start + 1
+                max_distance2 = -1.0
+                for i in range(start + 1, end):
+                    ox = points[i, 0] - points[start, 0]
+                    oy = points[i, 1] - points[start, 1]
+                    # Degenerate segments, such as the ends of a closed
+                    # polyline, measure the distance to their start point.
+                    if length2 > 0:
+                        t = (ox * dx + oy * dy) / length2
+                        if t < 0.0:
+                            t = 0.0
+                        elif t > 1.0:
+                            t = 1.0
+                    else:
+                        t = 0.0
+                    ex = ox - t * dx
+                    ey = oy - t * dy
+                    distance2 = ex * ex + ey * ey
+                    if distance2 > max_distance2:
+                        max_distance2 = distance2
+                        farthest = i
+
+                if max_distance2 > tolerance2:
+                    keep[farthest] = 1
+                    stack[top] = start
+                    stack[top + 1] = farthest
+                    stack[top + 2] = farthest
+                    stack[top + 3] = end
+                    top += 4
+
+    return result
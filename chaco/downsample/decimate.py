@@ -0,0 +1,42 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+import numpy as np
+
+
+def decimate(points, n_points):
+    """Keep every k-th point so that at most about n_points remain
+
+    This is the cheapest downsampling method: the result is a strided view
+    of the input, plus the last point so the line still spans the full
+    range.  Unlike the other methods, it makes no assumption about the order
+    of the index values, but narrow features between the kept points are
+    lost.
+
+    Parameters
+    ----------
+    points : N, 2 array of float
+        The points as a N by 2 array of floats.
+    n_points : int
+        The approximate number of points to keep.
+
+    Returns
+    -------
+    sampled : M, 2 array of float
+        The downsampled points, in their original order.
+    """
+    if n_points >= points.shape[0] or n_points <= 2:
+        return points
+
+    stride = -(-points.shape[0] // n_points)
+    sampled = points[::stride]
+    if (points.shape[0] - 1) % stride != 0:
+        sampled = np.concatenate([sampled, points[-1:]])
+    return sampled
@@ -8,18 +8,12 @@
 #
 # Thanks for using Enthought open source!
 
-import logging
-
-logger = logging.getLogger(__name__)
-
+import numpy as np
 
 try:
     from chaco.downsample import _lttb
 except ImportError:
     _lttb = None
-    logger.warning(
-        "Can't import _lttb extension module, lttb downsampling will not work."
-    )
 
 
 def largest_triangle_three_buckets(points, n_buckets):
@@ -54,5 +48,43 @@ def largest_triangle_three_buckets(points, n_buckets):
     if _lttb is not None:
         return _lttb.lttb(points, n_buckets)
     else:
-        # can't downsample, do nothing, but better than crashing
-        return points
+        return _lttb_numpy(np.asarray(points, dtype=float), n_buckets)
+
+
+def _lttb_numpy(points, n_buckets):
+    """NumPy implementation of the LTTB kernel in _lttb.pyx
+
+    Each bucket depends on the point chosen from the previous one, so this
+    loops over the buckets in Python, but is vectorized within each bucket.
+    """
+    data_length = points.shape[0]
+    sampled = np.empty(shape=(n_buckets, 2), dtype=float)
+    sampled[0] = points[0]
+
+    bucket_size = (data_length - 2.0) / (n_buckets - 2.0)
+    current_bucket_start = 1
+    current_bucket_end = int(bucket_size) + 1
+    a = 0
+
+    for i in range(n_buckets - 2):
+        next_bucket_end = min(int((i + 2) * bucket_size) + 1, data_length)
+        next_bucket = points[current_bucket_end:next_bucket_end]
+        if len(next_bucket) > 0:
+            avg_x, avg_y = next_bucket.mean(axis=0)
+        else:
+            avg_x = avg_y = 0.0
+
+        a_x, a_y = points[a]
+        bucket = points[current_bucket_start:current_bucket_end]
+        area = np.abs(
+            (a_x - avg_x) * (bucket[:, 1] - a_y)
+            - (a_x - bucket[:, 0]) * (avg_y - a_y)
+        )
+        a = current_bucket_start + np.argmax(area)
+        sampled[i + 1] = points[a]
+
+        current_bucket_start = current_bucket_end
+        current_bucket_end = next_bucket_end
+
+    sampled[-1] = points[-1]
+    return sampled
@@ -0,0 +1,93 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+import numpy as np
+
+try:
+    from chaco.downsample import _m4
+except ImportError:
+    _m4 = None
+
+
+def m4(points, bucket_edges):
+    """Keep the first, last, minimum and maximum points of each bucket
+
+    This is the M4 aggregation: when the buckets are the pixel columns of
+    the plot, drawing the downsampled line is pixel-identical to drawing the
+    full line, while the number of points is at most four times the width of
+    the plot.
+
+    This function assumes that all values are finite and the index values are
+    monotone increasing.
+
+    Parameters
+    ----------
+    points : N, 2 array of float
+        The points as a N by 2 array of floats.  The index values (column 0)
+        must be monotone increasing.
+    bucket_edges : array of float
+        The increasing index values of the boundaries between buckets.  Points
+        below the first edge fall in the first bucket and points above the
+        last edge fall in the last bucket.
+
+    Returns
+    -------
+    sampled : M, 2 array of float
+        The downsampled points, in their original order.
+
+    References
+    ----------
+
+    Uwe Jugel, Zbigniew Jerzak, Gregor Hackenbroich and Volker Markl,
+    "M4: A Visualization-Oriented Time Series Data Aggregation,"
+    Proceedings of the VLDB Endowment 7(10), 2014.
+    """
+    points = np.ascontiguousarray(points, dtype=float)
+    if len(points) <= 4 * (len(bucket_edges) + 1):
+        return points
+
+    bucket_starts = np.empty(len(bucket_edges) + 2, dtype=np.intp)
+    bucket_starts[0] = 0
+    bucket_starts[1:-1] = np.searchsorted(points[:, 0], bucket_edges)
+    bucket_starts[-1] = len(points)
+
+    if _m4 is not None:
+        return _m4.m4(points, bucket_starts)
+    else:
+        return _m4_numpy(points, bucket_starts)
+
+
+def _m4_numpy(points, bucket_starts):
+    """NumPy implementation of the M4 kernel in _m4.pyx"""
+    starts = bucket_starts[:-1]
+    ends = bucket_starts[1:]
+    nonempty = ends > starts
+    starts = starts[nonempty]
+    ends = ends[nonempty]
+    counts = ends - starts
+
+    y = points[:, 1]
+    positions = np.arange(len(y))
+    no_match = len(y)
+
+    # The first position in each bucket holding the bucket's extreme value
+    y_min = np.repeat(np.minimum.reduceat(y, starts), counts)
+    i_min = np.minimum.reduceat(np.where(y == y_min, positions, no_match),
+                                starts)
+    y_max = np.repeat(np.maximum.reduceat(y, starts), counts)
+    i_max = np.minimum.reduceat(np.where(y == y_max, positions, no_match),
+                                starts)
+
+    indices = np.sort(
+        np.column_stack([starts, i_min, i_max, ends - 1]), axis=1
+    ).ravel()
+    keep = np.ones(len(indices), dtype=bool)
+    keep[1:] = indices[1:] != indices[:-1]
+    return points[indices[keep]]
@@ -0,0 +1,197 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+import numpy as np
+
+
+class MinMaxPyramid(object):
+    """A multi-resolution summary of the minimum and maximum of an array
+
+    Level 0 divides the array into buckets of ``base_size`` consecutive
+    values, and each following level merges pairs of buckets of the level
+    below, until a level has a single bucket.  For every bucket, the
+    positions of its minimum and maximum values are stored, so that the
+    first, minimum, maximum and last points of any run of buckets can be
+    found without touching the full array: this is the M4 aggregation of
+    :func:`chaco.downsample.m4.m4` at a resolution chosen to suit the view.
+
+    The values must all be finite.
+
+    Parameters
+    ----------
+    values : 1D array of float
+        The values to summarize.
+    base_size : int
+        The number of values in each bucket of level 0.
+    """
+
+    def __init__(self, values, base_size=64):
+        self.base_size = base_size
+        self.size = 0
+        # The positions of the minimum and maximum values of each bucket
+        # of each level
+        self._argmin = []
+        self._argmax = []
+        self.update(values)
+
+    def update(self, values, first_changed=0):
+        """Update the pyramid after the values changed or grew
+
+        Only the buckets which contain positions from ``first_changed``
+        onwards are recomputed, so appending a few values to a large array
+        is cheap.
+
+        Parameters
+        ----------
+        values : 1D array of float
+            The complete new array of values.
+        first_changed : int
+            The position of the first value that differs from the array the
+            pyramid was last updated with.
+        """
+        values = np.asarray(values)
+        first_changed = min(first_changed, self.size, len(values))
+        self.size = len(values)
+
+        bucket_size = self.base_size
+        first_bucket = first_changed // bucket_size
+        level = 0
+        while True:
+            n_buckets = -(-self.size // bucket_size)
+            if level == 0:
+                argmin, argmax = _bucket_extrema(
+                    values, first_bucket * bucket_size, bucket_size
+                )
+            else:
+                argmin, argmax = _merge_extrema(
+                    values,
+                    self._argmin[level - 1][2 * first_bucket:],
+                    self._argmax[level - 1][2 * first_bucket:],
+                )
+            if level < len(self._argmin):
+                self._argmin[level] = np.concatenate(
+                    [self._argmin[level][:first_bucket], argmin]
+                )
+                self._argmax[level] = np.concatenate(
+                    [self._argmax[level][:first_bucket], argmax]
+                )
+            else:
+                self._argmin.append(argmin)
+                self._argmax.append(argmax)
+
+            if n_buckets <= 1:
+                break
+            bucket_size *= 2
+            first_bucket //= 2
+            level += 1
+
+        del self._argmin[level + 1:]
+        del self._argmax[level + 1:]
+
+    def positions(self, start, end, index, max_span):
+        """Positions of the points to draw for the values in [start, end)
+
+        Each part of the range is summarized by the coarsest buckets whose
+        index values span no more than ``max_span``, typically the data
+        width of one pixel column, so that unevenly sampled data keeps its
+        shape where it is sparse.  The sorted positions of the first,
+        minimum, maximum and last values of those buckets are returned,
+        along with every position of the buckets of level 0 that still
+        span more.
+
+        Returns None if no bucket is narrow enough, in which case the values
+        in the range should be used directly.
+
+        Parameters
+        ----------
+        start, end : int
+            The range of positions to summarize.
+        index : 1D array of float
+            The index values, in ascending order and all finite.
+        max_span : float
+            The largest difference of index values within a bucket.
+        """
+        start = max(start, 0)
+        end = min(end, self.size)
+        if end <= start or self.size == 0:
+            return None
+
+        level = len(self._argmin) - 1
+        bucket_size = self.base_size << level
+        buckets = np.arange(start // bucket_size, (end - 1) // bucket_size + 1)
+        chosen = []
+        while len(buckets) > 0:
+            firsts = buckets * bucket_size
+            lasts = np.minimum(firsts + bucket_size, self.size) - 1
+            fits = index[lasts] - index[firsts] <= max_span
+            chosen.extend(
+                [
+                    firsts[fits],
+                    self._argmin[level][buckets[fits]],
+                    self._argmax[level][buckets[fits]],
+                    lasts[fits],
+                ]
+            )
+            buckets = buckets[~fits]
+            if level == 0:
+                break
+
+            # Split the buckets which are too wide into their two halves,
+            # keeping only those which overlap the range.
+            level -= 1
+            bucket_size //= 2
+            buckets = np.column_stack([2 * buckets, 2 * buckets + 1]).ravel()
+            buckets = buckets[
+                (buckets < len(self._argmin[level]))
+                & (buckets * bucket_size < end)
+                & ((buckets + 1) * bucket_size > start)
+            ]
+
+        if not any(len(positions) for positions in chosen):
+            return None
+
+        # Level 0 buckets which are still too wide are drawn in full.
+        raw = buckets[:, np.newaxis] * bucket_size + np.arange(bucket_size)
+        raw = raw[(raw >= start) & (raw < end)]
+        return np.unique(np.concatenate(chosen + [raw]))
+
+
+def _bucket_extrema(values, start, bucket_size):
+    """Positions of the extrema of the buckets of values[start:]"""
+    values = values[start:]
+    n_full = len(values) // bucket_size
+    full = values[:n_full * bucket_size].reshape(n_full, bucket_size)
+    offsets = start + np.arange(n_full) * bucket_size
+    argmin = offsets + full.argmin(axis=1)
+    argmax = offsets + full.argmax(axis=1)
+
+    if n_full * bucket_size < len(values):
+        tail = values[n_full * bucket_size:]
+        tail_start = start + n_full * bucket_size
+        argmin = np.append(argmin, tail_start + tail.argmin())
+        argmax = np.append(argmax, tail_start + tail.argmax())
+    return argmin, argmax
+
+
+def _merge_extrema(values, argmin, argmax):
+    """Positions of the extrema of pairs of consecutive buckets"""
+    if len(argmin) % 2:
+        argmin = np.append(argmin, argmin[-1])
+        argmax = np.append(argmax, argmax[-1])
+    left_min, right_min = argmin[0::2], argmin[1::2]
+    left_max, right_max = argmax[0::2], argmax[1::2]
+    # Ties go to the left bucket, so the first extreme position is kept.
+    merged_min = np.where(
+        values[right_min] < values[left_min], right_min, left_min
+    )
+    merged_max = np.where(
+        values[right_max] > values[left_max], right_max, left_max
+    )
+    return merged_min, merged_max
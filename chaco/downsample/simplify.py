@@ -0,0 +1,133 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+import numpy as np
+
+try:
+    from chaco.downsample import _simplify
+except ImportError:
+    _simplify = None
+
+
+def simplify_polylines(polylines, tolerance):
+    """Simplify polylines with the Douglas-Peucker algorithm
+
+    The first and last points of each polyline are kept, and points are
+    added back, farthest first, until every removed point is within
+    ``tolerance`` of the simplified polyline.  When the points are in screen
+    space and the tolerance is a fraction of a pixel, drawing the simplified
+    polylines is visually identical to drawing the full ones.
+
+    Parameters
+    ----------
+    polylines : list of N, 2 arrays of float
+        The polylines to simplify.  Closed polylines, whose first and last
+        points are equal, are supported.
+    tolerance : float
+        The largest distance allowed between a removed point and the
+        simplified polyline.
+
+    Returns
+    -------
+    simplified : list of M, 2 arrays of float
+        The simplified polylines, in the same order.
+
+    References
+    ----------
+
+    David H. Douglas and Thomas K. Peucker, "Algorithms for the Reduction of
+    the Number of Points Required to Represent a Digitized Line or its
+    Caricature," Cartographica 10(2), 1973.
+    """
+    if len(polylines) == 0:
+        return []
+    lengths = np.array([len(polyline) for polyline in polylines])
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    points = np.concatenate(
+        [np.asarray(polyline, dtype=float) for polyline in polylines]
+    ).reshape(-1, 2)
+
+    if _simplify is not None:
+        keep = _simplify.douglas_peucker_mask(
+            points, offsets.astype(np.intp), tolerance
+        )
+    else:
+        keep = _douglas_peucker_mask(points, offsets, tolerance)
+
+    kept_offsets = np.concatenate([[0], np.cumsum(keep)])[offsets]
+    kept = points[keep]
+    return [
+        kept[start:end]
+        for start, end in zip(kept_offsets[:-1], kept_offsets[1:])
+    ]
+
+
+def _douglas_peucker_mask(points, offsets, tolerance):
+    """NumPy implementation of the Douglas-Peucker kernel in _simplify.pyx
+
+    Rather than looping over the polylines, each iteration splits every
+    segment of every polyline which is still too far from its points.
+    """
+    n_points = len(points)
+    keep = np.zeros(n_points, dtype=bool)
+    nonempty = offsets[1:] > offsets[:-1]
+    keep[offsets[:-1][nonempty]] = True
+    keep[offsets[1:][nonempty] - 1] = True
+    # The points which may still be kept
+    candidates = np.flatnonzero(~keep)
+
+    while len(candidates) > 0:
+        anchors = np.flatnonzero(keep)
+        # Every candidate lies strictly between two anchors of its polyline
+        segment = np.searchsorted(anchors, candidates) - 1
+        distance2 = _segment_distance2(
+            points[candidates],
+            points[anchors[segment]],
+            points[anchors[segment + 1]],
+        )
+
+        # The farthest candidate of each segment, first one on ties
+        group_starts = np.flatnonzero(
+            np.concatenate([[True], segment[1:] != segment[:-1]])
+        )
+        counts = np.diff(np.append(group_starts, len(candidates)))
+        max_distance2 = np.maximum.reduceat(distance2, group_starts)
+        positions = np.arange(len(candidates))
+        farthest = np.minimum.reduceat(
+            np.where(
+                distance2 == np.repeat(max_distance2, counts),
+                positions,
+                len(candidates),
+            ),
+            group_starts,
+        )
+
+        split = max_distance2 > tolerance * tolerance
+        keep[candidates[farthest[split]]] = True
+        # The candidates of segments close enough to their points are removed
+        remaining = np.repeat(split, counts)
+        remaining[farthest[split]] = False
+        candidates = candidates[remaining]
+
+    return keep
+
+
+def _segment_distance2(points, starts, ends):
+    """The squared distance of each point to the segment from start to end"""
+    direction = ends - starts
+    length2 = (direction * direction).sum(axis=1)
+    offset = points - starts
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = (offset * direction).sum(axis=1) / length2
+    # Degenerate segments, such as the ends of a closed polyline, measure the
+    # distance to their start point.
+    t = np.where(length2 > 0, np.clip(t, 0.0, 1.0), 0.0)
+    delta = offset - t[:, np.newaxis] * direction
+    return (delta * delta).sum(axis=1)
@@ -0,0 +1,42 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+import unittest
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from ..decimate import decimate
+
+
+class TestDecimate(unittest.TestCase):
+    def test_keeps_last_point(self):
+        a = np.empty(shape=(11, 2))
+        a[:, 0] = np.arange(11.0)
+        a[:, 1] = np.arange(11.0)
+
+        result = decimate(a, 3)
+
+        assert_array_equal(result[:, 0], [0.0, 4.0, 8.0, 10.0])
+
+    def test_exact_stride(self):
+        a = np.empty(shape=(10, 2))
+        a[:, 0] = np.arange(10.0)
+        a[:, 1] = np.arange(10.0)
+
+        result = decimate(a, 4)
+
+        assert_array_equal(result[:, 0], [0.0, 3.0, 6.0, 9.0])
+
+    def test_few_points(self):
+        a = np.zeros(shape=(10, 2))
+
+        assert_array_equal(decimate(a, 20), a)
+        assert_array_equal(decimate(a, 2), a)
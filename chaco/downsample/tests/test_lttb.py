@@ -14,7 +14,7 @@ import timeit
 import numpy as np
 from numpy.testing import assert_array_equal, assert_almost_equal
 
-from ..lttb import largest_triangle_three_buckets
+from ..lttb import largest_triangle_three_buckets, _lttb, _lttb_numpy
 
 
 TIMING_SETUP = """
@@ -168,3 +168,16 @@ class TestLargestTriangleThreeBuckets(unittest.TestCase):
         result = largest_triangle_three_buckets(a, n_buckets)
 
         assert_array_equal(result, [[0.0, 0.0]] * 3)
+
+    def test_numpy_matches_extension(self):
+        if _lttb is None:
+            self.skipTest("_lttb extension module is not available")
+        rs = np.random.RandomState(0)
+        a = np.empty(shape=(1000, 2))
+        a[:, 0] = np.linspace(0.0, 10.0, 1000)
+        a[:, 1] = rs.normal(size=1000)
+
+        for n_buckets in (3, 17, 100):
+            assert_almost_equal(
+                _lttb_numpy(a, n_buckets), _lttb.lttb(a, n_buckets)
+            )
@@ -0,0 +1,73 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+import unittest
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from ..m4 import m4, _m4, _m4_numpy
+
+
+class TestM4(unittest.TestCase):
+    def test_spike(self):
+        a = np.empty(shape=(100, 2))
+        a[:, 0] = np.arange(100.0)
+        a[:, 1] = 0.0
+        a[15, 1] = 100.0
+        a[16, 1] = -100.0
+
+        result = m4(a, [10.0, 50.0])
+
+        assert_array_equal(
+            result,
+            [
+                [0.0, 0.0],
+                [9.0, 0.0],
+                [10.0, 0.0],
+                [15.0, 100.0],
+                [16.0, -100.0],
+                [49.0, 0.0],
+                [50.0, 0.0],
+                [99.0, 0.0],
+            ],
+        )
+
+    def test_few_points(self):
+        a = np.zeros(shape=(10, 2))
+
+        result = m4(a, [2.0, 4.0])
+
+        assert_array_equal(result, a)
+
+    def test_empty_buckets(self):
+        a = np.empty(shape=(20, 2))
+        a[:, 0] = np.arange(20.0)
+        a[:, 1] = np.arange(20.0)
+
+        result = m4(a, [-5.0, -2.0, 30.0])
+
+        assert_array_equal(result, a[[0, 19]])
+
+    def test_numpy_matches_extension(self):
+        if _m4 is None:
+            self.skipTest("_m4 extension module is not available")
+        rs = np.random.RandomState(0)
+        a = np.empty(shape=(10000, 2))
+        a[:, 0] = np.sort(rs.uniform(0.0, 10.0, 10000))
+        # repeated values check that ties are resolved the same way
+        a[:, 1] = rs.randint(0, 5, 10000)
+        bucket_starts = np.searchsorted(a[:, 0], np.linspace(0, 10.0, 301))
+        bucket_starts[0] = 0
+        bucket_starts[-1] = len(a)
+
+        assert_array_equal(
+            _m4_numpy(a, bucket_starts), _m4.m4(a, bucket_starts)
+        )
@@ -0,0 +1,101 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+import unittest
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from ..pyramid import MinMaxPyramid
+
+
+class TestMinMaxPyramid(unittest.TestCase):
+    def setUp(self):
+        rs = np.random.RandomState(0)
+        self.values = rs.randint(0, 100, 10000).astype(float)
+
+    def expected_positions(self, start, end, bucket_size):
+        """ Brute force first, min, max and last of each bucket """
+        result = set()
+        first_bucket = start // bucket_size
+        last_bucket = (end - 1) // bucket_size
+        for bucket in range(first_bucket, last_bucket + 1):
+            first = bucket * bucket_size
+            values = self.values[first:first + bucket_size]
+            result.update(
+                [
+                    first,
+                    first + values.argmin(),
+                    first + values.argmax(),
+                    first + len(values) - 1,
+                ]
+            )
+        return sorted(result)
+
+    def test_positions(self):
+        pyramid = MinMaxPyramid(self.values, base_size=16)
+        index = np.arange(len(self.values), dtype=float)
+
+        # Buckets of 2048 values are the largest which span at most 2047.
+        positions = pyramid.positions(500, 9500, index, 2047.0)
+
+        assert_array_equal(
+            positions, self.expected_positions(500, 9500, 2048)
+        )
+
+    def test_zoomed_in(self):
+        pyramid = MinMaxPyramid(self.values, base_size=16)
+        index = np.arange(len(self.values), dtype=float)
+
+        self.assertIsNone(pyramid.positions(500, 600, index, 10.0))
+
+    def test_whole_array(self):
+        pyramid = MinMaxPyramid(self.values, base_size=16)
+        index = np.arange(len(self.values), dtype=float)
+
+        positions = pyramid.positions(0, len(self.values), index, 1e6)
+
+        assert_array_equal(
+            positions, self.expected_positions(0, len(self.values), 16384)
+        )
+
+    def test_uneven_index(self):
+        pyramid = MinMaxPyramid(self.values, base_size=16)
+        # The first 1024 values are spread 100 times further apart.
+        index = np.concatenate(
+            [np.arange(1024) * 100.0, 1e6 + np.arange(8976.0)]
+        )
+
+        positions = pyramid.positions(0, len(self.values), index, 1023.0)
+
+        # The sparse values are all kept, and the dense ones summarized by
+        # buckets of 1024 values.
+        sparse = positions[positions < 1024]
+        assert_array_equal(sparse, np.arange(1024))
+        dense = positions[positions >= 1024]
+        expected = self.expected_positions(1024, len(self.values), 1024)
+        assert_array_equal(dense, expected)
+
+    def test_update_matches_rebuild(self):
+        pyramid = MinMaxPyramid(self.values[:3000], base_size=16)
+
+        pyramid.update(self.values, first_changed=3000)
+
+        rebuilt = MinMaxPyramid(self.values, base_size=16)
+        self.assertEqual(pyramid.size, len(self.values))
+        self.assertEqual(len(pyramid._argmin), len(rebuilt._argmin))
+        for level in range(len(rebuilt._argmin)):
+            assert_array_equal(pyramid._argmin[level], rebuilt._argmin[level])
+            assert_array_equal(pyramid._argmax[level], rebuilt._argmax[level])
+
+    def test_empty(self):
+        pyramid = MinMaxPyramid(np.zeros(0))
+
+        self.assertIsNone(pyramid.positions(0, 10, np.zeros(0), 1.0))
@@ -0,0 +1,86 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+import unittest
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from ..simplify import simplify_polylines, _simplify, _douglas_peucker_mask
+
+
+class TestSimplifyPolylines(unittest.TestCase):
+    def test_straight_line(self):
+        a = np.column_stack([np.arange(10.0), np.zeros(10)])
+
+        (result,) = simplify_polylines([a], 0.1)
+
+        assert_array_equal(result, a[[0, 9]])
+
+    def test_corner(self):
+        a = np.array(
+            [[0.0, 0.0], [1.0, 0.05], [2.0, 0.0], [2.0, 1.0], [2.05, 2.0]]
+        )
+
+        (result,) = simplify_polylines([a], 0.1)
+
+        assert_array_equal(result, a[[0, 2, 4]])
+
+    def test_tolerance(self):
+        a = np.array([[0.0, 0.0], [1.0, 0.5], [2.0, 0.0]])
+
+        (coarse,) = simplify_polylines([a], 1.0)
+        (fine,) = simplify_polylines([a], 0.25)
+
+        assert_array_equal(coarse, a[[0, 2]])
+        assert_array_equal(fine, a)
+
+    def test_closed_polyline(self):
+        theta = np.linspace(0, 2 * np.pi, 101)
+        a = np.column_stack([np.cos(theta), np.sin(theta)]) * 10.0
+
+        (result,) = simplify_polylines([a], 0.1)
+
+        assert_array_equal(result[0], a[0])
+        assert_array_equal(result[-1], a[-1])
+        self.assertGreater(len(result), 4)
+        self.assertLess(len(result), len(a))
+
+    def test_several_polylines(self):
+        line = np.column_stack([np.arange(5.0), np.zeros(5)])
+        single = np.array([[3.0, 4.0]])
+        empty = np.empty((0, 2))
+
+        result = simplify_polylines([line, single, empty, line + 1.0], 0.1)
+
+        self.assertEqual(len(result), 4)
+        assert_array_equal(result[0], line[[0, 4]])
+        assert_array_equal(result[1], single)
+        self.assertEqual(result[2].shape, (0, 2))
+        assert_array_equal(result[3], line[[0, 4]] + 1.0)
+
+    def test_no_polylines(self):
+        self.assertEqual(simplify_polylines([], 1.0), [])
+
+    def test_numpy_matches_extension(self):
+        if _simplify is None:
+            self.skipTest("_simplify extension module is not available")
+        rs = np.random.RandomState(0)
+        lengths = rs.randint(0, 200, 300)
+        offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.intp)
+        # rounded random walks check that ties are resolved the same way
+        points = np.round(
+            np.cumsum(rs.normal(size=(offsets[-1], 2)), axis=0)
+        )
+
+        assert_array_equal(
+            _douglas_peucker_mask(points, offsets, 1.5),
+            _simplify.douglas_peucker_mask(points, offsets, 1.5),
+        )
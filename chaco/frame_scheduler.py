@@ -0,0 +1,136 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+""" Defines the FrameScheduler class.
+"""
+
+from time import perf_counter
+
+from traits.api import Bool, Callable, Dict, Float, HasStrictTraits, Int
+
+
+def find_frame_scheduler(component):
+    """The frame scheduler of a component or of its nearest container
+
+    Returns None if neither the component nor any of its containers has a
+    **frame_scheduler**.
+    """
+    while component is not None:
+        scheduler = getattr(component, "frame_scheduler", None)
+        if scheduler is not None:
+            return scheduler
+        component = component.container
+    return None
+
+
+def default_call_later(delay, callback):
+    """Calls *callback* after *delay* milliseconds using a pyface timer"""
+    from pyface.timer.api import do_after
+
+    do_after(delay, callback)
+
+
+class FrameScheduler(HasStrictTraits):
+    """Coalesces the redraw requests of plot components into frames
+
+    When a plot component, or one of its containers, has a frame scheduler,
+    its redraw requests are recorded instead of being passed on to its
+    container and window.  The recorded components are redrawn together at
+    most **max_fps** times a second, so that data arriving much faster than
+    the screen refreshes only causes one redraw, and one gather and map of
+    the data, per component and per frame.
+
+    Invalidations are not delayed: the caches of a component are still
+    marked invalid as soon as its data or mappers change.
+    """
+
+    #: The largest number of frames drawn per second.  If zero or less,
+    #: the frame is drawn as soon as the event loop is idle.
+    max_fps = Float(60.0)
+
+    #: The number of frames drawn.
+    frame_count = Int(0)
+
+    #: The number of redraw requests merged into a frame which was already
+    #: pending.
+    merged_requests = Int(0)
+
+    #: The number of frame intervals that went by without a frame, because
+    #: a frame was drawn later than it was scheduled.
+    dropped_frames = Int(0)
+
+    #: The function returning the current time, in seconds.
+    clock = Callable(perf_counter)
+
+    #: The function called as ``call_later(delay, callback)`` to draw the
+    #: next frame in ``delay`` milliseconds.  By default, a single shot
+    #: timer of the current Pyface toolkit.
+    call_later = Callable(default_call_later)
+
+    # The components to redraw in the next frame
+    _dirty = Dict()
+
+    # Whether the next frame has been scheduled
+    _frame_pending = Bool(False)
+
+    # When the next frame was scheduled to be drawn
+    _frame_due = Float(0.0)
+
+    # When the last frame was drawn
+    _last_frame = Float(float("-inf"))
+
+    # Whether the redraw requests are currently passed through
+    _flushing = Bool(False)
+
+    def defer_redraw(self, component):
+        """Records a redraw request of a component for the next frame
+
+        Returns False if the request must be handled right away instead,
+        which is the case while the frame is being drawn.
+        """
+        if self._flushing:
+            return False
+
+        if self._frame_pending:
+            self.merged_requests += 1
+        self._dirty[component] = None
+
+        if not self._frame_pending:
+            self._frame_pending = True
+            now = self.clock()
+            if self.max_fps > 0:
+                delay = max(self._last_frame + 1.0 / self.max_fps - now, 0.0)
+            else:
+                delay = 0.0
+            self._frame_due = now + delay
+            self.call_later(int(round(delay * 1000)), self.flush)
+        return True
+
+    def flush(self):
+        """Redraws all the components which requested it, right away"""
+        if not self._frame_pending:
+            return
+
+        now = self.clock()
+        if self.max_fps > 0:
+            self.dropped_frames += int((now - self._frame_due) * self.max_fps)
+
+        dirty = list(self._dirty)
+        self._dirty.clear()
+        self._frame_pending = False
+        self._last_frame = now
+        self.frame_count += 1
+
+        self._flushing = True
+        try:
+            for component in dirty:
+                component.request_redraw()
+        finally:
+            self._flushing = False
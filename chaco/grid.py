@@ -198,6 +198,7 @@ class PlotGrid(AbstractOverlay):
     def invalidate(self, event=None):
         """Invalidate cached information about the grid."""
         self._reset_cache()
+        self.invalidate_draw()
 
     # ------------------------------------------------------------------------
     # PlotComponent and AbstractOverlay interface
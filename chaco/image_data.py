@@ -11,10 +11,26 @@
 """ Defines the ImageData class.
 """
 # Standard library imports
-from numpy import fmax, fmin, swapaxes
+import json
+import os
+from math import ceil, sqrt
+
+from numpy import (
+    fmax,
+    fmin,
+    int16,
+    int32,
+    integer,
+    issubdtype,
+    load,
+    memmap,
+    pad,
+    rint,
+    swapaxes,
+)
 
 # Enthought library imports
-from traits.api import Bool, Int, Property, ReadOnly, Tuple
+from traits.api import Bool, Enum, Int, List, Property, ReadOnly, Tuple
 
 # Local relative imports
 from .base import DimensionTrait, ImageTrait
@@ -72,6 +88,32 @@ class ImageData(AbstractDataSource):
     #: A read-only attribute that exposes the underlying array.
     raw_value = Property(ImageTrait)
 
+    #: Whether plots may show a reduced resolution version of the image when
+    #: it is zoomed out.  The reduced images are the levels of a mip-map
+    #: pyramid, computed when first needed by :meth:`get_pyramid_level`.
+    use_pyramid = Bool(False)
+
+    #: How each level of the pyramid combines 2x2 blocks of pixels of the
+    #: level below.
+    #:
+    #: mean
+    #:     the average of the pixels (default).
+    #: max
+    #:     the largest of the pixels, ignoring NaNs, so that sparse bright
+    #:     features stay visible.
+    #: sample
+    #:     the first pixel of each 2**level by 2**level block.  The levels are
+    #:     strided views of the data which are never stored, so only the
+    #:     pixels which are drawn are read.  This suits images which are too
+    #:     large to reduce, such as memory-mapped files.
+    pyramid_reduction = Enum("mean", "max", "sample")
+
+    #: The number of values from which the bounds of the data are estimated,
+    #: or 0 to compute the bounds from all the values.  Estimated bounds read
+    #: a regularly spaced grid of values, which avoids reading all of an
+    #: image that doesn't fit in memory.
+    bounds_sample_size = Int(0)
+
     # ------------------------------------------------------------------------
     # Private traits
     # ------------------------------------------------------------------------
@@ -86,6 +128,9 @@ class ImageData(AbstractDataSource):
     # Cached value of min and max as long as **data** doesn't change.
     _bounds_cache = Tuple(transient=True)
 
+    # The levels of the pyramid computed so far, starting from level 1.
+    _pyramid = List(transient=True)
+
     # ------------------------------------------------------------------------
     # Public methods
     # ------------------------------------------------------------------------
@@ -112,6 +157,60 @@ class ImageData(AbstractDataSource):
             )
         return imgdata
 
+    @classmethod
+    def from_memmap(cls, filename, shape=None, dtype=float, offset=0,
+                    bounds=None, **traits):
+        """Alternate constructor to create an ImageData from an image file
+        on disk which is memory-mapped rather than read.
+
+        Only the parts of the image which are drawn are read from the file:
+        the image is shown zoomed out from a sampled pyramid, and the bounds
+        are estimated from a sample of the values unless they are known.
+        A CMapImagePlot of a large image should have **cache_full_map** set
+        to False, so that the memory used by colormapped tiles is bounded.
+
+        Parameters
+        ----------
+        filename : str
+            The path of a ``.npy`` file, or of a raw binary file if
+            ``shape`` is given.
+        shape : tuple of int
+            The shape of the image in a raw binary file, in C order.
+        dtype : data-type
+            The type of the values in a raw binary file.
+        offset : int
+            The position of the image in a raw binary file, in bytes.
+        bounds : tuple of 2 values
+            The minimum and maximum values of the image.  If None, they are
+            read from a sidecar JSON file named like the image file with a
+            ".json" suffix added, with "min" and "max" entries, if it exists.
+            Otherwise they are estimated.
+        **traits
+            Other traits of the ImageData.
+        """
+        if shape is None:
+            data = load(filename, mmap_mode="r")
+        else:
+            data = memmap(
+                filename, dtype=dtype, mode="r", offset=offset, shape=shape
+            )
+
+        if bounds is None and os.path.exists(filename + ".json"):
+            with open(filename + ".json", "r") as summary_file:
+                summary = json.load(summary_file)
+            bounds = (summary["min"], summary["max"])
+
+        traits.setdefault("use_pyramid", True)
+        traits.setdefault("pyramid_reduction", "sample")
+        traits.setdefault("bounds_sample_size", 1000000)
+        if data.ndim == 3:
+            traits.setdefault("value_depth", data.shape[2])
+        imgdata = cls(data=data, **traits)
+        if bounds is not None:
+            imgdata._cached_bounds = tuple(bounds)
+            imgdata._bounds_cache_valid = True
+        return imgdata
+
     def get_width(self):
         """Returns the shape of the x-axis."""
         if self.transposed:
@@ -126,6 +225,30 @@ class ImageData(AbstractDataSource):
         else:
             return self._data.shape[0]
 
+    def get_pyramid_level(self, level):
+        """Returns the image at 1/2**level of its resolution.
+
+        Each pixel of the returned array stands for a block of 2**level by
+        2**level pixels of **data**, and the last row and column stand for
+        the remaining pixels when the size of the image isn't a multiple of
+        2**level.  Level 0 is **data** itself.  The levels are computed as
+        they are first requested and cached until the data changes.
+        """
+        if level <= 0:
+            return self.data
+        if self.pyramid_reduction == "sample":
+            step = 1 << level
+            return self.data[::step, ::step]
+        while len(self._pyramid) < level:
+            if self._pyramid:
+                below = self._pyramid[-1]
+            else:
+                below = self.data
+            self._pyramid.append(
+                _halve_image(below, self.pyramid_reduction)
+            )
+        return self._pyramid[level - 1]
+
     def get_array_bounds(self):
         """Always returns ((0, width), (0, height)) for x-bounds and y-bounds."""
         if self.transposed:
@@ -161,12 +284,17 @@ class ImageData(AbstractDataSource):
             if self.raw_value.size == 0:
                 self._cached_bounds = (0, 0)
             else:
+                values = self.raw_value
+                n_pixels = values.shape[0] * values.shape[1]
+                if 0 < self.bounds_sample_size < n_pixels:
+                    step = int(ceil(sqrt(n_pixels / self.bounds_sample_size)))
+                    values = values[::step, ::step]
                 # nanmin and nanmax raise an annoying RuntimeWarning when
                 # all raw_value entries are NaN.  Use fmin.reduce and
                 # fmax.reduce to avoid this.
                 self._cached_bounds = (
-                    fmin.reduce(self.raw_value, axis=None),
-                    fmax.reduce(self.raw_value, axis=None),
+                    fmin.reduce(values, axis=None),
+                    fmax.reduce(values, axis=None),
                 )
             self._bounds_cache_valid = True
         return self._cached_bounds
@@ -204,6 +332,7 @@ class ImageData(AbstractDataSource):
     def _set_data(self, newdata):
         self._data = newdata
         self._bounds_cache_valid = False
+        self._pyramid = []
         self.data_changed = True
 
     def _get_raw_value(self):
@@ -213,8 +342,52 @@ class ImageData(AbstractDataSource):
     # Event handlers
     # ------------------------------------------------------------------------
 
+    def _transposed_changed(self):
+        self._pyramid = []
+
+    def _use_pyramid_changed(self):
+        self._pyramid = []
+        self.data_changed = True
+
+    def _pyramid_reduction_changed(self):
+        self._pyramid = []
+        self.data_changed = True
+
+    def _bounds_sample_size_changed(self):
+        self._bounds_cache_valid = False
+
     def _metadata_changed(self, event):
         self.metadata_changed = True
 
     def _metadata_items_changed(self, event):
         self.metadata_changed = True
+
+
+def _halve_image(data, reduction):
+    """Combines the 2x2 blocks of pixels of an image into single pixels"""
+    rows, cols = data.shape[:2]
+    if rows % 2 or cols % 2:
+        padding = [(0, rows % 2), (0, cols % 2)] + [(0, 0)] * (data.ndim - 2)
+        data = pad(data, padding, mode="edge")
+    blocks = (
+        data[0::2, 0::2], data[1::2, 0::2], data[0::2, 1::2], data[1::2, 1::2]
+    )
+    if reduction == "max":
+        return fmax(fmax(blocks[0], blocks[1]), fmax(blocks[2], blocks[3]))
+
+    if issubdtype(data.dtype, integer) and data.dtype.itemsize <= 2:
+        # Sum in the smallest integer type which can't overflow, and round.
+        total = blocks[0].astype(int16 if data.dtype.itemsize == 1 else int32)
+        for block in blocks[1:]:
+            total += block
+        total += 2
+        total //= 4
+        return total.astype(data.dtype)
+
+    total = blocks[0].astype(float)
+    for block in blocks[1:]:
+        total += block
+    total /= 4
+    if issubdtype(data.dtype, integer):
+        return rint(total).astype(data.dtype)
+    return total.astype(data.dtype, copy=False)
@@ -0,0 +1,122 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+""" Defines the ImageTileCache class.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+
+class ImageTileCache(object):
+    """A least-recently-used cache of the tiles of a transformed image
+
+    The image is divided into square tiles of ``tile_size`` pixels, and the
+    tiles are transformed only when a region overlapping them is requested.
+    Transformed tiles are stored under the key they were requested with,
+    together with their position, so that requesting a region again with the
+    same key only transforms the tiles which are not cached yet.
+
+    Parameters
+    ----------
+    tile_size : int
+        The width and height, in pixels, of the tiles.
+    max_tiles : int
+        The maximum number of tiles kept in the cache.
+    """
+
+    def __init__(self, tile_size=512, max_tiles=64):
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+        self._tiles = OrderedDict()
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def clear(self):
+        """Removes all the tiles from the cache"""
+        self._tiles.clear()
+
+    def get_region(self, shape, row_min, row_max, col_min, col_max, key,
+                   map_tile):
+        """The transformed image in [row_min:row_max, col_min:col_max]
+
+        Parameters
+        ----------
+        shape : tuple of int
+            The number of rows and columns of the full image.
+        row_min, row_max, col_min, col_max : int
+            The bounds of the region, which must be within the image.
+        key : hashable
+            Identifies the transformation: tiles cached with a different key
+            are not reused.
+        map_tile : callable
+            Called as ``map_tile(row_slice, col_slice)``, it returns the
+            transformed pixels of that part of the image as a (rows, columns,
+            depth) array.
+
+        Returns
+        -------
+        region : array
+            The transformed pixels of the region.  This may be a view into a
+            cached tile, and must not be modified.
+        """
+        size = self.tile_size
+        n_rows, n_cols = shape[:2]
+        tile_rows = range(
+            row_min // size, max(row_max - 1, row_min) // size + 1
+        )
+        tile_cols = range(
+            col_min // size, max(col_max - 1, col_min) // size + 1
+        )
+
+        region = None
+        for tile_row in tile_rows:
+            for tile_col in tile_cols:
+                tile = self._get_tile(
+                    (tile_row, tile_col, key),
+                    slice(tile_row * size, min((tile_row + 1) * size, n_rows)),
+                    slice(tile_col * size, min((tile_col + 1) * size, n_cols)),
+                    map_tile,
+                )
+                # The part of the region covered by this tile, in region and
+                # in tile coordinates.
+                r0 = max(row_min, tile_row * size)
+                r1 = min(row_max, (tile_row + 1) * size)
+                c0 = max(col_min, tile_col * size)
+                c1 = min(col_max, (tile_col + 1) * size)
+                tile_part = tile[
+                    r0 - tile_row * size:r1 - tile_row * size,
+                    c0 - tile_col * size:c1 - tile_col * size,
+                ]
+                if len(tile_rows) == 1 and len(tile_cols) == 1:
+                    return tile_part
+                if region is None:
+                    region_shape = (row_max - row_min, col_max - col_min)
+                    region = np.empty(
+                        region_shape + tile.shape[2:], dtype=tile.dtype
+                    )
+                region[
+                    r0 - row_min:r1 - row_min, c0 - col_min:c1 - col_min
+                ] = tile_part
+        return region
+
+    def _get_tile(self, tile_key, row_slice, col_slice, map_tile):
+        """Returns the cached tile, transforming it if it is missing"""
+        tile = self._tiles.get(tile_key, None)
+        if tile is None:
+            tile = map_tile(row_slice, col_slice)
+            self._tiles[tile_key] = tile
+            while len(self._tiles) > self.max_tiles:
+                self._tiles.popitem(last=False)
+        else:
+            self._tiles.move_to_end(tile_key)
+        return tile
@@ -12,6 +12,9 @@
 """
 
 
+# Standard library imports
+from collections import OrderedDict
+
 # Major library imports
 from math import cos, sin, pi
 from numpy import array, dot
@@ -22,6 +25,33 @@ from kiva.constants import FILL
 from kiva.trait_defs.kiva_font_trait import KivaFont
 from traits.api import Any, Bool, Float, HasTraits, Int, List, Str, observe
 
+#: The maximum number of text extents kept by :func:`get_full_text_extent`.
+TEXT_EXTENT_CACHE_SIZE = 4096
+
+# The measured text extents, least recently used first
+_text_extent_cache = OrderedDict()
+
+
+def get_full_text_extent(gc, font, text):
+    """Returns the full text extent of the text drawn with a font.
+
+    This is ``gc.get_full_text_extent(text)`` after ``gc.set_font(font)``,
+    but the extents are kept in a process-wide least-recently-used cache, so
+    that text which is drawn again, such as the tick labels of an axis which
+    is panned, is not measured again.  The font of the GC may be changed.
+    """
+    key = (type(gc), tuple(sorted(vars(font).items())), text)
+    extent = _text_extent_cache.get(key, None)
+    if extent is None:
+        gc.set_font(font)
+        extent = tuple(gc.get_full_text_extent(text))
+        _text_extent_cache[key] = extent
+        while len(_text_extent_cache) > TEXT_EXTENT_CACHE_SIZE:
+            _text_extent_cache.popitem(last=False)
+    else:
+        _text_extent_cache.move_to_end(key)
+    return extent
+
 
 class Label(HasTraits):
     """A label used by overlays.
@@ -232,13 +262,15 @@ class Label(HasTraits):
                         lines.append(line)
                         continue
 
-                    width = gc.get_full_text_extent(line)[0]
+                    width = get_full_text_extent(gc, self.font, line)[0]
                     if width > self.max_width:
                         line_words = []
                         for word in line.split():
                             line_words.append(word)
                             test_line = " ".join(line_words)
-                            width = gc.get_full_text_extent(test_line)[0]
+                            width = get_full_text_extent(
+                                gc, self.font, test_line
+                            )[0]
                             if width > self.max_width:
                                 if len(line_words) > 1:
                                     lines.append(" ".join(line_words[:-1]))
@@ -272,7 +304,7 @@ class Label(HasTraits):
                             height,
                             descent,
                             leading,
-                        ) = gc.get_full_text_extent(line)
+                        ) = get_full_text_extent(gc, self.font, line)
                         ascent = height - abs(descent)
                         if width > max_width:
                             max_width = width
@@ -26,6 +26,7 @@ from .abstract_data_source import AbstractDataSource
 from .abstract_plot_data import AbstractPlotData
 from .array_data_source import ArrayDataSource
 from .array_plot_data import ArrayPlotData
+from .base_data_range import deferred_refresh
 from .base_xy_plot import BaseXYPlot
 from .data_range_1d import DataRange1D
 from .data_view import DataView
@@ -1436,6 +1437,22 @@ class Plot(DataView):
 
         return self.datasources[name]
 
+    def _append_to_datasource(self, name):
+        """Brings the data source associated with the given name up to date
+        after values were appended to its data.
+        """
+        source = self.datasources[name]
+        data = self.data.get_data(name)
+        if source is data:
+            # The data source was appended to directly.
+            return
+        if isinstance(source, ArrayDataSource):
+            size = source.get_size()
+            if size <= len(data):
+                source.append(data[size:])
+                return
+        source.set_data(data)
+
     # ------------------------------------------------------------------------
     # Event handlers
     # ------------------------------------------------------------------------
@@ -1457,19 +1474,27 @@ class Plot(DataView):
         data_changed_event = event.new
         # event should be a dict with keys "added", "removed", and "changed",
         # per the comments in AbstractPlotData.
-        if "removed" in data_changed_event:
-            for name in data_changed_event["removed"]:
-                del self.datasources[name]
-
-        if "added" in data_changed_event:
-            for name in data_changed_event["added"]:
-                self._get_or_create_datasource(name)
-
-        if "changed" in data_changed_event:
-            for name in data_changed_event["changed"]:
-                if name in self.datasources:
-                    source = self.datasources[name]
-                    source.set_data(self.data.get_data(name))
+        # The ranges of the changed data sources are refreshed once, after
+        # all the data sources are updated.
+        with deferred_refresh():
+            if "removed" in data_changed_event:
+                for name in data_changed_event["removed"]:
+                    del self.datasources[name]
+
+            if "added" in data_changed_event:
+                for name in data_changed_event["added"]:
+                    self._get_or_create_datasource(name)
+
+            if "changed" in data_changed_event:
+                for name in data_changed_event["changed"]:
+                    if name in self.datasources:
+                        source = self.datasources[name]
+                        source.set_data(self.data.get_data(name))
+
+            if "appended" in data_changed_event:
+                for name in data_changed_event["appended"]:
+                    if name in self.datasources:
+                        self._append_to_datasource(name)
 
     def _plots_items_changed(self, event):
         if self.legend:
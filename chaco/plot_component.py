@@ -15,6 +15,9 @@ from enable.api import Component
 from enable.kiva_graphics_context import GraphicsContext
 from traits.api import Bool, Instance, observe, Str
 
+# Local relative imports
+from .frame_scheduler import FrameScheduler, find_frame_scheduler
+
 
 DEFAULT_DRAWING_ORDER = [
     "background",
@@ -72,6 +75,25 @@ class PlotComponent(Component):
     #: The default draw layer for Chaco plot components is the "plot" layer
     draw_layer = Str("plot")
 
+    #: Coalesces the redraw requests of this component, and of the components
+    #: it contains, into frames.  If None, the frame scheduler of the nearest
+    #: container which has one is used, if any.
+    frame_scheduler = Instance(FrameScheduler)
+
+    def request_redraw(self):
+        """Requests that the component redraw itself.
+
+        If there is a frame scheduler, the request is deferred to its next
+        frame.
+        """
+        scheduler = find_frame_scheduler(self)
+        if scheduler is None or not scheduler.defer_redraw(self):
+            super().request_redraw()
+
     @observe("+requires_redraw")
     def _plot_component_invalidated(self, event):
         self.invalidate_and_redraw()
+
+    @observe("visible")
+    def _plot_component_visibility_changed(self, event):
+        self.invalidate_draw()
@@ -11,11 +11,12 @@
 from numpy import zeros
 
 # Enthought library imports.
-from traits.api import Any, Bool, Float, Instance, Property, Tuple
+from traits.api import Bool, Float, Instance, Int, Property, Tuple
 
 # Local relative imports
 from chaco.plots.image_plot import ImagePlot
 from chaco.abstract_colormap import AbstractColormap
+from chaco.image_tile_cache import ImageTileCache
 from chaco.speedups import apply_selection_fade
 
 
@@ -46,18 +47,33 @@ class CMapImagePlot(ImagePlot):
     #: RGB color to use to fade out unselected points.
     fade_background = Tuple((0, 0, 0))
 
-    #: whether to pre-compute the full colormapped RGB(A) image
+    #: whether to keep the colormapped RGB(A) image of all the visited parts
+    #: of the image.  The image is colormapped in tiles, as they become
+    #: visible; if False, only the **max_cached_tiles** most recently used
+    #: tiles are kept.
     cache_full_map = Bool(True)
 
+    #: The width and height, in pixels of the data, of the colormapped tiles
+    tile_size = Int(512)
+
+    #: The number of colormapped tiles to keep when not caching the full map,
+    #: or when the colormap changes.
+    max_cached_tiles = Int(64)
+
     # ------------------------------------------------------------------------
     # Private Traits
     # ------------------------------------------------------------------------
 
-    # Is the mapped image valid?
-    _mapped_image_cache_valid = Bool(False, transient=True)
+    # Cache of the colormapped tiles of the image, for the current and recent
+    # colormaps and ranges.
+    _tile_cache = Instance(ImageTileCache, transient=True)
+
+    # Incremented when the colormap changes other than by its range.
+    _colormap_version = Int(0, transient=True)
 
-    # Cache of the fully mapped RGB(A) image.
-    _cached_mapped_image = Any(transient=True)
+    # Are tiles being colormapped?  Colormaps may update their lookup tables
+    # lazily, when they first map values.
+    _mapping_tiles = Bool(False, transient=True)
 
     # ------------------------------------------------------------------------
     # Public methods
@@ -82,24 +98,6 @@ class CMapImagePlot(ImagePlot):
 
         self._update_selections()
 
-    # ------------------------------------------------------------------------
-    # Base2DPlot interface
-    # ------------------------------------------------------------------------
-
-    def _render(self, gc):
-        """Ensures that the cached image is valid.
-
-        Called before _render() is called. Implements the Base2DPlot interface.
-        """
-        if not self._mapped_image_cache_valid:
-            if "selection_masks" in self.value.metadata:
-                self._compute_cached_image(
-                    self.value.metadata["selection_masks"]
-                )
-            else:
-                self._compute_cached_image()
-        ImagePlot._render(self, gc)
-
     # ------------------------------------------------------------------------
     # Private methods
     # ------------------------------------------------------------------------
@@ -115,39 +113,81 @@ class CMapImagePlot(ImagePlot):
                 for m in selection_masks:
                     mask = mask | m
             else:
-                mask = zeros(self._cached_mapped_image.shape[:2], dtype=bool)
+                mask = zeros(mapped_image.shape[:2], dtype=bool)
             # Apply the selection fade, from speedups.py
             apply_selection_fade(
                 mapped_image, mask, self.fade_alpha, self.fade_background
             )
         return mapped_image
 
-    def _compute_cached_image(self, selection_masks=None):
-        """Updates the cached image."""
+    def _map_tile(self, rows, cols, level=0):
+        """Colormaps the part of the image pyramid level in [rows, cols]"""
+        data = self.value.get_pyramid_level(level)
+        selection_masks = self.value.metadata.get("selection_masks", None)
+        if selection_masks is not None:
+            # The masks of reduced levels are sampled, not reduced.
+            step = 1 << level
+            selection_masks = [
+                mask[::step, ::step][rows, cols] for mask in selection_masks
+            ]
+        return self._cmap_values(data[rows, cols], selection_masks)
+
+    def _mapped_sub_image(self, row_min, row_max, col_min, col_max, level=0):
+        """Returns the colormapped image in [row_min:row_max, col_min:col_max]
+        of the image pyramid level.
+
+        Only the tiles of the image overlapping the region which are not
+        cached yet are colormapped.
+        """
+        tile_cache = self._tile_cache
         if self.cache_full_map:
-            if not self._mapped_image_cache_valid:
-                self._cached_mapped_image = self._cmap_values(
-                    self.value.data, selection_masks
-                )
-                self._mapped_image_cache_valid = True
-
-            mapped_value = self._cached_mapped_image
-            ImagePlot._compute_cached_image(self, mapped_value)
+            size = self.tile_size
+            rows, cols = self.value.data.shape[:2]
+            n_tiles = -(-rows // size) * -(-cols // size)
+            tile_cache.max_tiles = max(self.max_cached_tiles, n_tiles)
         else:
-            self._mapped_image_cache_valid = True
-            ImagePlot._compute_cached_image(
-                self,
-                self.value.data,
-                mapper=lambda data: self._cmap_values(data),
+            tile_cache.max_tiles = self.max_cached_tiles
+        value_range = self.value_mapper.range
+        key = (
+            self._colormap_version, value_range.low, value_range.high, level
+        )
+        self._mapping_tiles = True
+        try:
+            return tile_cache.get_region(
+                self.value.get_pyramid_level(level).shape,
+                row_min,
+                row_max,
+                col_min,
+                col_max,
+                key,
+                lambda rows, cols: self._map_tile(rows, cols, level),
             )
+        finally:
+            self._mapping_tiles = False
+
+    def _compute_cached_image(self):
+        """Updates the cached image."""
+        level = self._calc_pyramid_level()
+        index_bounds, screen_rect = self._calc_visible_bounds(level)
+        col_min, col_max, row_min, row_max = index_bounds
+        mapped_value = self._mapped_sub_image(
+            row_min, row_max, col_min, col_max, level
+        )
+        self._set_cached_image(mapped_value, screen_rect)
 
     def _update_value_mapper(self, event=None):
-        self._mapped_image_cache_valid = False
+        if self._mapping_tiles:
+            return
+        # The tiles are cached by range, so that going back to a previous
+        # range doesn't colormap them again, but other changes of the
+        # colormap make all of them out of date.
+        if event is None or event.new is not self.value_mapper.range:
+            self._colormap_version += 1
         self._image_cache_valid = False
         self.invalidate_and_redraw()
 
     def _update_selections(self, event=None):
-        self._mapped_image_cache_valid = False
+        self._tile_cache.clear()
         self._image_cache_valid = False
         self.invalidate_and_redraw()
 
@@ -184,11 +224,14 @@ class CMapImagePlot(ImagePlot):
 
     def _value_data_changed_fired(self):
         super()._value_data_changed_fired()
-        self._mapped_image_cache_valid = False
+        self._tile_cache.clear()
 
-    def _index_data_changed_fired(self):
-        super()._index_data_changed_fired()
-        self._mapped_image_cache_valid = False
+    def _tile_size_changed(self):
+        self._tile_cache = ImageTileCache(tile_size=self.tile_size)
+        self._image_cache_valid = False
 
     def _cache_full_map_changed(self):
-        self._mapped_image_cache_valid = False
+        self._image_cache_valid = False
+
+    def __tile_cache_default(self):
+        return ImageTileCache(tile_size=self.tile_size)
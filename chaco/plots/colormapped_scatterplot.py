@@ -15,27 +15,36 @@
 from numpy import (
     argsort,
     array,
+    bincount,
+    clip,
     concatenate,
-    nonzero,
+    count_nonzero,
+    cumsum,
+    errstate,
+    flatnonzero,
     invert,
-    take,
     isnan,
     transpose,
     newaxis,
+    uint8,
+    uint16,
     zeros,
     ndarray,
 )
 
 # Enthought library imports
 from kiva.api import NO_MARKER, STROKE
-from traits.api import Dict, Enum, Float, Instance, observe
+from traits.api import Any, Bool, Dict, Enum, Float, Instance, observe
 from traitsui.api import Item, RangeEditor
 
 # Local, relative imports
 from chaco.array_data_source import ArrayDataSource
-from chaco.base import left_shift, right_shift
 from chaco.abstract_colormap import AbstractColormap
-from chaco.plots.scatterplot import ScatterPlot, ScatterPlotView
+from chaco.plots.scatterplot import (
+    ScatterPlot,
+    ScatterPlotView,
+    bucket_marker_sizes,
+)
 
 
 class ColormappedScatterPlotView(ScatterPlotView):
@@ -97,6 +106,22 @@ class ColormappedScatterPlot(ScatterPlot):
     # This mapping is only valid if **_cache_valid** is True.
     _index_bands = Dict()
 
+    # Are the color indices of all the points valid?  They only depend on
+    # the color data and the color mapper, so they survive changes of the
+    # view.
+    _color_bands_valid = Bool(False, transient=True)
+
+    # The color index of every point.
+    _color_indices = Any(transient=True)
+
+    # The indices of all the points, sorted by color index, or None if they
+    # have not been sorted yet.
+    _color_order = Any(transient=True)
+
+    # The position in _color_order of the first point of each color index,
+    # followed by the number of points.
+    _color_band_edges = Any(transient=True)
+
     #: TraitsUI View for customizing the plot. Overrides the ScatterPlot value.
     traits_view = ColormappedScatterPlotView()
 
@@ -198,6 +223,10 @@ class ColormappedScatterPlot(ScatterPlot):
         if (self.color_mapper is None) or (self.color_data is None):
             return super()._render(gc, points)
 
+        # The base class draws the density
+        if self._use_density(len(points)):
+            return super()._render(gc, points)
+
         # If the GC doesn't have draw_*_at_points, then use bruteforce
         if hasattr(gc, "draw_marker_at_points") or hasattr(
             gc, "draw_path_at_points"
@@ -221,64 +250,85 @@ class ColormappedScatterPlot(ScatterPlot):
     # Private methods
     # ------------------------------------------------------------------------
 
-    def _compute_bands(self, points, smartmode=False):
+    def _compute_bands(self, points):
         """
-        Sorts self.data into a list of arrays of data points by color,
-        filling in self._index_bands.  If *smartmode* is True, then it first
-        calls _calc_render_method() to see which rendering method is
-        optimal for the number of points and the distribution of
-        color indices; if the rendering method is 'bruteforce', then
-        this method short-circuits and returns without doing
-        anything.
+        Sorts the points into bands by color, filling in self._index_bands.
+
+        The color indices of all the points are computed once per version of
+        the color data and color mapper, so moving the view only sorts the
+        indices of the points in view, with a counting sort.
         """
         if len(points) == 0:
             return
         if self.color_mapper is None:
             return
 
-        # map the V values in the (x,y,v) self.data array
-
-        color_data = points[:, 2]
-        color_indices = self.color_mapper.map_index(color_data)
-
-        if smartmode and self.render_method == "bruteforce":
-            pass
+        point_mask = self._cached_point_mask
+        if (
+            self.color_data is not None
+            and len(point_mask) == len(self.color_data.get_data())
+            and count_nonzero(point_mask) == len(points)
+        ):
+            if not self._color_bands_valid:
+                self._color_indices = self._map_color_indices(
+                    self.color_data.get_data()
+                )
+                self._color_order = None
+                self._color_bands_valid = True
+
+            if len(points) == len(point_mask):
+                # All the points are in view, so reuse the sorted points.
+                if self._color_order is None:
+                    self._color_order, self._color_band_edges = _sort_bands(
+                        self._color_indices
+                    )
+                rows = self._color_order
+                edges = self._color_band_edges
+            else:
+                rows, edges = _sort_bands(self._color_indices[point_mask])
         else:
-            # shuffle_indices indicates how to sort the points in self.data
-            # so that their color_indices are in order.  We don't really care
-            # about the sorting so much as the fact that once they are sorted,
-            # points of the same color are grouped together into "bands".
-            shuffle_indices = argsort(color_indices)
-
-            # This pulls values from the color_indices array into
-            # sorted_color_indices, using the results of the sort we just did.
-            sorted_color_indices = take(color_indices, shuffle_indices)
-
-            # Now we want to determine where the continuous bands are.  We do
-            # this by right-shifting the sorted_color_indices array, subtracting
-            # it from the original, and looking for all the nonzero points.
-            shifted = right_shift(
-                sorted_color_indices, sorted_color_indices[0]
-            )
-            start_indices = concatenate(
-                [[0], nonzero(sorted_color_indices - shifted)[0]]
-            )
-            end_indices = left_shift(start_indices, len(sorted_color_indices))
+            rows, edges = _sort_bands(self._map_color_indices(points[:, 2]))
 
-            # Store the shuffled indices in self._index_bands.  We don't store the
-            # actual data points because we need to allow the renderer to index into
-            # the mapped XY screen positions.
-            self._index_bands = {}
-            for (start, end) in zip(start_indices, end_indices):
-                color_index = sorted_color_indices[start]
-                self._index_bands[color_index] = shuffle_indices[start:end]
+        # Store the shuffled indices in self._index_bands.  We don't store the
+        # actual data points because we need to allow the renderer to index
+        # into the mapped XY screen positions.
+        self._index_bands = {
+            color_index: rows[edges[color_index]:edges[color_index + 1]]
+            for color_index in flatnonzero(edges[1:] > edges[:-1])
+        }
 
-        self._color_indices = color_indices
-        self._cache_valid = True
+    def _map_color_indices(self, color_data):
+        """ Maps color values to color map indices.
+
+        The indices are returned as the smallest unsigned integer type which
+        holds them, which makes them faster to sort.
+        """
+        # Points without a color are masked out, so ignore their indices.
+        with errstate(invalid="ignore"):
+            color_indices = self.color_mapper.map_index(color_data)
+        color_indices = clip(color_indices, 0, None)
+        if len(color_indices) > 0:
+            high = color_indices.max()
+            if high < 1 << 8:
+                return color_indices.astype(uint8)
+            elif high < 1 << 16:
+                return color_indices.astype(uint16)
+        return color_indices
+
+    def _get_density_values(self, points):
+        """The values of the points in view which are reduced in each bin of
+        the density.
+
+        Overrides the ScatterPlot implementation to reduce the color data if
+        there is no density data.
+        """
+        if self.density_reduction != "count" and self.density_data is None:
+            return points[:, 2]
+        return super()._get_density_values(points)
 
     def _calc_render_method(self, numpoints):
         """Returns a string indicating the render method."""
-        if numpoints > 1000 and isinstance(self.marker_size, float):
+        if numpoints > 1000:
             return "banded"
         else:
             return "bruteforce"
@@ -301,7 +351,11 @@ class ColormappedScatterPlot(ScatterPlot):
             gc.set_line_width(outline_weight)
 
     def _render_banded(self, gc, points):
-        """Draws the points color-band by color-band."""
+        """Draws the points color-band by color-band.
+
+        If the markers have different sizes, the markers of each band are
+        drawn size by size, largest first.
+        """
         self._compute_bands(points)
 
         # Grab the XY values corresponding to each color band of points
@@ -310,9 +364,12 @@ class ColormappedScatterPlot(ScatterPlot):
 
         marker = self.marker_
         size = self.marker_size
-        assert isinstance(
-            size, float
-        ), "Variable size markers not implemented for banded rendering"
+        if isinstance(size, ndarray):
+            point_mask = self._cached_point_mask
+            if point_mask is not None and len(size) == len(point_mask):
+                size = size[point_mask]
+            # Points without a size are not drawn
+            xy_points = xy_points[:len(size)]
 
         # Set up the GC for drawing
         gc.set_line_dash(None)
@@ -335,33 +392,42 @@ class ColormappedScatterPlot(ScatterPlot):
                 self.outline_color_,
                 self.line_width,
             )
-            index_bands = self._index_bands
             mode = marker.draw_mode
-            for color_index in index_bands.keys():
+            for color_index, marker_size, indices in self._iter_bands(size):
                 self._set_draw_info(gc, mode, color_bands[color_index])
                 gc.draw_marker_at_points(
-                    xy_points[index_bands[color_index]],
-                    size,
+                    xy_points[indices],
+                    marker_size,
                     marker.kiva_marker,
                 )
 
         elif hasattr(gc, "draw_path_at_points"):
-            point_bands = {}
-            for color_index, indices in self._index_bands.items():
-                point_bands[color_index] = xy_points[indices]
-            # We have to construct the path for the marker.
+            # We have to construct the path for the marker, once per size.
+            paths = {}
+
+            def get_path(marker_size):
+                if marker_size not in paths:
+                    path = gc.get_empty_path()
+                    if self.marker != "custom":
+                        # turn the class into an instance... we should make
+                        # add_to_path a class method at some point.
+                        marker().add_to_path(path, marker_size)
+                    elif isinstance(size, ndarray):
+                        # custom symbols are scaled by the marker size
+                        path.scale_ctm(marker_size, marker_size)
+                        path.add_path(self.custom_symbol)
+                    else:
+                        path = self.custom_symbol
+                    paths[marker_size] = path
+                return paths[marker_size]
+
             if self.marker != "custom":
-                path = gc.get_empty_path()
-                # turn the class into an instance... we should make add_to_path a
-                # class method at some point.
-                marker().add_to_path(path, size)
                 mode = marker.draw_mode
             else:
-                path = self.custom_symbol
                 mode = STROKE
 
             color_bands = cmap.color_bands
-            for color_index, xy in point_bands.items():
+            for color_index, marker_size, indices in self._iter_bands(size):
                 self._set_draw_info(
                     gc,
                     mode,
@@ -369,12 +435,32 @@ class ColormappedScatterPlot(ScatterPlot):
                     self.outline_color_,
                     self.line_width,
                 )
-                gc.draw_path_at_points(xy, path, mode)
+                gc.draw_path_at_points(
+                    xy_points[indices], get_path(marker_size), mode
+                )
         else:
             raise RuntimeError(
                 "Batch drawing requested on non-batch-capable GC."
             )
 
+    def _iter_bands(self, size):
+        """Yields the color index, marker size and point indices of each
+        batch of markers to draw.
+
+        If **size** is an array of the sizes of the points, the markers of
+        each color band are grouped by size.
+        """
+        for color_index, indices in self._index_bands.items():
+            if not isinstance(size, ndarray):
+                yield color_index, size, indices
+                continue
+            indices = indices[indices < len(size)]
+            sizes, size_indices = bucket_marker_sizes(
+                size[indices], self.marker_size_tolerance
+            )
+            for marker_size, rows in zip(sizes, size_indices):
+                yield color_index, marker_size, indices[rows]
+
     def _render_bruteforce(self, gc, points):
         """Draws the points, setting the stroke color for each one."""
         x, y, colors = transpose(points)
@@ -446,13 +532,18 @@ class ColormappedScatterPlot(ScatterPlot):
 
     def _color_data_changed(self, old, new):
         if old is not None:
-            old.observe(self._either_data_updated, "data_changed", remove=True)
+            old.observe(self._color_data_updated, "data_changed", remove=True)
         if new is not None:
-            new.observe(self._either_data_updated, "data_changed")
+            new.observe(self._color_data_updated, "data_changed")
+        self._color_data_updated()
+
+    def _color_data_updated(self, event=None):
+        self._color_bands_valid = False
         self._either_data_updated()
 
     def _color_mapper_changed(self, old, new):
         self._cache_valid = False
+        self._color_bands_valid = False
 
         if hasattr(new, "range") and new.range is None and old is not None:
             # Someone passed in a ColorMapper that has no range associated with
@@ -464,9 +555,22 @@ class ColormappedScatterPlot(ScatterPlot):
 
     @observe("color_mapper:updated")
     def _color_mapper_updated(self, event):
+        self._color_bands_valid = False
         self.invalidate_draw()
         self.request_redraw()
 
     def _fill_alpha_changed(self):
         self.invalidate_draw()
         self.request_redraw()
+
+
+def _sort_bands(color_indices):
+    """ Sorts points by color index.
+
+    Returns the indices of the points in order of color index, and the
+    position in that order of the first point of each color index, followed
+    by the number of points.  NumPy sorts uint8 and uint16 color indices with
+    a radix sort, whose cost is linear in the number of points.
+    """
+    order = argsort(color_indices, kind="stable")
+    return order, concatenate([[0], cumsum(bincount(color_indices))])
@@ -209,7 +209,7 @@ struct Csite
     long count;                 /* count of start markers visited */
     double zlevel[2];           /* contour levels, zlevel[1]<=zlevel[0]
                                  * signals single level case */
-    short *triangle;            /* triangulation array for the mesh */
+    signed char *triangle;      /* triangulation array for the mesh */
     char *reg;                   /* region array for the mesh (was int) */
     Cdata *data;                /* added by EF */
     long edge0, left0;          /* starting site on this curve for closure */
@@ -218,9 +218,17 @@ struct Csite
 
     /* making the actual marks requires a bunch of other stuff */
     const double *x, *y, *z;    /* mesh coordinates and function values */
+    int rectilinear;            /* x has imax values and y has jmax values,
+                                 * rather than one value per mesh point */
     double *xcp, *ycp;          /* output contour points */
 };
 
+/* the coordinates of mesh point p, for either kind of mesh */
+#define XCOORD(site,p) \
+  ((site)->rectilinear ? (site)->x[(p) % (site)->imax] : (site)->x[p])
+#define YCOORD(site,p) \
+  ((site)->rectilinear ? (site)->y[(p) / (site)->imax] : (site)->y[p])
+
 void print_Csite(Csite *Csite)
 {
     Cdata *data = Csite->data;
@@ -244,7 +252,7 @@ void print_Csite(Csite *Csite)
     printf("\n");
 }
 
-/* triangle only takes values of -1, 0, 1, so it could be a signed char. */
+/* triangle only takes values of -1, 0, 1. */
 /* most or all of the longs probably could be converted to ints with no loss */
 
 /* the Cdata array consists of the following bits:
@@ -329,10 +337,8 @@ zone_crosser (Csite * site, int level, int pass2)
     long left0 = site->left0;
     int level0 = site->level0 == level;
     int two_levels = site->zlevel[1] > site->zlevel[0];
-    short *triangle = site->triangle;
+    signed char *triangle = site->triangle;
 
-    const double *x = pass2 ? site->x : 0;
-    const double *y = pass2 ? site->y : 0;
     const double *z = pass2 ? site->z : 0;
     double zlevel = pass2 ? site->zlevel[level] : 0.0;
     double *xcp = pass2 ? site->xcp : 0;
@@ -356,8 +362,9 @@ zone_crosser (Csite * site, int level, int pass2)
         {
             /* second pass actually computes and stores the point */
             double zcp = (zlevel - z[p0]) / (z[p1] - z[p0]);
-            xcp[n] = zcp * (x[p1] - x[p0]) + x[p0];
-            ycp[n] = zcp * (y[p1] - y[p0]) + y[p0];
+            double x0 = XCOORD (site, p0), y0 = YCOORD (site, p0);
+            xcp[n] = zcp * (XCOORD (site, p1) - x0) + x0;
+            ycp[n] = zcp * (YCOORD (site, p1) - y0) + y0;
         }
         if (!done && !jedge)
         {
@@ -534,8 +541,6 @@ edge_walker (Csite * site,  int pass2)
     int level0 = site->level0 == 2;
     int marked;
 
-    const double *x = pass2 ? site->x : 0;
-    const double *y = pass2 ? site->y : 0;
     double *xcp = pass2 ? site->xcp : 0;
     double *ycp = pass2 ? site->ycp : 0;
 
@@ -553,8 +558,8 @@ edge_walker (Csite * site,  int pass2)
             /* mark current boundary point */
             if (pass2)
             {
-                xcp[n] = x[p0];
-                ycp[n] = y[p0];
+                xcp[n] = XCOORD (site, p0);
+                ycp[n] = YCOORD (site, p0);
             }
             marked = 1;
         }
@@ -566,9 +571,10 @@ edge_walker (Csite * site,  int pass2)
             if (pass2)
             {
                 double zcp = site->zlevel[(z0 != 0)];
+                double x0 = XCOORD (site, p0), y0 = YCOORD (site, p0);
                 zcp = (zcp - site->z[p0]) / (site->z[p1] - site->z[p0]);
-                xcp[n] = zcp * (x[p1] - x[p0]) + x[p0];
-                ycp[n] = zcp * (y[p1] - y[p0]) + y[p0];
+                xcp[n] = zcp * (XCOORD (site, p1) - x0) + x0;
+                ycp[n] = zcp * (YCOORD (site, p1) - y0) + y0;
             }
             marked = 1;
         }
@@ -665,8 +671,6 @@ slit_cutter (Csite * site, int up, int pass2)
     long imax = site->imax;
     long n = site->n;
 
-    const double *x = pass2 ? site->x : 0;
-    const double *y = pass2 ? site->y : 0;
     double *xcp = pass2 ? site->xcp : 0;
     double *ycp = pass2 ? site->ycp : 0;
 
@@ -695,8 +699,8 @@ slit_cutter (Csite * site, int up, int pass2)
                 site->n = n;
                 return 2;
             }
-            xcp[n] = x[p1];
-            ycp[n] = y[p1];
+            xcp[n] = XCOORD (site, p1);
+            ycp[n] = YCOORD (site, p1);
             n++;
             p1 += imax;
         }
@@ -751,8 +755,8 @@ slit_cutter (Csite * site, int up, int pass2)
             }
             if (pass2)
             {
-                xcp[n] = x[p0];
-                ycp[n] = y[p0];
+                xcp[n] = XCOORD (site, p0);
+                ycp[n] = YCOORD (site, p0);
                 n++;
             }
             else
@@ -1253,50 +1257,37 @@ cntr_new(void)
     site->x = NULL;
     site->y = NULL;
     site->z = NULL;
+    site->rectilinear = 0;
     return site;
 }
 
+/* The site set up here only holds the mesh, which is never modified by
+   cntr_trace: the data and triangle arrays used while tracing belong to
+   each call of cntr_trace, so that several levels can be traced at the
+   same time from different threads. */
 static int
 cntr_init(Csite *site, long iMax, long jMax, double *x, double *y,
-                double *z, char *mask)
+                double *z, char *mask, int rectilinear)
 {
-    long ijmax = iMax * jMax;
     long nreg = iMax * jMax + iMax + 1;
-    long i;
 
+    PyMem_Free(site->reg);
     site->imax = iMax;
     site->jmax = jMax;
-    site->data = (Cdata *) PyMem_Malloc(sizeof(Cdata) * nreg);
-    if (site->data == NULL)
-    {
-        PyMem_Free(site);
-        return -1;
-    }
-    site->triangle = (short *) PyMem_Malloc(sizeof(short) * ijmax);
-    if (site->triangle == NULL)
-    {
-        PyMem_Free(site->data);
-        PyMem_Free(site);
-        return -1;
-    }
-    for (i = 0; i < ijmax; i++) site->triangle[i] = 0;
     site->reg = NULL;
     if (mask != NULL)
     {
         site->reg = (char *) PyMem_Malloc(sizeof(char) * nreg);
         if (site->reg == NULL)
         {
-            PyMem_Free(site->triangle);
-            PyMem_Free(site->data);
-            PyMem_Free(site);
             return -1;
         }
         mask_zones(iMax, jMax, mask, site->reg);
     }
-    /* I don't think we need to initialize site->data. */
     site->x = x;
     site->y = y;
     site->z = z;
+    site->rectilinear = rectilinear;
     site->xcp = NULL;
     site->ycp = NULL;
     return 0;
@@ -1304,13 +1295,12 @@ cntr_init(Csite *site, long iMax, long jMax, double *x, double *y,
 
 void cntr_del(Csite *site)
 {
-    PyMem_Free(site->triangle);
     PyMem_Free(site->reg);
-    PyMem_Free(site->data);
     PyMem_Free(site);
     site = NULL;
 }
 
+
 /* Build a list of lists of points, where each point is an (x,y)
    tuple.
 */
@@ -1379,17 +1369,19 @@ build_cntr_list_v(long *np, double *xp, double *yp, int nparts, long ntotal)
 }
 
 
-/* cntr_trace is called once per contour level or level pair.
-   If nlevels is 1, a set of contour lines will be returned; if nlevels
-   is 2, the set of polygons bounded by the levels will be returned.
-   If points is True, the lines will be returned as a list of list
-   of points; otherwise, as a list of tuples of vectors.
-*/
+/* Errors of trace_passes */
+#define TRACE_OK 0
+#define TRACE_NO_MEMORY 1
+#define TRACE_PASS2_OVERFLOW 2
+#define TRACE_PASS2_NEGATIVE 3
 
-PyObject *
-cntr_trace(Csite *site, double levels[], int nlevels, int points)
+/* trace_passes makes the two tracing passes over a working site, and
+   returns the points of the contours in newly allocated arrays.  It
+   doesn't use the Python API, so it can run without the GIL. */
+static int
+trace_passes(Csite *site, double **xp, double **yp, long **nseg,
+             long *nparts_out, long *ntotal_out)
 {
-    PyObject *c_list;
     double *xp0;
     double *yp0;
     long *nseg0;
@@ -1399,15 +1391,9 @@ cntr_trace(Csite *site, double levels[], int nlevels, int points)
     long n;
     long nparts = 0;
     long ntotal = 0;
-    long nparts2 = 0;
     long ntotal2 = 0;
+    int status = TRACE_OK;
 
-    site->zlevel[0] = levels[0];
-    site->zlevel[1] = levels[0];
-    if (nlevels == 2)
-    {
-        site->zlevel[1] = levels[1];
-    }
     site->n = site->count = 0;
     data_init (site, 0, nchunk);
 
@@ -1428,10 +1414,14 @@ cntr_trace(Csite *site, double levels[], int nlevels, int points)
             ntotal -= n;
         }
     }
-    xp0 = (double *) PyMem_Malloc(ntotal * sizeof(double));
-    yp0 = (double *) PyMem_Malloc(ntotal * sizeof(double));
-    nseg0 = (long *) PyMem_Malloc(nparts * sizeof(long));
-    if (xp0 == NULL || yp0 == NULL || nseg0 == NULL) goto error;
+    xp0 = (double *) PyMem_RawMalloc(ntotal * sizeof(double));
+    yp0 = (double *) PyMem_RawMalloc(ntotal * sizeof(double));
+    nseg0 = (long *) PyMem_RawMalloc(nparts * sizeof(long));
+    if (xp0 == NULL || yp0 == NULL || nseg0 == NULL)
+    {
+        status = TRACE_NO_MEMORY;
+        goto error;
+    }
 
     /* second pass */
     site->xcp = xp0;
@@ -1442,8 +1432,7 @@ cntr_trace(Csite *site, double levels[], int nlevels, int points)
         n = curve_tracer (site, 1);
         if (ntotal2 + n > ntotal)
         {
-            PyErr_SetString(PyExc_RuntimeError,
-                "curve_tracer: ntotal2, pass 2 exceeds ntotal, pass 1");
+            status = TRACE_PASS2_OVERFLOW;
             goto error;
         }
         if (n == 0)
@@ -1455,16 +1444,87 @@ cntr_trace(Csite *site, double levels[], int nlevels, int points)
             site->xcp += n;
             site->ycp += n;
             ntotal2 += n;
-            nparts2++;
         }
         else
         {
-            PyErr_SetString(PyExc_RuntimeError,
-                "Negative n from curve_tracer in pass 2");
+            status = TRACE_PASS2_NEGATIVE;
             goto error;
         }
     }
 
+    site->xcp = NULL; site->ycp = NULL;
+    *xp = xp0;
+    *yp = yp0;
+    *nseg = nseg0;
+    *nparts_out = nparts;
+    *ntotal_out = ntotal;
+    return TRACE_OK;
+
+    error:
+    PyMem_RawFree(xp0); PyMem_RawFree(yp0); PyMem_RawFree(nseg0);
+    site->xcp = NULL; site->ycp = NULL;
+    return status;
+}
+
+/* cntr_trace is called once per contour level or level pair.
+   If nlevels is 1, a set of contour lines will be returned; if nlevels
+   is 2, the set of polygons bounded by the levels will be returned.
+   If points is True, the lines will be returned as a list of list
+   of points; otherwise, as a list of tuples of vectors.
+   The GIL is released while tracing.
+*/
+
+PyObject *
+cntr_trace(const Csite *mesh, double levels[], int nlevels, int points)
+{
+    PyObject *c_list = NULL;
+    Csite site = *mesh;
+    long nreg = site.imax * site.jmax + site.imax + 1;
+    double *xp0 = NULL;
+    double *yp0 = NULL;
+    long *nseg0 = NULL;
+    long nparts = 0;
+    long ntotal = 0;
+    int status;
+
+    site.zlevel[0] = levels[0];
+    site.zlevel[1] = levels[0];
+    if (nlevels == 2)
+    {
+        site.zlevel[1] = levels[1];
+    }
+
+    /* working arrays of this trace */
+    site.data = (Cdata *) PyMem_RawMalloc(sizeof(Cdata) * nreg);
+    site.triangle = (signed char *) PyMem_RawCalloc(
+        site.imax * site.jmax, sizeof(signed char));
+    if (site.data == NULL || site.triangle == NULL)
+    {
+        PyMem_RawFree(site.data);
+        PyMem_RawFree(site.triangle);
+        return PyErr_NoMemory();
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    status = trace_passes(&site, &xp0, &yp0, &nseg0, &nparts, &ntotal);
+    Py_END_ALLOW_THREADS
+
+    PyMem_RawFree(site.data);
+    PyMem_RawFree(site.triangle);
+
+    switch (status)
+    {
+    case TRACE_NO_MEMORY:
+        return PyErr_NoMemory();
+    case TRACE_PASS2_OVERFLOW:
+        PyErr_SetString(PyExc_RuntimeError,
+            "curve_tracer: ntotal2, pass 2 exceeds ntotal, pass 1");
+        return NULL;
+    case TRACE_PASS2_NEGATIVE:
+        PyErr_SetString(PyExc_RuntimeError,
+            "Negative n from curve_tracer in pass 2");
+        return NULL;
+    }
 
     if (points)
     {
@@ -1474,16 +1534,11 @@ cntr_trace(Csite *site, double levels[], int nlevels, int points)
     {
         c_list = build_cntr_list_v(nseg0, xp0, yp0, nparts, ntotal);
     }
-    PyMem_Free(xp0); PyMem_Free(yp0); PyMem_Free(nseg0);
-    site->xcp = NULL; site->ycp = NULL;
+    PyMem_RawFree(xp0); PyMem_RawFree(yp0); PyMem_RawFree(nseg0);
     return c_list;
-
-    error:
-    PyMem_Free(xp0); PyMem_Free(yp0); PyMem_Free(nseg0);
-    site->xcp = NULL; site->ycp = NULL;
-    return NULL;
 }
 
+
 /******* Make an extension type.  Based on the tutorial.************/
 
 /* site points to the data arrays in the arrays pointed to
@@ -1562,6 +1617,7 @@ Cntr_init(Cntr *self, PyObject *args, PyObject *kwds)
     PyArrayObject *xpa, *ypa, *zpa, *mpa;
     long iMax, jMax;
     char *mask;
+    int rectilinear;
     static char *kwlist[] = {"x", "y", "z", "mask", NULL};
 
     marg = NULL;
@@ -1580,8 +1636,8 @@ Cntr_init(Cntr *self, PyObject *args, PyObject *kwds)
         return -1;
     }
 
-    xpa = (PyArrayObject *) PyArray_ContiguousFromObject(xarg, 'd', 2, 2);
-    ypa = (PyArrayObject *) PyArray_ContiguousFromObject(yarg, 'd', 2, 2);
+    xpa = (PyArrayObject *) PyArray_ContiguousFromObject(xarg, 'd', 1, 2);
+    ypa = (PyArrayObject *) PyArray_ContiguousFromObject(yarg, 'd', 1, 2);
     zpa = (PyArrayObject *) PyArray_ContiguousFromObject(zarg, 'd', 2, 2);
     if (marg)
         mpa = (PyArrayObject *) PyArray_ContiguousFromObject(marg, NPY_BOOL, 2, 2);
@@ -1594,25 +1650,46 @@ Cntr_init(Cntr *self, PyObject *args, PyObject *kwds)
     if (xpa == NULL || ypa == NULL || zpa == NULL || (marg && mpa == NULL))
     {
         PyErr_SetString(PyExc_ValueError,
-            "Arguments x, y, z, mask (if present) must be 2D arrays.");
+            "Arguments z, mask (if present) must be 2D arrays,"
+            " and x, y must be both 1D or both 2D arrays.");
         goto error;
     }
     iMax = zpa->dimensions[1];
     jMax = zpa->dimensions[0];
-    if (xpa->dimensions[0] != jMax || xpa->dimensions[1] != iMax ||
-        ypa->dimensions[0] != jMax || ypa->dimensions[1] != iMax ||
-        (mpa && (mpa->dimensions[0] != jMax || mpa->dimensions[1] != iMax)))
+    rectilinear = (xpa->nd == 1);
+    if (rectilinear)
+    {
+        /* a rectilinear mesh, given by the coordinates of its columns
+           and rows */
+        if (ypa->nd != 1 || xpa->dimensions[0] != iMax ||
+            ypa->dimensions[0] != jMax)
+        {
+            PyErr_SetString(PyExc_ValueError,
+                "1D arguments x, y must have the lengths of the"
+                " second and first dimensions of z.");
+            goto error;
+        }
+    }
+    else if (ypa->nd != 2 ||
+             xpa->dimensions[0] != jMax || xpa->dimensions[1] != iMax ||
+             ypa->dimensions[0] != jMax || ypa->dimensions[1] != iMax)
     {
         PyErr_SetString(PyExc_ValueError,
             "Arguments x, y, z, mask (if present)"
              " must have the same dimensions.");
         goto error;
     }
+    if (mpa && (mpa->dimensions[0] != jMax || mpa->dimensions[1] != iMax))
+    {
+        PyErr_SetString(PyExc_ValueError,
+            "Arguments z and mask must have the same dimensions.");
+        goto error;
+    }
     if (mpa) mask = mpa->data;
     else     mask = NULL;
     if ( cntr_init(self->site, iMax, jMax, (double *)xpa->data,
                             (double *)ypa->data,
-                            (double *)zpa->data, mask))
+                            (double *)zpa->data, mask, rectilinear))
     {
         PyErr_SetString(PyExc_MemoryError,
             "Memory allocation failure in cntr_init");
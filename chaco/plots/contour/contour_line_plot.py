@@ -12,16 +12,21 @@
 """
 
 # Major library imports
-from numpy import array, isfinite, meshgrid, transpose
+from numpy import array, concatenate, cumsum, isfinite, split
 
 # Enthought library imports
 from enable.api import LineStyle
 from kiva import constants
-from traits.api import Bool, Dict, Float, List, Str, Trait
+from traits.api import Any, Bool, Dict, Float, List, Str, Trait
 
 # Local relative imports
 from chaco.base_contour_plot import BaseContourPlot
-from chaco.plots.contour.contour import Cntr
+from chaco.downsample.simplify import simplify_polylines
+
+
+# The largest change, in pixels, of the screen distance between the corners of
+# the data for which the screen space contours are reused.
+_SCALE_TOLERANCE = 0.01
 
 
 class ContourLinePlot(BaseContourPlot):
@@ -51,6 +56,12 @@ class ContourLinePlot(BaseContourPlot):
     #: Line style for negative levels.
     negative_style = LineStyle("dash")
 
+    #: The tolerance, in pixels, of the simplification of the contour lines.
+    #: Points closer than this to the simplified lines are not drawn, which
+    #: speeds up the drawing of noisy fields.  The simplified lines are cached
+    #: until the view is zoomed.  If 0, the lines are not simplified.
+    simplify_tolerance = Float(0.0)
+
     # ------------------------------------------------------------------------
     # Private traits
     # ------------------------------------------------------------------------
@@ -58,9 +69,26 @@ class ContourLinePlot(BaseContourPlot):
     # Are the cached contours valid? If False, new ones need to be computed.
     _contour_cache_valid = Bool(False, transient=True)
 
-    # Cached collection of traces.
+    # Cached collection of traces, keyed by data version and level.
     _cached_contours = Dict(transient=True)
 
+    # Are the cached screen space contours valid?
+    _screen_cache_valid = Bool(False, transient=True)
+
+    # Cached collection of traces in screen space, keyed like
+    # _cached_contours.  The traces are relative to _screen_origin, so that
+    # they stay valid while the view is panned.
+    _cached_screen_contours = Dict(transient=True)
+
+    # The screen position of the lower left corner of the data, which the
+    # screen space traces are relative to.
+    _screen_origin = Any(transient=True)
+
+    # The orientation, the lower left and upper right corners of the data and
+    # the screen distance between them when the screen space traces were
+    # mapped, or None.  The traces are only valid for this scale.
+    _screen_scale = Any(transient=True)
+
     # Is the cached width data valid?
     _widths_cache_valid = Bool(False, transient=True)
 
@@ -91,6 +119,8 @@ class ContourLinePlot(BaseContourPlot):
             self._update_levels()
         if not self._contour_cache_valid:
             self._update_contours()
+        if not self._screen_cache_valid:
+            self._update_screen_contours()
         if not self._widths_cache_valid:
             self._update_widths()
         if not self._styles_cache_valid:
@@ -105,45 +135,97 @@ class ContourLinePlot(BaseContourPlot):
             gc.set_line_join(constants.JOIN_BEVEL)
             gc.set_line_cap(constants.CAP_ROUND)
 
+            gc.translate_ctm(*self._screen_origin)
             for i in range(len(self._levels)):
                 gc.set_stroke_color(self._colors[i])
                 gc.set_line_width(self._widths[i])
                 gc.set_line_dash(self._styles[i])
-                for trace in self._cached_contours[self._levels[i]]:
-                    if self.orientation == "h":
-                        strace = self.index_mapper.map_screen(trace)
-                    else:
-                        rev_strace = self.index_mapper.map_screen(trace)
-                        strace = array(rev_strace)[:, ::-1]
-                    gc.begin_path()
+                # All the traces of a level are stroked as one path
+                key = (self._levels[i],)
+                gc.begin_path()
+                for strace in self._cached_screen_contours[
+                    self._data_version, key
+                ]:
                     gc.lines(strace)
-                    gc.stroke_path()
+                gc.stroke_path()
 
     def _update_contours(self):
         """ Updates the cache of contour lines """
-        if self.value.is_masked():
-            # XXX masked data and get_data_mask not currently implemented
-            data, mask = self.value.get_data_mask()
-            mask &= isfinite(data)
-        else:
-            data = self.value.get_data()
-            mask = isfinite(data)
-
-        x_data, y_data = self.index.get_data()
-        xs = x_data.get_data()
-        ys = y_data.get_data()
-        xg, yg = meshgrid(xs, ys)
-
-        # note: contour wants mask True in invalid locations
-        c = Cntr(xg, yg, data, ~mask)
-
-        self._cached_contours = {}
-        for level in self._levels:
-            self._cached_contours[level] = []
-            traces = c.trace(level)
-            for trace in traces:
-                self._cached_contours[level].append(transpose(trace))
+        self._cached_contours = self._update_traces(
+            self._cached_contours, [(level,) for level in self._levels]
+        )
         self._contour_cache_valid = True
+        self._screen_cache_valid = False
+
+    def _update_screen_contours(self):
+        """ Updates the cache of contour lines in screen space
+
+        Only the levels which are not cached yet, or all of them if the view
+        was zoomed, are mapped and simplified.  Panning the view only moves
+        the origin of the cached lines.
+        """
+        corners = array(self.index.get_bounds(), dtype=float)
+        screen_corners = self._map_points(corners)
+        cached = self._cached_screen_contours
+        if isfinite(screen_corners).all():
+            scale = (
+                self.orientation,
+                corners,
+                screen_corners[1] - screen_corners[0],
+            )
+            if not self._same_scale(scale):
+                cached = {}
+            self._screen_origin = tuple(screen_corners[0])
+        else:
+            # The lines can't be positioned relative to the data.
+            scale = None
+            cached = {}
+            self._screen_origin = (0.0, 0.0)
+        self._screen_scale = scale
+
+        self._cached_screen_contours = {}
+        for key, traces in self._cached_contours.items():
+            straces = cached.get(key)
+            if straces is None:
+                straces = self._map_traces(traces)
+            self._cached_screen_contours[key] = straces
+        self._screen_cache_valid = True
+
+    def _same_scale(self, scale):
+        """ Whether the screen space contours mapped at a scale, as stored in
+        _screen_scale, are valid at another one.
+        """
+        if self._screen_scale is None:
+            return False
+        old_orientation, old_corners, old_size = self._screen_scale
+        orientation, corners, size = scale
+        # The contours are inside the corners of the data, so none of their
+        # points moves by more than the change in distance between them.
+        return (
+            orientation == old_orientation
+            and (corners == old_corners).all()
+            and (abs(size - old_size) < _SCALE_TOLERANCE).all()
+        )
+
+    def _map_points(self, points):
+        """ Maps data points to screen space, in (x, y) order """
+        points = self.index_mapper.map_screen(points)
+        if self.orientation == "v":
+            points = points[:, ::-1]
+        return points
+
+    def _map_traces(self, traces):
+        """ Maps the traces of a level to screen space, relative to
+        _screen_origin, and simplifies them
+        """
+        if len(traces) == 0:
+            return []
+        # Map all the traces at once rather than one at a time
+        points = self._map_points(concatenate(traces)) - self._screen_origin
+        straces = split(points, cumsum([len(trace) for trace in traces])[:-1])
+        if self.simplify_tolerance > 0:
+            straces = simplify_polylines(straces, self.simplify_tolerance)
+        return straces
 
     def _update_levels(self):
         """ Extends the parent method to also invalidate some other things """
@@ -198,6 +280,16 @@ class ContourLinePlot(BaseContourPlot):
     # Event handlers
     # ------------------------------------------------------------------------
 
+    def _index_mapper_changed_fired(self):
+        # The screen space contours are kept if the view is only panned
+        self._screen_cache_valid = False
+        super()._index_mapper_changed_fired()
+
+    def _simplify_tolerance_changed(self):
+        self._cached_screen_contours = {}
+        self._screen_cache_valid = False
+        self.invalidate_draw()
+
     def _widths_changed(self):
         if self._level_cache_valid:
             self._update_widths()
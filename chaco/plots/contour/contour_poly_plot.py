@@ -13,14 +13,13 @@
 
 
 # Major library imports
-from numpy import array, isfinite, meshgrid, transpose
+from numpy import array
 
 # Enthought library imports
 from traits.api import Bool, Dict
 
 # Local relative imports
 from chaco.base_contour_plot import BaseContourPlot
-from chaco.plots.contour.contour import Cntr
 
 
 class ContourPolyPlot(BaseContourPlot):
@@ -36,7 +35,7 @@ class ContourPolyPlot(BaseContourPlot):
     # Are the cached contours valid? If False, new ones need to be computed.
     _poly_cache_valid = Bool(False, transient=True)
 
-    # Cached collection of traces.
+    # Cached collection of traces, keyed by data version and level pair.
     _cached_polys = Dict(transient=True)
 
     # ------------------------------------------------------------------------
@@ -66,7 +65,7 @@ class ContourPolyPlot(BaseContourPlot):
                 gc.set_fill_color(self._colors[i])
                 gc.set_stroke_color(self._colors[i])
                 key = (self._levels[i], self._levels[i + 1])
-                for poly in self._cached_polys[key]:
+                for poly in self._cached_polys[self._data_version, key]:
                     if self.orientation == "h":
                         spoly = self.index_mapper.map_screen(poly)
                     else:
@@ -78,29 +77,8 @@ class ContourPolyPlot(BaseContourPlot):
 
     def _update_polys(self):
         """ Updates the cache of contour polygons """
-        if self.value.is_masked():
-            # XXX masked data and get_data_mask not currently implemented
-            data, mask = self.value.get_data_mask()
-            mask &= isfinite(data)
-        else:
-            data = self.value.get_data()
-            mask = isfinite(data)
-
-        x_data, y_data = self.index.get_data()
-        xs = x_data.get_data()
-        ys = y_data.get_data()
-        xg, yg = meshgrid(xs, ys)
-
-        # note: contour wants mask True in invalid locations
-        c = Cntr(xg, yg, data, ~mask)
-
-        self._cached_contours = {}
-        for i in range(len(self._levels) - 1):
-            key = (self._levels[i], self._levels[i + 1])
-            self._cached_polys[key] = []
-            polys = c.trace(*key)
-            for poly in polys:
-                self._cached_polys[key].append(transpose(poly))
+        keys = list(zip(self._levels[:-1], self._levels[1:]))
+        self._cached_polys = self._update_traces(self._cached_polys, keys)
         self._poly_cache_valid = True
 
     def _update_levels(self):
@@ -9,6 +9,7 @@
 # Thanks for using Enthought open source!
 
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import numpy.testing as nptest
@@ -94,3 +95,47 @@ class TestContour(unittest.TestCase):
         # When/then
         with self.assertRaises(TypeError):
             Cntr(xg, yg, data, mask_bad_datatype)
+
+    def test_contour_rectilinear(self):
+        rs = np.random.RandomState(0)
+        xs = np.cumsum(rs.uniform(0.5, 1.5, 30))
+        ys = np.cumsum(rs.uniform(0.5, 1.5, 20))
+        data = rs.normal(size=(20, 30))
+        mask = rs.uniform(size=data.shape) < 0.05
+        xg, yg = np.meshgrid(xs, ys)
+
+        mesh = Cntr(xg, yg, data, mask)
+        rectilinear = Cntr(xs, ys, data, mask)
+
+        for levels in [(-1.0,), (0.0,), (0.5,), (-0.5, 0.5), (0.0, 2.0)]:
+            expected = mesh.trace(*levels)
+            result = rectilinear.trace(*levels)
+            self.assertEqual(len(result), len(expected))
+            for (x, y), (expected_x, expected_y) in zip(result, expected):
+                nptest.assert_array_equal(x, expected_x)
+                nptest.assert_array_equal(y, expected_y)
+
+    def test_contour_rectilinear_bad_shape(self):
+        data = np.zeros((3, 4))
+        with self.assertRaises(ValueError):
+            Cntr(np.arange(3.0), np.arange(4.0), data)
+        with self.assertRaises(ValueError):
+            Cntr(np.arange(4.0), np.zeros((3, 4)), data)
+
+    def test_contour_trace_threads(self):
+        rs = np.random.RandomState(1)
+        data = rs.normal(size=(200, 300)).cumsum(axis=0).cumsum(axis=1)
+        c = Cntr(np.arange(300.0), np.arange(200.0), data)
+        levels = np.linspace(data.min(), data.max(), 20)
+
+        expected = [c.trace(level) for level in levels]
+        with ThreadPoolExecutor(4) as executor:
+            result = list(executor.map(c.trace, levels))
+
+        for traces, expected_traces in zip(result, expected):
+            self.assertEqual(len(traces), len(expected_traces))
+            for (x, y), (expected_x, expected_y) in zip(
+                traces, expected_traces
+            ):
+                nptest.assert_array_equal(x, expected_x)
+                nptest.assert_array_equal(y, expected_y)
@@ -13,7 +13,7 @@
 
 
 # Standard library imports
-from math import ceil, floor, pi
+from math import ceil, floor, log2, pi
 from contextlib import contextmanager
 
 import numpy as np
@@ -266,25 +266,81 @@ class ImagePlot(Base2DPlot):
             images.
         """
         if data is None:
-            data = self.value.data
+            level = self._calc_pyramid_level()
+            data = self.value.get_pyramid_level(level)
+        else:
+            level = 0
 
-        virtual_rect = self._calc_virtual_screen_bbox()
-        index_bounds, screen_rect = self._calc_zoom_coords(virtual_rect)
+        index_bounds, screen_rect = self._calc_visible_bounds(level)
         col_min, col_max, row_min, row_max = index_bounds
 
-        view_rect = self.position + self.bounds
-        sub_array_size = (col_max - col_min, row_max - row_min)
-        screen_rect = trim_screen_rect(screen_rect, view_rect, sub_array_size)
-
         data = data[row_min:row_max, col_min:col_max]
 
         if mapper is not None:
             data = mapper(data)
 
+        self._set_cached_image(data, screen_rect)
+
+    def _calc_pyramid_level(self):
+        """Returns the level of the image pyramid to draw.
+
+        This is the coarsest level which still has at least one pixel per
+        screen pixel, or 0 if the value does not use a pyramid.
+        """
+        if not self.value.use_pyramid:
+            return 0
+        _, _, image_width, image_height = self._calc_virtual_screen_bbox()
+        if image_width <= 0 or image_height <= 0:
+            return 0
+        # Number of pixels of the image per screen pixel
+        scale = min(
+            self.value.get_width() / image_width,
+            self.value.get_height() / image_height,
+        )
+        if scale < 2:
+            return 0
+        return int(floor(log2(scale)))
+
+    def _calc_visible_bounds(self, level=0):
+        """Computes the part of the image which is visible.
+
+        Parameters
+        ----------
+        level : int
+            The level of the image pyramid which is drawn.
+
+        Returns
+        -------
+        index_bounds : 4-tuple
+            The column and row indices (col_min, col_max, row_min, row_max) of
+            the visible sub-image, in the array of the pyramid level.
+        screen_rect : 4-tuple
+            (x, y, width, height) rectangle describing the pixels bounds where
+            the sub-image will be rendered in the plot.
+        """
+        virtual_rect = self._calc_virtual_screen_bbox()
+        index_bounds, screen_rect = self._calc_zoom_coords(virtual_rect, level)
+        if level > 0:
+            step = 1 << level
+            col_min, col_max, row_min, row_max = index_bounds
+            index_bounds = [
+                col_min // step,
+                -(-col_max // step),
+                row_min // step,
+                -(-row_max // step),
+            ]
+        col_min, col_max, row_min, row_max = index_bounds
+
+        view_rect = self.position + self.bounds
+        sub_array_size = (col_max - col_min, row_max - row_min)
+        screen_rect = trim_screen_rect(screen_rect, view_rect, sub_array_size)
+        return index_bounds, screen_rect
+
+    def _set_cached_image(self, data, screen_rect):
+        """Updates the cached image and rectangle from a color sub-image."""
         if len(data.shape) != 3:
             raise RuntimeError("`ImagePlot` requires color images.")
 
-        # Update cached image and rectangle.
         self._cached_image = self._kiva_array_from_numpy_array(data)
         self._cached_dest_rect = screen_rect
         self._image_cache_valid = True
@@ -299,7 +355,7 @@ class ImagePlot(Base2DPlot):
         data = np.ascontiguousarray(data)
         return GraphicsContextArray(data, pix_format=kiva_depth)
 
-    def _calc_zoom_coords(self, image_rect):
+    def _calc_zoom_coords(self, image_rect, level=0):
         """Calculates the coordinates of a zoomed sub-image.
 
         Because of floating point limitations, it is not advisable to request a
@@ -311,6 +367,9 @@ class ImagePlot(Base2DPlot):
             (x, y, width, height) rectangle describing the pixels bounds of the
             full, **rendered** image. This will be larger than the canvas when
             zoomed in since the full image may not fit on the canvas.
+        level : int
+            The level of the image pyramid which is drawn.  The sub-image is
+            widened to whole pixels of that level.
 
         Returns
         -------
@@ -327,10 +386,18 @@ class ImagePlot(Base2DPlot):
 
         array_bounds = self._array_bounds_from_screen_rect(image_rect)
         col_min, col_max, row_min, row_max = array_bounds
-        # Convert array indices back into screen coordinates after its been
-        # clipped to fit within the bounds.
         array_width = self.value.get_width()
         array_height = self.value.get_height()
+        if level > 0:
+            col_min, col_max = _align_to_level(
+                col_min, col_max, array_width, self.x_axis_is_flipped, level
+            )
+            row_min, row_max = _align_to_level(
+                row_min, row_max, array_height, self.y_axis_is_flipped, level
+            )
+
+        # Convert array indices back into screen coordinates after its been
+        # clipped to fit within the bounds.
         x_min = float(col_min) / array_width * image_width + ix
         x_max = float(col_max) / array_width * image_width + ix
         y_min = float(row_min) / array_height * image_height + iy
@@ -390,3 +457,19 @@ class ImagePlot(Base2DPlot):
         row_max = min(row_max, array_height)
 
         return col_min, col_max, row_min, row_max
+
+
+def _align_to_level(low, high, size, flipped, level):
+    """Widens [low, high) to whole pixels of a level of the image pyramid.
+
+    The pixels of the level are aligned to the start of the array, which is
+    the end of the screen range when the axis is flipped.
+    """
+    if flipped:
+        low, high = size - high, size - low
+    step = 1 << level
+    low = low // step * step
+    high = min(-(-high // step) * step, size)
+    if flipped:
+        low, high = size - high, size - low
+    return low, high
@@ -30,16 +30,39 @@ from numpy import (
     argmin,
     clip,
     column_stack,
+    linspace,
+    searchsorted,
+    sort,
 )
 
 # Enthought library imports
 from enable.api import black_color_trait, ColorTrait, LineStyle
-from traits.api import Enum, Float, List, Str, Property, Tuple, cached_property
+from traits.api import (
+    Any,
+    Bool,
+    Enum,
+    Float,
+    List,
+    Str,
+    Property,
+    Tuple,
+    cached_property,
+)
 from traitsui.api import Item, View
 
 # Local relative imports
-from chaco.base import arg_find_runs, arg_true_runs, reverse_map_1d, intersect_range
+from chaco.base import (
+    arg_find_runs,
+    arg_range_window,
+    arg_true_runs,
+    intersect_range,
+    reverse_map_1d,
+)
 from chaco.base_xy_plot import BaseXYPlot
+from chaco.downsample.decimate import decimate
+from chaco.downsample.lttb import largest_triangle_three_buckets
+from chaco.downsample.m4 import m4
+from chaco.downsample.pyramid import MinMaxPyramid
 
 
 class LinePlot(BaseXYPlot):
@@ -89,6 +112,30 @@ class LinePlot(BaseXYPlot):
     #:     point.  Also called a "right angle plot".
     render_style = Enum("connectedpoints", "hold", "connectedhold")
 
+    #: The method used to reduce the points to the resolution of the screen
+    #: when :attr:`use_downsampling` is True.
+    #:
+    #: lttb
+    #:     "largest triangle three buckets" (default); keeps the one point
+    #:     per pixel column that best preserves the shape of the line.
+    #: m4
+    #:     keeps the first, last, minimum and maximum points of each pixel
+    #:     column, so the rendered line looks the same as the full line.
+    #: decimate
+    #:     keeps every k-th point.  This is the cheapest method and does not
+    #:     need sorted index data, but it can miss narrow peaks.
+    downsampling_method = Enum("lttb", "m4", "decimate")
+
+    #: Whether to keep a multi-resolution min/max summary of the value data.
+    #:
+    #: When the index data is sorted in ascending order and there are no
+    #: NaNs, the parts of a zoomed-out view with many points per pixel
+    #: column are then gathered from the summary in time proportional to
+    #: the width of the plot rather than to the number of points, while
+    #: sparser parts, or a view zoomed in far enough, read the full data.
+    #: Points outside the value range are not removed from such a view.
+    use_pyramid = Bool(False)
+
     #: TraitsUI View for customizing the plot.
     traits_view = View(
         Item("color", style="custom"),
@@ -109,6 +156,13 @@ class LinePlot(BaseXYPlot):
     # Cached list of non-NaN arrays of (x,y) screen-space points.
     _cached_screen_pts = List
 
+    # The MinMaxPyramid of the value data, or None if not in use.
+    _pyramid = Any(transient=True)
+
+    # Whether the index data has no NaNs, or None if it hasn't been checked
+    # since it last changed.
+    _index_nan_free = Any(transient=True)
+
     def hittest(self, screen_pt, threshold=7.0, return_distance=False):
         """
         Tests whether the given screen point is within *threshold* pixels of
@@ -304,19 +358,35 @@ class LinePlot(BaseXYPlot):
                 index_max = len(value)
                 index = index[:index_max]
 
+            points = self._gather_pyramid_points(index, value)
+            if points is not None:
+                self._cached_data_pts = points
+                self._cache_valid = True
+                return
+
             # TODO: restore the functionality of rendering highlighted portions
             # of the line
             # selection = self.index.metadata.get(self.metadata_name, None)
             # if selection is not None and type(selection) in (ndarray, list) and \
             #        len(selection) > 0:
 
+            # For sorted index data, only the points in the visible window
+            # (and one neighbour on each side) need to be examined.  NaNs
+            # break the binary search, so the whole index is used if any.
+            index_low, index_high = self._get_gather_index_bounds()
+            sort_order = self.index.sort_order
+            if sort_order != "none" and self._is_index_nan_free():
+                start, end = arg_range_window(
+                    index, index_low, index_high, sort_order
+                )
+                index = index[start:end]
+                value = value[start:end]
+
             # Split the index and value raw data into non-NaN chunks
             mask = invert(isnan(value)) & invert(isnan(index))
 
             # throw out index and value points outside the visible region
-            mask = intersect_range(
-                index, self.index_range.low, self.index_range.high, mask
-            )
+            mask = intersect_range(index, index_low, index_high, mask)
             mask = intersect_range(
                 value, self.value_range.low, self.value_range.high, mask
             )
@@ -329,21 +399,45 @@ class LinePlot(BaseXYPlot):
             self._cached_data_pts = points
             self._cache_valid = True
 
+    def _gather_pyramid_points(self, index, value):
+        """ Gathers a reduced set of points from the pyramid.
+
+        Returns None if there is no pyramid or if the view is zoomed in far
+        enough that the full data should be used.
+        """
+        pyramid = self._pyramid
+        if pyramid is None or pyramid.size != len(value):
+            return None
+
+        # The data width of the narrowest pixel column, so that no bucket
+        # covers more than one column anywhere in the view.
+        m = self.index_mapper
+        low_pos, high_pos = sorted([m.low_pos, m.high_pos])
+        if high_pos - low_pos < 1:
+            return None
+        pixel_width = min(
+            abs(m.map_data(low_pos + 1) - m.map_data(low_pos)),
+            abs(m.map_data(high_pos) - m.map_data(high_pos - 1)),
+        )
+        start, end = searchsorted(index, self._get_gather_index_bounds())
+        # Include the neighbouring points, so the line reaches the edges.
+        positions = pyramid.positions(start - 1, end + 1, index, pixel_width)
+        if positions is None:
+            return None
+        return [column_stack([index[positions], value[positions]])]
+
     def _downsample(self):
         if not self._screen_cache_valid:
             m = self.index_mapper
-            delta_screen = int(m.high_pos - m.low_pos)
+            delta_screen = int(abs(m.high_pos - m.low_pos))
             if delta_screen == 0:
                 downsampled = []
             else:
-                # TODO: implement other downsampling methods
-                from chaco.downsample.lttb import (
-                    largest_triangle_three_buckets,
+                downsample = getattr(
+                    self, "_downsample_" + self.downsampling_method
                 )
-
                 downsampled = [
-                    largest_triangle_three_buckets(p, delta_screen)
-                    for p in self._cached_data_pts
+                    downsample(p, delta_screen) for p in self._cached_data_pts
                 ]
 
             self._cached_screen_pts = [self.map_screen(p) for p in downsampled]
@@ -351,6 +445,25 @@ class LinePlot(BaseXYPlot):
 
         return self._cached_screen_pts
 
+    def _downsample_lttb(self, points, n_columns):
+        return largest_triangle_three_buckets(points, n_columns)
+
+    def _downsample_m4(self, points, n_columns):
+        sort_order = self.index.sort_order
+        if sort_order == "none":
+            # Pixel columns can't be found by searching unsorted data.
+            return points
+
+        m = self.index_mapper
+        screen_edges = linspace(m.low_pos, m.high_pos, n_columns + 1)[1:-1]
+        edges = sort(m.map_data_array(screen_edges))
+        if sort_order == "descending":
+            return m4(points[::-1], edges)[::-1]
+        return m4(points, edges)
+
+    def _downsample_decimate(self, points, n_columns):
+        return decimate(points, 2 * n_columns)
+
     def _render(self, gc, points, selected_points=None):
         if len(points) == 0:
             return
@@ -416,6 +529,42 @@ class LinePlot(BaseXYPlot):
             gc.line_set(ends, starts[1:])
             gc.stroke_path()
 
+    def _index_strip_margin(self):
+        """Overrides BaseXYPlot.
+
+        The stroke, and its antialiased edge, extend past the segments
+        gathered for a strip.
+        """
+        return self.line_width + 1.0
+
+    def _get_progressive_chunks(self, points):
+        """Overrides BaseXYPlot.
+
+        Each chunk is made of runs of consecutive points, and each run starts
+        at the last point of the previous one so that the line has no gaps.
+        """
+        size = max(self.progressive_chunk_size, 1)
+        chunks = [[]]
+        n_points = 0
+        for line in points:
+            for start in range(0, max(len(line) - 1, 1), size):
+                if n_points >= size:
+                    chunks.append([])
+                    n_points = 0
+                run = line[start:start + size + 1]
+                chunks[-1].append(run)
+                n_points += len(run)
+        return chunks
+
+    def _get_progressive_coarse(self, points):
+        """Overrides BaseXYPlot.
+
+        The line is decimated to a couple of points per pixel column.
+        """
+        m = self.index_mapper
+        n_columns = int(abs(m.high_pos - m.low_pos))
+        return [decimate(line, max(2 * n_columns, 3)) for line in points]
+
     def _render_icon(self, gc, x, y, width, height):
         with gc:
             gc.set_stroke_color(self.effective_color)
@@ -443,6 +592,62 @@ class LinePlot(BaseXYPlot):
         d = z[:, 0] + z[:, 1]
         # ... TODO ...
 
+    def _update_pyramid(self, event=None):
+        appended = _appended_range(event)
+        if self._pyramid is not None and appended is not None:
+            # Only extend the pyramid with the new values.
+            start, end = appended
+            data = event.object.get_data()
+            if isnan(data[start:end]).any():
+                self._pyramid = None
+            elif event.object is self.value:
+                self._pyramid.update(data, first_changed=start)
+            return
+
+        self._pyramid = None
+        if not self.use_pyramid or self.index is None or self.value is None:
+            return
+        if self.index.sort_order != "ascending":
+            return
+
+        index = self.index.get_data()
+        value = self.value.get_data()
+        if len(index) != len(value) or isnan(index).any() or isnan(value).any():
+            return
+        self._pyramid = MinMaxPyramid(value)
+
+    def _is_index_nan_free(self):
+        """Whether the index data has no NaNs, checked once per change"""
+        if self._index_nan_free is None:
+            self._index_nan_free = not isnan(self.index.get_data()).any()
+        return self._index_nan_free
+
+    def _either_data_updated(self, event=None):
+        appended = _appended_range(event)
+        if (
+            self._index_nan_free
+            and appended is not None
+            and event.object is self.index
+        ):
+            # Only check the new values.
+            start, end = appended
+            if isnan(self.index.get_data()[start:end]).any():
+                self._index_nan_free = False
+        elif event is None or event.object is self.index:
+            self._index_nan_free = None
+        if self.use_pyramid:
+            self._update_pyramid(event)
+        super()._either_data_updated(event)
+
+    def _use_pyramid_changed(self):
+        self._update_pyramid()
+        self._cache_valid = False
+        self.invalidate_and_redraw()
+
+    def _downsampling_method_changed(self):
+        self._screen_cache_valid = False
+        self.invalidate_and_redraw()
+
     @cached_property
     def _get_effective_color(self):
         alpha = self.color_[-1] if len(self.color_) == 4 else 1
@@ -450,6 +655,15 @@ class LinePlot(BaseXYPlot):
         return c
 
 
+def _appended_range(event):
+    """The (start, end) positions of the values appended to a data source,
+    if the data changed event was fired by ArrayDataSource.append().
+    """
+    if event is None or not isinstance(event.new, dict):
+        return None
+    return event.new.get("appended")
+
+
 def _closest_point(target, p1, p2):
     """Utility function for hittest:
     finds the point on the line between p1 and p2 to
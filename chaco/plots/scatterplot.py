@@ -17,19 +17,28 @@ import itertools
 
 # Major library imports
 from numpy import (
+    argsort,
     around,
     array,
     asarray,
+    ascontiguousarray,
+    bincount,
+    ceil,
     column_stack,
+    cumsum,
     empty,
+    inf,
     isfinite,
     isnan,
+    nan,
     nanargmin,
     ndarray,
+    ones,
+    split,
     sqrt,
     sum,
     transpose,
-    where,
+    unique,
 )
 
 # Enthought library imports
@@ -41,24 +50,36 @@ from enable.api import (
     MarkerNameDict,
     MarkerTrait,
 )
+from kiva.agg import GraphicsContextArray
 from kiva.constants import STROKE
 from traits.api import (
     Any,
     Array,
     ArrayOrNone,
     Bool,
+    Enum,
     Float,
     Callable,
+    Instance,
     Property,
     Tuple,
     Either,
     cached_property,
+    observe,
 )
 from traitsui.api import View, VGroup, Item
 
 # Local relative imports
+from chaco.abstract_colormap import AbstractColormap
+from chaco.abstract_data_source import AbstractDataSource
+from chaco.array_data_source import ArrayDataSource
 from chaco.base_xy_plot import BaseXYPlot
-from chaco.speedups import scatterplot_gather_points
+from chaco.data_range_1d import DataRange1D
+from chaco.default_colormaps import viridis
+from chaco.speedups import (
+    bin_points,
+    scatterplot_gather_points_and_mask,
+)
 from chaco.base import reverse_map_1d
 
 # ------------------------------------------------------------------------------
@@ -95,6 +116,7 @@ def render_markers(
     custom_symbol=None,
     debug=False,
     point_mask=None,
+    size_tolerance=0.0,
 ):
     """Helper function for a PlotComponent instance to render a
     set of (x,y) points onto a graphics context.  Currently, it makes some
@@ -109,8 +131,8 @@ def render_markers(
         The points to render
     marker : string, class, or instance
         The type of marker to use for the points
-    marker_size : number
-        The size of the markers
+    marker_size : number or array
+        The size of the markers, or the size of each marker
     color : RGB(A) color
         The color of the markers
     line_width : number
@@ -118,10 +140,16 @@ def render_markers(
     outline_color : RGB(A) color
         The color of the marker outline
     custom_symbol : CompiledPath
-        If the marker style is 'custom', this is the symbol
+        If the marker style is 'custom', this is the symbol.  It is scaled by
+        the marker size only if the markers have different sizes.
     point_mask : array of bools
         The mask specifying which points need to be rendered. The `points`
         array is already masked
+    size_tolerance : number
+        If the markers have different sizes, the sizes are rounded to
+        multiples of this, and the markers of each size are drawn together,
+        largest first.  If 0, only markers of exactly the same size are drawn
+        together.
     """
 
     if len(points) == 0:
@@ -149,35 +177,41 @@ def render_markers(
 
         gc.begin_path()
 
+        if isinstance(marker_size, ndarray):
+            if point_mask is not None and len(marker_size) == len(point_mask):
+                marker_size = marker_size[point_mask]
+
         # try to invoke optimized routines if only one size and gc supports
         if not isinstance(marker_size, ndarray):
-            # try fastest routine
-            if not isinstance(marker, CustomMarker):
-                # get fast renderer, or dummy if not implemented
-                renderer = getattr(gc, "draw_marker_at_points", lambda *a: 0)
-                result = renderer(points, marker_size, marker.kiva_marker)
-                # it worked, we're done
-                if result != 0:
-                    return
-
-            # try next fastest routine
-            if hasattr(gc, "draw_path_at_points"):
-                if not isinstance(marker, CustomMarker):
-                    path = gc.get_empty_path()
-                    marker.add_to_path(path, marker_size)
-                    mode = marker.draw_mode
-                else:
-                    path = custom_symbol
-                    mode = STROKE
-                if not marker.antialias:
-                    gc.set_antialias(False)
-                gc.draw_path_at_points(points, path, mode)
+            if draw_markers_at_points(
+                gc, points, marker, marker_size, custom_symbol
+            ):
                 return
 
-        if isinstance(marker_size, ndarray):
-            if point_mask is not None:
-                marker_size = marker_size[point_mask]
-        else:
+        elif hasattr(gc, "draw_marker_at_points") or hasattr(
+            gc, "draw_path_at_points"
+        ):
+            # draw the markers of each size together
+            n_points = min(len(points), len(marker_size))
+            points = asarray(points)[:n_points]
+            sizes, indices = bucket_marker_sizes(
+                marker_size[:n_points], size_tolerance
+            )
+            for size, size_indices in zip(sizes, indices):
+                symbol = custom_symbol
+                if isinstance(marker, CustomMarker):
+                    # custom symbols are scaled by the marker size
+                    symbol = gc.get_empty_path()
+                    symbol.scale_ctm(size, size)
+                    symbol.add_path(custom_symbol)
+                if not draw_markers_at_points(
+                    gc, points[size_indices], marker, size, symbol
+                ):
+                    break
+            else:
+                return
+
+        if not isinstance(marker_size, ndarray):
             marker_size = itertools.repeat(marker_size)
 
         if not marker.antialias:
@@ -201,6 +235,73 @@ def render_markers(
                     gc.draw_path(STROKE)
 
 
+def draw_markers_at_points(gc, points, marker, marker_size, custom_symbol):
+    """Draws markers of a single size with the batch routines of a GC.
+
+    Returns True if the markers were drawn, or False if the GC does not
+    support drawing this marker in a batch.
+    """
+    # try fastest routine
+    if not isinstance(marker, CustomMarker):
+        # get fast renderer, or dummy if not implemented
+        renderer = getattr(gc, "draw_marker_at_points", lambda *a: 0)
+        result = renderer(points, marker_size, marker.kiva_marker)
+        # it worked, we're done
+        if result != 0:
+            return True
+
+    # try next fastest routine
+    if hasattr(gc, "draw_path_at_points"):
+        if not isinstance(marker, CustomMarker):
+            path = gc.get_empty_path()
+            marker.add_to_path(path, marker_size)
+            mode = marker.draw_mode
+        else:
+            path = custom_symbol
+            mode = STROKE
+        if not marker.antialias:
+            gc.set_antialias(False)
+        gc.draw_path_at_points(points, path, mode)
+        return True
+
+    return False
+
+
+def bucket_marker_sizes(marker_size, tolerance=0.0):
+    """Groups markers by size, rounding the sizes to multiples of tolerance.
+
+    Parameters
+    ----------
+    marker_size : array of float
+        The size of each marker.
+    tolerance : float
+        The sizes are rounded to multiples of this.  If 0, only markers of
+        exactly the same size are grouped.
+
+    Returns
+    -------
+    sizes : array of float
+        The size of the markers of each group, in decreasing order.
+    indices : list of arrays of int
+        The indices of the markers of each group.
+    """
+    marker_size = asarray(marker_size, dtype=float)
+    if len(marker_size) == 0:
+        return marker_size, []
+    if tolerance > 0:
+        keys = around(marker_size / tolerance)
+    else:
+        keys = marker_size
+    # Negate the keys so that the largest markers come first
+    unique_keys, inverse = unique(-keys, return_inverse=True)
+    order = argsort(inverse, kind="stable")
+    edges = cumsum(bincount(inverse))[:-1]
+    sizes = -unique_keys
+    if tolerance > 0:
+        sizes = sizes * tolerance
+    return sizes, split(order, edges)
+
+
 # ------------------------------------------------------------------------------
 # The scatter plot
 # ------------------------------------------------------------------------------
@@ -230,6 +331,11 @@ class ScatterPlot(BaseXYPlot):
     # TODO: for consistency, there should be a size data source and a mapper
     marker_size = Either(Float, Array, requires_redraw=True)
 
+    # When **marker_size** is an array, the sizes are rounded to multiples of
+    # this many pixels so that the markers of each size can be drawn in one
+    # batch.  If 0, only markers of exactly the same size are batched.
+    marker_size_tolerance = Float(0.0, requires_redraw=True)
+
     # The function which actually renders the markers
     render_markers_func = Callable(render_markers)
 
@@ -255,6 +361,49 @@ class ScatterPlot(BaseXYPlot):
         Tuple, observe=["outline_color", "alpha"]
     )
 
+    # ------------------------------------------------------------------------
+    # Density rendering
+    # ------------------------------------------------------------------------
+
+    # How the points are drawn:
+    #
+    # markers:
+    #     Draw a marker for each point.
+    # density:
+    #     Divide the plot into square bins of **density_bin_size** pixels,
+    #     reduce the points of each bin with **density_reduction**, and fill
+    #     the bins with the colors of **density_color_mapper**.  This is much
+    #     faster than drawing markers when there are many more points than
+    #     pixels.
+    # auto:
+    #     Draw the density when there are more than **density_threshold**
+    #     points in view per bin, and markers otherwise, so that zooming in
+    #     shows the individual points again.
+    render_mode = Enum("markers", "density", "auto", requires_redraw=True)
+
+    # The width and height, in pixels, of the bins of the density.
+    density_bin_size = Float(1.0, requires_redraw=True)
+
+    # In "auto" render mode, the number of points in view per bin above which
+    # the density is drawn.
+    density_threshold = Float(1.0, requires_redraw=True)
+
+    # How the points of each bin are reduced to the value of the bin: their
+    # number, or the mean or maximum of their **density_data** values.
+    density_reduction = Enum("count", "mean", "max", requires_redraw=True)
+
+    # The values of the points which are reduced to the mean or maximum of
+    # each bin.  If None, the points are counted.
+    density_data = Instance(AbstractDataSource)
+
+    # The color mapper for the values of the bins.  Empty bins are not drawn.
+    # By default, the range of the color mapper follows
+    # **density_data_source**.
+    density_color_mapper = Instance(AbstractColormap)
+
+    # The values of the non-empty bins of the density which was last drawn.
+    density_data_source = Instance(ArrayDataSource, args=(), transient=True)
+
     # TraitsUI View for customizing the plot.
     traits_view = ScatterPlotView()
 
@@ -287,6 +436,7 @@ class ScatterPlot(BaseXYPlot):
     _cached_point_mask = Array(transient=True)
     _cached_selection_point_mask = Array(transient=True)
     _selection_cache_valid = Bool(False, transient=True)
+    _updating_density = Bool(False, transient=True)
 
     # ------------------------------------------------------------------------
     # Overridden PlotRenderer methods
@@ -386,6 +536,10 @@ class ScatterPlot(BaseXYPlot):
                 return ndx
             else:
                 return None
+        elif self._subdivision is not None:
+            return self._map_index_subdivision(
+                screen_pt, threshold, index_only
+            )
         else:
             # Brute force implementation
             all_data = transpose(array([index_data, value_data]))
@@ -403,11 +557,76 @@ class ScatterPlot(BaseXYPlot):
             else:
                 return None
 
+    # ------------------------------------------------------------------------
+    # Private methods for hit-testing with the spatial subdivision
+    # ------------------------------------------------------------------------
+
+    def _map_index_subdivision(self, screen_pt, threshold, index_only):
+        """ Finds the closest point using the spatial subdivision structure.
+
+        Returns the same result as the brute force search in map_index(), but
+        only measures the screen distance to the points in the grid cells
+        that are near *screen_pt*.
+        """
+        if self._subdivision.size == 0:
+            return None
+        ndx, dist = self._closest_candidate(screen_pt, threshold, index_only)
+        if ndx is not None and dist <= threshold:
+            return ndx
+        return None
+
+    def _closest_candidate(self, screen_pt, radius, index_only):
+        """ Returns the (index, screen distance) of the closest point among
+        the grid cells within *radius* pixels of *screen_pt*, or
+        (None, None) if there are no such points.
+        """
+        # Pad by a pixel, because distances are measured from the rounded
+        # screen positions of the points.
+        region = self._subdivision_region(screen_pt, radius + 1.0, index_only)
+        candidates = self._subdivision.query(*region)
+        if len(candidates) == 0:
+            return None, None
+
+        data = column_stack(
+            [self.index.get_data()[candidates],
+             self.value.get_data()[candidates]]
+        )
+        screen_points = around(self.map_screen(data))
+        if index_only:
+            distances = abs(screen_points[:, 0] - screen_pt[0])
+        else:
+            delta = screen_points - array([screen_pt])
+            distances = sqrt(sum(delta * delta, axis=1))
+        if isnan(distances).all():
+            return None, None
+        closest = nanargmin(distances)
+        return candidates[closest], distances[closest]
+
+    def _subdivision_region(self, screen_pt, radius, index_only):
+        """ Returns the (index_low, index_high, value_low, value_high) region
+        of data space covered by a square of side 2 * *radius* pixels
+        centered on *screen_pt*.
+        """
+        sx, sy = screen_pt
+        x_bounds = sorted(
+            self.x_mapper.map_data(array([sx - radius, sx + radius]))
+        )
+        if index_only:
+            y_bounds = [-inf, inf]
+        else:
+            y_bounds = sorted(
+                self.y_mapper.map_data(array([sy - radius, sy + radius]))
+            )
+        if self.orientation == "h":
+            return (x_bounds[0], x_bounds[1], y_bounds[0], y_bounds[1])
+        else:
+            return (y_bounds[0], y_bounds[1], x_bounds[0], x_bounds[1])
+
     # ------------------------------------------------------------------------
     # Private methods; implements the BaseXYPlot stub methods
     # ------------------------------------------------------------------------
 
-    def _gather_points_old(self):
+    def _gather_points(self):
         """
         Collects the data points that are within the bounds of the plot and
         caches them
@@ -427,105 +646,80 @@ class ScatterPlot(BaseXYPlot):
             self._cache_valid = True
             return
 
-        index_range_mask = self.index_mapper.range.mask_data(index)
-        value_range_mask = self.value_mapper.range.mask_data(value)
-
-        nan_mask = isfinite(index) & index_mask & isfinite(value) & value_mask
-        point_mask = nan_mask & index_range_mask & value_range_mask
-
-        if not self._cache_valid:
-            if not point_mask.all():
-                points = column_stack([index[point_mask], value[point_mask]])
-            else:
-                points = column_stack([index, value])
-            self._cached_data_pts = points
-            self._cached_point_mask = point_mask
-            self._cache_valid = True
-
-        if not self._selection_cache_valid:
-            indices = None
-            # Check both datasources for metadata
-            # XXX: Only one is used, and if both are defined, then self.index
-            # happens to take precendence.  Perhaps this should be more
-            # structured?  Hopefully, when we create the Selection objects,
-            # we'll have to define a small algebra about how they are combined,
-            # and this will fall out...
-            point_mask = point_mask.copy()
-            for ds in (self.index, self.value):
-                if ds.metadata.get("selection_masks", None) is not None:
-                    try:
-                        for mask in ds.metadata["selection_masks"]:
-                            point_mask &= mask
-                        indices = where(point_mask == True)
-                        points = column_stack([index[indices], value[indices]])
-                    except:
-                        continue
-                elif ds.metadata.get("selections", None) is not None:
-                    try:
-                        indices = ds.metadata["selections"]
-                        point_mask = point_mask[indices]
-                        points = column_stack([index[indices], value[indices]])
-                    except:
-                        continue
-                else:
-                    continue
-
-                self._cached_selection_point_mask = point_mask
-                self._cached_selected_pts = points
-                self._selection_cache_valid = True
-                break
-            else:
-                self._cached_selected_pts = None
-                self._selection_cache_valid = True
-
-    def _gather_points_fast(self):
-        if self._cache_valid and self._selection_cache_valid:
-            return
-
-        if not self.index or not self.value:
-            return
-
-        index, index_mask = self.index.get_data_mask()
-        value, value_mask = self.value.get_data_mask()
-
-        index_range = self.index_mapper.range
+        selection_mask, selections = self._get_selection(len(index))
+        index_low, index_high = self._get_gather_index_bounds()
         value_range = self.value_mapper.range
-
-        kw = {}
-        for axis in ("index", "value"):
-            ds = getattr(self, axis)
-            if ds.metadata.get("selections", None) is not None:
-                kw[axis + "_sel"] = ds.metadata["selections"]
-            if ds.metadata.get("selection_mask", None) is not None:
-                kw[axis + "_sel_mask"] = ds.metadata["selection_mask"]
-
-        points, selections = scatterplot_gather_points(
+        points, point_mask, selected = scatterplot_gather_points_and_mask(
             index,
-            index_range.low,
-            index_range.high,
+            index_low,
+            index_high,
             value,
             value_range.low,
             value_range.high,
             index_mask=index_mask,
             value_mask=value_mask,
-            **kw
+            selection_mask=selection_mask,
         )
 
         if not self._cache_valid:
             self._cached_data_pts = points
+            self._cached_point_mask = point_mask
             self._cache_valid = True
 
         if not self._selection_cache_valid:
-            if selections is not None and len(selections) > 0:
-                self._cached_selected_pts = points[selections]
-                self._selection_cache_valid = True
+            if selection_mask is not None:
+                self._cached_selection_point_mask = point_mask & selection_mask
+                self._cached_selected_pts = points[selected]
+            elif selections is not None:
+                # Selected points are drawn even if they are masked out.
+                self._cached_selection_point_mask = point_mask[selections]
+                self._cached_selected_pts = column_stack(
+                    [index[selections], value[selections]]
+                )
             else:
                 self._cached_selected_pts = None
-                self._selection_cache_valid = True
+            self._selection_cache_valid = True
 
-    def _gather_points(self):
-        # self._gather_points_fast()
-        self._gather_points_old()
+    def _get_selection(self, size):
+        """ Returns the selection from the metadata of the data sources, as
+        a tuple of a mask of the selected points and an array of the
+        positions of the selected points, one of which is None.
+
+        The "selection_masks" metadata of a data source is a list of masks
+        whose intersection is the selection, and the "selections" metadata is
+        an array of positions.  The index takes precedence over the value,
+        and metadata which doesn't fit the data is ignored.
+        """
+        for ds in (self.index, self.value):
+            masks = ds.metadata.get("selection_masks", None)
+            if masks is not None:
+                masks = [asarray(mask, dtype=bool) for mask in masks]
+                if any(mask.shape != (size,) for mask in masks):
+                    continue
+                selection_mask = ones(size, dtype=bool)
+                for mask in masks:
+                    selection_mask &= mask
+                return selection_mask, None
+
+            selections = ds.metadata.get("selections", None)
+            if selections is not None:
+                selections = asarray(selections)
+                if selections.dtype == bool:
+                    if selections.shape != (size,):
+                        continue
+                elif selections.dtype.kind in "iu":
+                    if len(selections) > 0 and not (
+                        -size <= selections.min()
+                        and selections.max() < size
+                    ):
+                        continue
+                elif len(selections) > 0:
+                    continue
+                else:
+                    selections = selections.astype(int)
+                return None, selections
+
+        return None, None
 
     def _render(self, gc, points, icon_mode=False):
         """
@@ -538,18 +732,31 @@ class ScatterPlot(BaseXYPlot):
             gc.save_state()
             gc.clip_to_rect(self.x, self.y, self.width, self.height)
 
-        self.render_markers_func(
-            gc,
-            points,
-            self.marker,
-            self.marker_size,
-            self.effective_color,
-            self.line_width,
-            self.effective_outline_color,
-            self.custom_symbol,
-            point_mask=self._cached_point_mask,
-        )
+        if not icon_mode and self._use_density(len(points)):
+            self._render_density(gc, points)
+        else:
+            self.render_markers_func(
+                gc,
+                points,
+                self.marker,
+                self.marker_size,
+                self.effective_color,
+                self.line_width,
+                self.effective_outline_color,
+                self.custom_symbol,
+                point_mask=self._cached_point_mask,
+                size_tolerance=self.marker_size_tolerance,
+            )
+
+        self._render_selection(gc)
+
+        if not icon_mode:
+            # Draw the default axes, if necessary
+            self._draw_default_axes(gc)
+            gc.restore_state()
 
+    def _render_selection(self, gc):
+        """Draws the markers of the selected points."""
         if (
             self._cached_selected_pts is not None
             and len(self._cached_selected_pts) > 0
@@ -567,10 +774,157 @@ class ScatterPlot(BaseXYPlot):
                 point_mask=self._cached_point_mask,
             )
 
-        if not icon_mode:
-            # Draw the default axes, if necessary
-            self._draw_default_axes(gc)
-            gc.restore_state()
+    def _use_density(self, num_points):
+        """Whether the points are drawn as a density rather than markers."""
+        if self.render_mode == "auto":
+            width, height = self._density_shape()
+            return num_points > self.density_threshold * width * height
+        return self.render_mode == "density"
+
+    def _density_shape(self):
+        """The number of columns and rows of bins of the density."""
+        bin_size = self.density_bin_size
+        width = max(int(ceil(self.width / bin_size)), 1)
+        height = max(int(ceil(self.height / bin_size)), 1)
+        return width, height
+
+    def _get_density_values(self, points):
+        """The values of the points in view which are reduced in each bin of
+        the density, or None if the points are counted.
+        """
+        if self.density_reduction == "count" or self.density_data is None:
+            return None
+        data = self.density_data.get_data()
+        point_mask = self._cached_point_mask
+        if len(data) != len(point_mask):
+            return None
+        return data[point_mask]
+
+    def _render_density(self, gc, points):
+        """Draws the points as an image of the density of points."""
+        if len(points) == 0:
+            return
+        width, height = self._density_shape()
+        bin_size = self.density_bin_size
+        values = self._get_density_values(points)
+        if values is None:
+            reduction = "count"
+        else:
+            reduction = self.density_reduction
+        density = bin_points(
+            asarray(points)[:, :2],
+            self.x,
+            self.y,
+            bin_size,
+            width,
+            height,
+            values=values,
+            reduction=reduction,
+        )
+        if reduction == "count":
+            # empty bins are not drawn
+            density[density == 0] = nan
+        # The default color mapper updates to the new values before they are
+        # mapped, so there is no need to draw again.
+        self._updating_density = True
+        try:
+            self.density_data_source.set_data(density[isfinite(density)])
+        finally:
+            self._updating_density = False
+
+        # Images are drawn with their first row at the top.
+        rgba = self.density_color_mapper.map_uint8(density[::-1])
+        image = GraphicsContextArray(
+            ascontiguousarray(rgba), pix_format="rgba32"
+        )
+        if hasattr(image, "set_image_interpolation"):
+            image.set_image_interpolation("nearest")
+        with gc:
+            gc.set_alpha(self.alpha)
+            gc.draw_image(
+                image,
+                (self.x, self.y, width * bin_size, height * bin_size),
+            )
+
+    def _get_gather_index_bounds(self):
+        """Overrides BaseXYPlot.
+
+        The densities of a strip are binned and colored like those of the
+        whole plot, so all the points in the index range are gathered.
+        """
+        if self.render_mode != "markers":
+            return self.index_range.low, self.index_range.high
+        return super()._get_gather_index_bounds()
+
+    def _index_strip_margin(self):
+        """Overrides BaseXYPlot."""
+        marker_size = asarray(self.marker_size)
+        if marker_size.size == 0:
+            return self.line_width
+        return float(marker_size.max()) + self.line_width
+
+    def _get_progressive_chunks(self, points):
+        """Overrides BaseXYPlot.
+
+        The chunks are runs of consecutive points, so that the markers
+        overlap like when they are drawn at once.  Densities are drawn at
+        once.
+        """
+        if self._use_density(len(points)):
+            return None
+        size = max(self.progressive_chunk_size, 1)
+        marker_size = self._get_screen_marker_size()
+        chunks = []
+        for start in range(0, len(points), size):
+            if isinstance(marker_size, ndarray):
+                sizes = marker_size[start:start + size]
+            else:
+                sizes = marker_size
+            chunks.append((points[start:start + size], sizes))
+        return chunks
+
+    def _get_progressive_coarse(self, points):
+        """Overrides BaseXYPlot.
+
+        An evenly spread sample of about one chunk of the points.
+        """
+        step = -(-len(points) // max(self.progressive_chunk_size, 1))
+        marker_size = self._get_screen_marker_size()
+        if isinstance(marker_size, ndarray):
+            return points[::step], marker_size[::step]
+        return points[::step], marker_size
+
+    def _get_screen_marker_size(self):
+        """The marker size of each point in view, or the size of all."""
+        marker_size = self.marker_size
+        if isinstance(marker_size, ndarray):
+            point_mask = self._cached_point_mask
+            if len(marker_size) == len(point_mask):
+                return marker_size[point_mask]
+        return marker_size
+
+    def _render_progressive_chunk(self, gc, chunk, last):
+        """Overrides BaseXYPlot.
+
+        The selection is drawn over the last chunk.
+        """
+        points, marker_size = chunk
+        with gc:
+            gc.clip_to_rect(self.x, self.y, self.width, self.height)
+            self.render_markers_func(
+                gc,
+                points,
+                self.marker,
+                marker_size,
+                self.effective_color,
+                self.line_width,
+                self.effective_outline_color,
+                self.custom_symbol,
+                size_tolerance=self.marker_size_tolerance,
+            )
+            if last:
+                self._render_selection(gc)
+                self._draw_default_axes(gc)
 
     def _render_icon(self, gc, x, y, width, height):
         point = array([x + width / 2, y + height / 2])
@@ -588,6 +942,21 @@ class ScatterPlot(BaseXYPlot):
             self.invalidate_draw()
             self.request_redraw()
 
+    @observe("_gather_index_bounds")
+    def _gather_index_bounds_updated(self, event):
+        super()._gather_index_bounds_updated(event)
+        self._selection_cache_valid = False
+
+    @observe([
+        "density_data.data_changed",
+        "density_color_mapper.updated",
+    ])
+    def _density_updated(self, event):
+        if self._updating_density:
+            return
+        if self.render_mode != "markers":
+            self.invalidate_and_redraw()
+
     # ------------------------------------------------------------------------
     # Defaults
     # ------------------------------------------------------------------------
@@ -595,6 +964,9 @@ class ScatterPlot(BaseXYPlot):
     def _marker_size_default(self):
         return 4.0
 
+    def _density_color_mapper_default(self):
+        return viridis(DataRange1D(self.density_data_source))
+
     # ------------------------------------------------------------------------
     # Properties
     # ------------------------------------------------------------------------
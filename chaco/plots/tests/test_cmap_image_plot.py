@@ -54,3 +54,133 @@ class TestCMapImagePlot(unittest.TestCase):
 
         # Then
         window.redraw.assert_called_once_with()
+
+
+class TestCMapImagePlotTiles(unittest.TestCase):
+    def setUp(self):
+        self.data = numpy.arange(200 * 300, dtype=float).reshape(200, 300)
+        index = GridDataSource(
+            xdata=numpy.arange(301.0), ydata=numpy.arange(201.0)
+        )
+        self.index_mapper = GridMapper(range=DataRange2D(index))
+        self.color_source = ImageData(data=self.data, value_depth=1)
+        self.color_mapper = Spectral(DataRange1D(self.color_source))
+        self.plot = CMapImagePlot(
+            index=index,
+            index_mapper=self.index_mapper,
+            value=self.color_source,
+            value_mapper=self.color_mapper,
+            tile_size=64,
+            bounds=[300, 200],
+        )
+
+    def cached_image(self):
+        self.plot._compute_cached_image()
+        return self.plot._cached_image.bmp_array
+
+    def test_matches_full_map(self):
+        expected = self.color_mapper.map_uint8(self.data)
+
+        numpy.testing.assert_array_equal(self.cached_image(), expected)
+
+        self.index_mapper.range.set_bounds((100, 50), (150, 80))
+        image = self.cached_image()
+        (col_min, col_max, row_min, row_max), _ = (
+            self.plot._calc_visible_bounds()
+        )
+        self.assertLess(col_max - col_min, 60)
+        numpy.testing.assert_array_equal(
+            image, expected[row_min:row_max, col_min:col_max]
+        )
+
+    def test_zoomed_maps_visible_tiles(self):
+        self.index_mapper.range.set_bounds((10, 10), (50, 50))
+        self.cached_image()
+
+        self.assertEqual(len(self.plot._tile_cache), 1)
+
+        self.index_mapper.range.set_bounds((40, 40), (100, 100))
+        self.cached_image()
+        self.assertEqual(len(self.plot._tile_cache), 4)
+
+    def test_range_change_reuses_tiles(self):
+        self.cached_image()
+        self.assertEqual(len(self.plot._tile_cache), 20)
+        low = self.color_mapper.range.low
+
+        self.color_mapper.range.low = low + 1000.0
+        self.cached_image()
+        self.assertEqual(len(self.plot._tile_cache), 40)
+
+        self.color_mapper.range.low = low
+        self.cached_image()
+        self.assertEqual(len(self.plot._tile_cache), 40)
+
+        # changing the colormap itself needs new tiles
+        self.color_mapper.reverse_colormap()
+        numpy.testing.assert_array_equal(
+            self.cached_image(), self.color_mapper.map_uint8(self.data)
+        )
+        self.assertEqual(len(self.plot._tile_cache), 60)
+
+        # at most max_cached_tiles are kept, or a full image if more
+        self.plot.max_cached_tiles = 10
+        self.color_mapper.range.low = low + 2000.0
+        self.cached_image()
+        self.assertEqual(len(self.plot._tile_cache), 20)
+
+    def test_not_cache_full_map(self):
+        self.plot.cache_full_map = False
+        self.plot.max_cached_tiles = 2
+
+        numpy.testing.assert_array_equal(
+            self.cached_image(), self.color_mapper.map_uint8(self.data)
+        )
+        self.assertEqual(len(self.plot._tile_cache), 2)
+
+    def test_selection_fade(self):
+        mask = numpy.zeros(self.data.shape, dtype=bool)
+        mask[100:, 150:] = True
+        self.cached_image()
+        self.color_source.metadata["selection_masks"] = [mask]
+
+        image = self.cached_image()
+
+        expected = self.color_mapper.map_uint8(self.data)
+        numpy.testing.assert_array_equal(
+            image[100:, 150:], expected[100:, 150:]
+        )
+        self.assertFalse(numpy.array_equal(image[:100], expected[:100]))
+
+    def test_pyramid_level(self):
+        self.color_source.use_pyramid = True
+        self.plot.bounds = [75, 50]
+
+        image = self.cached_image()
+
+        level = self.color_source.get_pyramid_level(2)
+        self.assertEqual(level.shape, (50, 75))
+        numpy.testing.assert_array_equal(
+            image, self.color_mapper.map_uint8(level)
+        )
+
+    def test_sampled_pyramid_level(self):
+        self.color_source.pyramid_reduction = "sample"
+        self.color_source.use_pyramid = True
+        self.plot.bounds = [75, 50]
+
+        image = self.cached_image()
+
+        numpy.testing.assert_array_equal(
+            image, self.color_mapper.map_uint8(self.data[::4, ::4])
+        )
+
+    def test_data_change(self):
+        self.cached_image()
+
+        self.color_source.set_data(self.data[::-1].copy())
+
+        numpy.testing.assert_array_equal(
+            self.cached_image(),
+            self.color_mapper.map_uint8(self.data[::-1]),
+        )
@@ -9,8 +9,19 @@
 # Thanks for using Enthought open source!
 
 import unittest
-
-from numpy import alltrue, arange
+from unittest import mock
+
+from numpy import (
+    alltrue,
+    arange,
+    around,
+    flatnonzero,
+    isin,
+    nan,
+    ones,
+    random,
+)
+from numpy.testing import assert_array_equal
 from enable.compiled_path import CompiledPath
 
 # Chaco imports
@@ -22,6 +33,7 @@ from chaco.api import (
     PlotGraphicsContext,
     jet,
 )
+from chaco.plots import colormapped_scatterplot
 
 
 class TestColormappedScatterplot(unittest.TestCase):
@@ -101,3 +113,134 @@ class TestColormappedScatterplot(unittest.TestCase):
         self.gc.render_component(self.scatterplot)
         actual = self.gc.bmp_array[:, :, :]
         self.assertFalse(alltrue(actual == 255))
+
+
+class TestColormappedScatterplotBands(unittest.TestCase):
+    def setUp(self):
+        rs = random.RandomState(0)
+        self.index = ArrayDataSource(rs.uniform(0, 10, 5000))
+        self.value = ArrayDataSource(rs.uniform(0, 10, 5000))
+        colors = rs.uniform(0, 1, 5000)
+        colors[::100] = nan
+        self.color_data = ArrayDataSource(colors)
+
+        self.index_range = DataRange1D(low=0, high=10)
+        self.value_range = DataRange1D(low=0, high=10)
+        self.color_mapper = jet(DataRange1D(low=0, high=1))
+        self.map_index = self.color_mapper.map_index
+
+        self.scatterplot = ColormappedScatterPlot(
+            index=self.index,
+            value=self.value,
+            index_mapper=LinearMapper(range=self.index_range),
+            value_mapper=LinearMapper(range=self.value_range),
+            color_data=self.color_data,
+            color_mapper=self.color_mapper,
+            render_method="banded",
+        )
+        self.scatterplot.outer_bounds = [50, 50]
+        self.gc = PlotGraphicsContext((50, 50))
+
+    def assert_bands_match_view(self):
+        plot = self.scatterplot
+        visible = flatnonzero(plot._cached_point_mask)
+        color_indices = self.map_index(self.color_data.get_data()[visible])
+        self.assertEqual(
+            sum(len(rows) for rows in plot._index_bands.values()),
+            len(visible),
+        )
+        for color_index, rows in plot._index_bands.items():
+            assert_array_equal(
+                rows, flatnonzero(color_indices == color_index)
+            )
+
+    def test_bands(self):
+        self.gc.render_component(self.scatterplot)
+
+        self.assert_bands_match_view()
+        self.assertGreater(len(self.scatterplot._index_bands), 100)
+
+    def test_all_points_in_view(self):
+        self.color_data.set_data(random.RandomState(1).uniform(0, 1, 5000))
+        self.gc.render_component(self.scatterplot)
+        self.assertTrue(self.scatterplot._cached_point_mask.all())
+        self.assert_bands_match_view()
+
+        # The sorted points are reused while all the points are in view
+        with mock.patch.object(
+            colormapped_scatterplot,
+            "_sort_bands",
+            wraps=colormapped_scatterplot._sort_bands,
+        ) as sort_bands:
+            self.scatterplot.invalidate_and_redraw()
+            self.gc.render_component(self.scatterplot)
+
+        sort_bands.assert_not_called()
+        self.assert_bands_match_view()
+
+    def test_pan_does_not_map_colors(self):
+        self.gc.render_component(self.scatterplot)
+
+        with mock.patch.object(
+            self.color_mapper, "map_index", wraps=self.color_mapper.map_index
+        ) as map_index:
+            self.index_range.set_bounds(2, 7)
+            self.value_range.set_bounds(3, 9)
+            self.gc.render_component(self.scatterplot)
+
+        map_index.assert_not_called()
+        self.assert_bands_match_view()
+
+    def test_color_changes_map_colors_again(self):
+        self.gc.render_component(self.scatterplot)
+
+        with mock.patch.object(
+            self.color_mapper, "map_index", wraps=self.color_mapper.map_index
+        ) as map_index:
+            self.color_mapper.range.set_bounds(0.2, 0.6)
+            self.gc.render_component(self.scatterplot)
+            self.assert_bands_match_view()
+            self.color_data.set_data(self.color_data.get_data()[::-1])
+            self.gc.render_component(self.scatterplot)
+            self.assert_bands_match_view()
+
+        self.assertEqual(map_index.call_count, 2)
+
+    def test_variable_sizes(self):
+        sizes = random.RandomState(2).uniform(1, 5, 5000)
+        self.scatterplot.marker_size = sizes
+        self.scatterplot.marker_size_tolerance = 1.0
+        self.gc.render_component(self.scatterplot)
+        actual = self.gc.bmp_array[:, :, :]
+        self.assertFalse(alltrue(actual == 255))
+
+        # Every point in view is drawn once, at its rounded size
+        plot = self.scatterplot
+        visible_sizes = sizes[plot._cached_point_mask]
+        drawn = []
+        for color_index, size, rows in plot._iter_bands(visible_sizes):
+            self.assertTrue(isin(rows, plot._index_bands[color_index]).all())
+            assert_array_equal(around(visible_sizes[rows]), size)
+            drawn.extend(rows)
+        self.assertEqual(sorted(drawn), list(range(len(visible_sizes))))
+
+    def test_auto_render_method_with_variable_sizes(self):
+        self.scatterplot.marker_size = ones(5000)
+
+        self.assertEqual(self.scatterplot._calc_render_method(5000), "banded")
+        self.assertEqual(
+            self.scatterplot._calc_render_method(10), "bruteforce"
+        )
+
+    def test_density_of_colors(self):
+        self.scatterplot.render_mode = "density"
+        self.scatterplot.density_reduction = "mean"
+        self.gc.render_component(self.scatterplot)
+
+        actual = self.gc.bmp_array[:, :, :]
+        self.assertFalse(alltrue(actual == 255))
+        means = self.scatterplot.density_data_source.get_data()
+        self.assertGreater(len(means), 0)
+        # The bins hold the mean color, not the number of points
+        self.assertTrue(((means >= 0) & (means <= 1)).all())
+        self.assertTrue((means % 1 != 0).any())
@@ -0,0 +1,263 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+import unittest
+
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+
+from chaco.api import (
+    ContourLinePlot,
+    ContourPolyPlot,
+    DataRange2D,
+    GridDataSource,
+    GridMapper,
+    ImageData,
+    PlotGraphicsContext,
+)
+from chaco.plots.contour.contour import Cntr
+
+
+class ContourPlotsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.xs = np.linspace(-2, 2, 60)
+        self.ys = np.linspace(-1, 1, 40)
+        x, y = np.meshgrid(self.xs, self.ys)
+        self.z = np.sin(3 * x) * np.cos(2 * y)
+        self.z[10, 10] = np.nan
+        self.index = GridDataSource(xdata=self.xs, ydata=self.ys)
+        self.value = ImageData(data=self.z, value_depth=1)
+
+    def create_plot(self, klass, **traits):
+        traits.setdefault("bounds", [120, 80])
+        return klass(
+            index=self.index,
+            index_mapper=GridMapper(range=DataRange2D(self.index)),
+            value=self.value,
+            levels=[-0.5, 0.0, 0.25, 0.5],
+            **traits
+        )
+
+    def expected_traces(self, *levels):
+        x, y = np.meshgrid(self.xs, self.ys)
+        c = Cntr(x, y, self.z, ~np.isfinite(self.z))
+        return [np.transpose(trace) for trace in c.trace(*levels)]
+
+    def assert_traces_equal(self, traces, expected):
+        self.assertEqual(len(traces), len(expected))
+        for trace, expected_trace in zip(traces, expected):
+            assert_array_equal(trace, expected_trace)
+
+    def test_contour_lines(self):
+        for threads in (0, 1, 3):
+            plot = self.create_plot(ContourLinePlot, trace_threads=threads)
+            plot._update_levels()
+            plot._update_contours()
+
+            for level in [-0.5, 0.0, 0.25, 0.5]:
+                self.assert_traces_equal(
+                    plot._cached_contours[plot._data_version, (level,)],
+                    self.expected_traces(level),
+                )
+
+    def test_contour_polys(self):
+        plot = self.create_plot(ContourPolyPlot)
+        plot._update_levels()
+        plot._update_polys()
+
+        self.assertEqual(len(plot._cached_polys), 3)
+        self.assert_traces_equal(
+            plot._cached_polys[plot._data_version, (0.0, 0.25)],
+            self.expected_traces(0.0, 0.25),
+        )
+
+    def test_tracer_reused(self):
+        plot = self.create_plot(ContourLinePlot)
+        plot._update_levels()
+        plot._update_contours()
+        tracer = plot._tracer
+
+        plot.levels = [0.1, 0.2]
+        plot._update_contours()
+        self.assertIs(plot._tracer, tracer)
+        self.assertEqual(
+            sorted(level for _, (level,) in plot._cached_contours), [0.1, 0.2]
+        )
+
+        self.value.set_data(-self.z)
+        plot._update_levels()
+        plot._update_contours()
+        self.assertIsNot(plot._tracer, tracer)
+
+    def test_level_edit_retraces_changed_levels(self):
+        plot = self.create_plot(ContourLinePlot)
+        plot._update_levels()
+        plot._update_contours()
+        old = dict(plot._cached_contours)
+        version = plot._data_version
+
+        traced = []
+        trace = plot._trace
+
+        def recording_trace(level_args):
+            traced.extend(level_args)
+            return trace(level_args)
+
+        plot._trace = recording_trace
+        plot.levels = [-0.5, 0.1, 0.25, 0.5]
+        plot._update_contours()
+
+        self.assertEqual(traced, [(0.1,)])
+        for level in [-0.5, 0.25, 0.5]:
+            self.assertIs(
+                plot._cached_contours[version, (level,)],
+                old[version, (level,)],
+            )
+        self.assertNotIn((version, (0.0,)), plot._cached_contours)
+        self.assert_traces_equal(
+            plot._cached_contours[version, (0.1,)], self.expected_traces(0.1)
+        )
+
+    def test_level_edit_retraces_changed_polys(self):
+        plot = self.create_plot(ContourPolyPlot)
+        plot._update_levels()
+        plot._update_polys()
+
+        traced = []
+        trace = plot._trace
+
+        def recording_trace(level_args):
+            traced.extend(level_args)
+            return trace(level_args)
+
+        plot._trace = recording_trace
+        plot.levels = [-0.5, 0.1, 0.25, 0.5]
+        plot._update_polys()
+
+        self.assertEqual(traced, [(-0.5, 0.1), (0.1, 0.25)])
+        self.assertEqual(len(plot._cached_polys), 3)
+
+    def test_data_change_retraces_all_levels(self):
+        plot = self.create_plot(ContourLinePlot)
+        plot._update_levels()
+        plot._update_contours()
+        version = plot._data_version
+
+        self.value.set_data(-self.z)
+        self.assertEqual(plot._data_version, version + 1)
+        plot.levels = [-0.5, 0.0, 0.25, 0.5]
+        plot._update_contours()
+
+        self.assertEqual(len(plot._cached_contours), 4)
+        self.assertNotIn((version, (0.0,)), plot._cached_contours)
+        x, y = np.meshgrid(self.xs, self.ys)
+        c = Cntr(x, y, -self.z, ~np.isfinite(self.z))
+        expected = [np.transpose(trace) for trace in c.trace(0.0)]
+        self.assert_traces_equal(
+            plot._cached_contours[version + 1, (0.0,)], expected
+        )
+
+    def test_screen_contours(self):
+        plot = self.create_plot(ContourLinePlot)
+        gc = PlotGraphicsContext((120, 80))
+        gc.render_component(plot)
+
+        for level in plot._levels:
+            key = (plot._data_version, (level,))
+            straces = plot._cached_screen_contours[key]
+            traces = plot._cached_contours[key]
+            self.assertEqual(len(straces), len(traces))
+            for strace, trace in zip(straces, traces):
+                assert_allclose(
+                    strace + plot._screen_origin, plot.map_screen(trace)
+                )
+
+    def test_screen_contours_vertical(self):
+        plot = self.create_plot(ContourLinePlot, orientation="v")
+        gc = PlotGraphicsContext((80, 120))
+        gc.render_component(plot)
+
+        key = (plot._data_version, (0.0,))
+        straces = plot._cached_screen_contours[key]
+        traces = plot._cached_contours[key]
+        for strace, trace in zip(straces, traces):
+            assert_allclose(
+                strace + plot._screen_origin, plot.map_screen(trace)[:, ::-1]
+            )
+
+    def test_simplify_tolerance(self):
+        plot = self.create_plot(ContourLinePlot)
+        gc = PlotGraphicsContext((120, 80))
+        gc.render_component(plot)
+        n_points = sum(
+            len(strace)
+            for straces in plot._cached_screen_contours.values()
+            for strace in straces
+        )
+
+        plot.simplify_tolerance = 1.0
+        gc.render_component(plot)
+        n_simplified = sum(
+            len(strace)
+            for straces in plot._cached_screen_contours.values()
+            for strace in straces
+        )
+
+        self.assertLess(n_simplified, n_points)
+        self.assertEqual(
+            len(plot._cached_screen_contours), len(plot._cached_contours)
+        )
+
+    def test_screen_contours_follow_view(self):
+        plot = self.create_plot(ContourLinePlot)
+        gc = PlotGraphicsContext((120, 80))
+        gc.render_component(plot)
+        key = (plot._data_version, (0.0,))
+        straces = plot._cached_screen_contours[key]
+
+        # Redraws of the same view reuse the screen space contours
+        gc.render_component(plot)
+        self.assertIs(plot._cached_screen_contours[key], straces)
+
+        plot.index_mapper.range.set_bounds((-1, -0.5), (1, 0.5))
+        gc.render_component(plot)
+        self.assertIsNot(plot._cached_screen_contours[key], straces)
+        for strace, trace in zip(
+            plot._cached_screen_contours[key], plot._cached_contours[key]
+        ):
+            assert_allclose(
+                strace + plot._screen_origin, plot.map_screen(trace)
+            )
+
+    def test_screen_contours_kept_while_panning(self):
+        plot = self.create_plot(ContourLinePlot, simplify_tolerance=0.5)
+        gc = PlotGraphicsContext((120, 80))
+        gc.render_component(plot)
+        key = (plot._data_version, (0.0,))
+        straces = plot._cached_screen_contours[key]
+
+        plot.index_mapper.range.set_bounds((-1.69, -0.81), (2.31, 1.19))
+        gc.render_component(plot)
+
+        # The cached contours are only moved
+        self.assertIs(plot._cached_screen_contours[key], straces)
+        panned = PlotGraphicsContext((120, 80))
+        panned.render_component(plot)
+        plot._cached_screen_contours = {}
+        plot._screen_scale = None
+        plot._screen_cache_valid = False
+        remapped = PlotGraphicsContext((120, 80))
+        remapped.render_component(plot)
+        self.assertLess(
+            np.abs(
+                panned.bmp_array.astype(int) - remapped.bmp_array
+            ).max(),
+            2,
+        )
@@ -205,6 +205,61 @@ class TestResultImage(unittest.TestCase):
         self.assertEqual(type(screen_pt), np.ndarray)
         self.assertEqual(screen_pt.shape, (0, 2))
 
+    def test_pyramid_level(self):
+        # A 4x magnified image, drawn at its original size, is drawn from
+        # level 2 of its pyramid.
+        for origin, expected in [
+            ("top left", IMAGE),
+            ("bottom left", IMAGE[::-1]),
+            ("top right", IMAGE[:, ::-1]),
+            ("bottom right", IMAGE[::-1, ::-1]),
+        ]:
+            large = np.repeat(np.repeat(RGB, 4, axis=0), 4, axis=1)
+            data_source = ImageData(data=large, use_pyramid=True)
+            index, index_mapper = get_image_index_and_mapper(large)
+            renderer = ImagePlot(
+                value=data_source,
+                index=index,
+                index_mapper=index_mapper,
+                origin=origin,
+            )
+            renderer.bounds = (IMAGE.shape[1] + 1, IMAGE.shape[0] + 1)
+            renderer.position = 0, 0
+
+            self.assertEqual(renderer._calc_pyramid_level(), 2)
+            with temp_image_file() as filename:
+                save_renderer_result(renderer, filename)
+                image_result = ImageData.fromfile(filename).data
+            self.assertEqual(renderer._cached_image.bmp_array.shape, RGB.shape)
+            rms = calculate_rms(image_result[TRIM_RENDERED], expected)
+            self.assertLess(rms, MAX_RMS_ERROR)
+
+    def test_pyramid_level_zoomed(self):
+        large = np.repeat(np.repeat(RGB, 4, axis=0), 4, axis=1)
+        data_source = ImageData(data=large, use_pyramid=True)
+        index, index_mapper = get_image_index_and_mapper(large)
+        renderer = ImagePlot(
+            value=data_source,
+            index=index,
+            index_mapper=index_mapper,
+            bounds=(100, 100),
+        )
+        self.assertEqual(renderer._calc_pyramid_level(), 2)
+
+        index_mapper.range.set_bounds((101, 1), (301, 401))
+        self.assertEqual(renderer._calc_pyramid_level(), 1)
+        bounds_0, screen_rect_0 = renderer._calc_visible_bounds(0)
+        bounds_1, screen_rect_1 = renderer._calc_visible_bounds(1)
+        # whole pixels of level 1 covering the same region are shown
+        for low_0, low_1 in zip(bounds_0[0::2], bounds_1[0::2]):
+            self.assertIn(low_0 - 2 * low_1, (0, 1))
+        for high_0, high_1 in zip(bounds_0[1::2], bounds_1[1::2]):
+            self.assertIn(2 * high_1 - high_0, (0, 1))
+        self.assertLess(screen_rect_1[0], screen_rect_0[0])
+
+        index_mapper.range.set_bounds((101, 0), (151, 50))
+        self.assertEqual(renderer._calc_pyramid_level(), 0)
+
     # regression test for enthought/chaco#528
     @unittest.skipIf(is_null, "Skip on 'null' toolkit")
     def test_resize_to_zero(self):
@@ -0,0 +1,189 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+import unittest
+
+import numpy as np
+
+from chaco.api import create_line_plot, PlotGraphicsContext
+from chaco.downsample.pyramid import MinMaxPyramid
+
+
+class LinePlotDownsamplingTestCase(unittest.TestCase):
+    def create_plot(self, **traits):
+        x = np.linspace(0.0, 10.0, 10000)
+        y = np.sin(x)
+        y[5000] = 5.0
+        plot = create_line_plot(
+            (x, y), index_sort="ascending", use_downsampling=True, **traits
+        )
+        plot.outer_bounds = [100, 50]
+        plot.do_layout(force=True)
+        return plot
+
+    def test_downsampling_methods(self):
+        for method in ("lttb", "m4", "decimate"):
+            plot = self.create_plot(downsampling_method=method)
+
+            points = plot.get_screen_points()
+
+            self.assertEqual(len(points), 1)
+            self.assertLess(len(points[0]), 4 * 100)
+
+            gc = PlotGraphicsContext((100, 50))
+            gc.render_component(plot)
+
+    def test_m4_keeps_spike(self):
+        plot = self.create_plot(downsampling_method="m4")
+
+        points = plot.get_screen_points()
+
+        self.assertAlmostEqual(
+            points[0][:, 1].max(), plot.value_mapper.high_pos
+        )
+
+    def test_method_changed_invalidates_screen_cache(self):
+        plot = self.create_plot(downsampling_method="m4")
+        m4_points = plot.get_screen_points()
+
+        plot.downsampling_method = "decimate"
+
+        self.assertNotEqual(len(plot.get_screen_points()[0]),
+                            len(m4_points[0]))
+
+
+class LinePlotPyramidTestCase(unittest.TestCase):
+    def test_zoomed_out_uses_pyramid(self):
+        x = np.arange(100000.0)
+        y = np.zeros(100000)
+        y[54321] = 5.0
+        plot = create_line_plot(
+            (x, y), index_sort="ascending", use_pyramid=True
+        )
+        plot.outer_bounds = [100, 50]
+        plot.do_layout(force=True)
+
+        plot._gather_points()
+
+        points = plot._cached_data_pts
+        self.assertEqual(len(points), 1)
+        self.assertLess(len(points[0]), 4 * 2 * 100 + 4)
+        self.assertIn(54321, points[0][:, 0])
+
+    def test_uneven_index_keeps_sparse_points(self):
+        # 500 points on the left half and 100000 on the right half
+        x = np.concatenate(
+            [np.linspace(0.0, 50.0, 500, endpoint=False),
+             np.linspace(50.0, 100.0, 100000)]
+        )
+        y = np.sin(x)
+        plot = create_line_plot(
+            (x, y), index_sort="ascending", use_pyramid=True
+        )
+        plot.outer_bounds = [100, 50]
+        plot.do_layout(force=True)
+
+        plot._gather_points()
+
+        points = plot._cached_data_pts[0]
+        np.testing.assert_array_equal(points[:500, 0], x[:500])
+        self.assertLess(len(points), 500 + 4 * 2 * 50 + 4)
+
+    def test_zoomed_in_uses_data(self):
+        x = np.arange(100000.0)
+        y = np.zeros(100000)
+        plot = create_line_plot(
+            (x, y), index_sort="ascending", use_pyramid=True
+        )
+        plot.outer_bounds = [100, 50]
+        plot.do_layout(force=True)
+        plot.index_range.set_bounds(1000.0, 1010.0)
+
+        plot._gather_points()
+
+        # the visible points plus a neighbour on either side
+        self.assertEqual(len(plot._cached_data_pts[0]), 13)
+
+    def test_data_changed_rebuilds_pyramid(self):
+        plot = create_line_plot(
+            (np.arange(10000.0), np.zeros(10000)),
+            index_sort="ascending",
+            use_pyramid=True,
+        )
+
+        plot.value.set_data(np.ones(10000))
+
+        self.assertIsNotNone(plot._pyramid)
+        self.assertEqual(plot._pyramid.size, 10000)
+
+    def test_append_extends_pyramid(self):
+        plot = create_line_plot(
+            (np.arange(10000.0), np.zeros(10000)),
+            index_sort="ascending",
+            use_pyramid=True,
+        )
+        pyramid = plot._pyramid
+
+        plot.index.append(np.arange(10000.0, 10100.0))
+        plot.value.append(np.ones(100))
+
+        self.assertIs(plot._pyramid, pyramid)
+        self.assertEqual(pyramid.size, 10100)
+        expected = MinMaxPyramid(plot.value.get_data())
+        for level, argmax in enumerate(expected._argmax):
+            np.testing.assert_array_equal(pyramid._argmax[level], argmax)
+
+    def test_append_nan_drops_pyramid(self):
+        plot = create_line_plot(
+            (np.arange(10.0), np.zeros(10)),
+            index_sort="ascending",
+            use_pyramid=True,
+        )
+        plot.index.append([10.0])
+        plot.value.append([np.nan])
+        self.assertIsNone(plot._pyramid)
+
+
+class LinePlotSortedIndexTestCase(unittest.TestCase):
+    def create_plot(self, x):
+        plot = create_line_plot((x, np.zeros(len(x))), index_sort="ascending")
+        plot.outer_bounds = [100, 50]
+        plot.do_layout(force=True)
+        plot.index_range.set_bounds(20.0, 80.0)
+        plot.value_range.set_bounds(-1.0, 1.0)
+        return plot
+
+    def test_nan_in_sorted_index(self):
+        x = np.arange(100.0)
+        x[[10, 50, 51]] = np.nan
+        plot = self.create_plot(x)
+
+        plot._gather_points()
+
+        points = plot._cached_data_pts
+        self.assertEqual(len(points), 2)
+        np.testing.assert_array_equal(points[0][:, 0], np.arange(19.0, 50.0))
+        np.testing.assert_array_equal(points[1][:, 0], np.arange(52.0, 82.0))
+
+    def test_append_nan_to_sorted_index(self):
+        plot = self.create_plot(np.arange(100.0))
+        plot._gather_points()
+
+        self.assertTrue(plot._index_nan_free)
+
+        plot.index.append([np.nan, 101.0])
+        plot.value.append([0.0, 0.0])
+        self.assertFalse(plot._index_nan_free)
+        plot.index_range.set_bounds(20.0, 110.0)
+        plot._gather_points()
+
+        points = plot._cached_data_pts
+        self.assertEqual(len(points), 2)
+        np.testing.assert_array_equal(points[1][:, 0], [101.0])
@@ -0,0 +1,280 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+import unittest
+from unittest import mock
+
+from numpy import alltrue, arange, array, nan, random, zeros
+from numpy.testing import assert_array_equal
+
+from chaco.api import ArrayDataSource, PlotGraphicsContext, create_scatter_plot
+from chaco.plots.scatterplot import bucket_marker_sizes, render_markers
+
+
+class ScatterPlotGatherPointsTestCase(unittest.TestCase):
+    def setUp(self):
+        index = arange(10.0)
+        value = arange(10.0) * 2
+        value[3] = nan
+        self.plot = create_scatter_plot((index, value))
+        self.plot.index_range.set_bounds(1.0, 8.0)
+
+    def test_gather_points(self):
+        self.plot._gather_points()
+
+        assert_array_equal(
+            self.plot._cached_data_pts[:, 0], [1, 2, 4, 5, 6, 7, 8]
+        )
+        assert_array_equal(
+            self.plot._cached_point_mask.nonzero()[0], [1, 2, 4, 5, 6, 7, 8]
+        )
+        # the data sources have an empty list of selections by default
+        self.assertEqual(len(self.plot._cached_selected_pts), 0)
+
+    def test_selection_masks(self):
+        first = zeros(10, dtype=bool)
+        first[[0, 2, 3, 5, 6]] = True
+        second = zeros(10, dtype=bool)
+        second[[2, 3, 6]] = True
+        self.plot.index.metadata["selection_masks"] = [first, second]
+
+        self.plot._gather_points()
+
+        # Only the selected points which are drawn
+        assert_array_equal(self.plot._cached_selected_pts, [[2, 4], [6, 12]])
+        assert_array_equal(
+            self.plot._cached_selection_point_mask.nonzero()[0], [2, 6]
+        )
+
+    def test_selections(self):
+        self.plot.index.metadata["selections"] = [0, 3, 5]
+
+        self.plot._gather_points()
+
+        # All the selected points, drawn or not
+        assert_array_equal(
+            self.plot._cached_selected_pts, [[0, 0], [3, nan], [5, 10]]
+        )
+        assert_array_equal(
+            self.plot._cached_selection_point_mask, [False, False, True]
+        )
+
+    def test_index_selection_takes_precedence(self):
+        self.plot.index.metadata["selections"] = [5]
+        self.plot.value.metadata["selections"] = [6]
+
+        self.plot._gather_points()
+
+        assert_array_equal(self.plot._cached_selected_pts, [[5, 10]])
+
+    def test_invalid_selection_ignored(self):
+        self.plot.index.metadata["selection_masks"] = [zeros(3, dtype=bool)]
+        self.plot.value.metadata["selections"] = [4, 20]
+        self.plot._gather_points()
+        self.assertIsNone(self.plot._cached_selected_pts)
+
+        # the value's selection is used when the index's is invalid
+        self.plot._selection_cache_valid = False
+        self.plot.value.metadata["selections"] = array([4])
+        self.plot._gather_points()
+        assert_array_equal(self.plot._cached_selected_pts, [[4, 8]])
+
+
+class BucketMarkerSizesTestCase(unittest.TestCase):
+    def test_exact_sizes(self):
+        sizes, indices = bucket_marker_sizes(array([2.0, 5.0, 2.0, 3.0, 5.0]))
+
+        assert_array_equal(sizes, [5.0, 3.0, 2.0])
+        self.assertEqual(len(indices), 3)
+        assert_array_equal(indices[0], [1, 4])
+        assert_array_equal(indices[1], [3])
+        assert_array_equal(indices[2], [0, 2])
+
+    def test_tolerance(self):
+        sizes, indices = bucket_marker_sizes(
+            array([2.1, 4.9, 1.9, 3.2, 5.0]), tolerance=1.0
+        )
+
+        assert_array_equal(sizes, [5.0, 3.0, 2.0])
+        assert_array_equal(indices[0], [1, 4])
+        assert_array_equal(indices[1], [3])
+        assert_array_equal(indices[2], [0, 2])
+
+    def test_empty(self):
+        sizes, indices = bucket_marker_sizes(array([]))
+
+        self.assertEqual(len(sizes), 0)
+        self.assertEqual(len(indices), 0)
+
+
+class RenderMarkersTestCase(unittest.TestCase):
+    def setUp(self):
+        self.points = array([[0.0, 0.0], [1.0, 1.0], [2.0, 2.0], [3.0, 3.0]])
+        # A GC which only has the batch routine for kiva markers
+        self.gc = mock.MagicMock(
+            spec=[
+                "__enter__",
+                "__exit__",
+                "begin_path",
+                "draw_marker_at_points",
+                "set_fill_color",
+                "set_line_dash",
+                "set_line_width",
+                "set_stroke_color",
+            ]
+        )
+        self.gc.draw_marker_at_points.return_value = 1
+
+    def draw_calls(self):
+        return [
+            (call[0][0].tolist(), call[0][1])
+            for call in self.gc.draw_marker_at_points.call_args_list
+        ]
+
+    def test_scalar_size(self):
+        render_markers(
+            self.gc, self.points, "square", 3.0, (0, 0, 0), 1.0, (0, 0, 0)
+        )
+
+        self.assertEqual(self.draw_calls(), [(self.points.tolist(), 3.0)])
+
+    def test_sizes_drawn_in_batches(self):
+        render_markers(
+            self.gc,
+            self.points,
+            "square",
+            array([2.0, 4.0, 2.0, 4.0]),
+            (0, 0, 0),
+            1.0,
+            (0, 0, 0),
+        )
+
+        self.assertEqual(
+            self.draw_calls(),
+            [
+                ([[1.0, 1.0], [3.0, 3.0]], 4.0),
+                ([[0.0, 0.0], [2.0, 2.0]], 2.0),
+            ],
+        )
+
+    def test_sizes_with_point_mask(self):
+        render_markers(
+            self.gc,
+            self.points[1:],
+            "square",
+            array([1.0, 2.0, 4.0, 2.0, 4.0]),
+            (0, 0, 0),
+            1.0,
+            (0, 0, 0),
+            point_mask=array([False, True, True, False, True]),
+            size_tolerance=1.0,
+        )
+
+        self.assertEqual(
+            self.draw_calls(),
+            [
+                ([[2.0, 2.0], [3.0, 3.0]], 4.0),
+                ([[1.0, 1.0]], 2.0),
+            ],
+        )
+
+    def test_sizes_not_matching_point_mask(self):
+        # Sizes which don't match the mask are used as they are, for as many
+        # points as there are sizes.
+        render_markers(
+            self.gc,
+            self.points,
+            "square",
+            array([2.0, 4.0, 2.0]),
+            (0, 0, 0),
+            1.0,
+            (0, 0, 0),
+            point_mask=array([True, False, True, True, True]),
+        )
+
+        self.assertEqual(
+            self.draw_calls(),
+            [
+                ([[1.0, 1.0]], 4.0),
+                ([[0.0, 0.0], [2.0, 2.0]], 2.0),
+            ],
+        )
+
+    def test_render_sizes_not_matching_data(self):
+        plot = create_scatter_plot(
+            (arange(100.0), arange(100.0)), marker_size=arange(50.0)
+        )
+        plot.bounds = [100, 100]
+        gc = PlotGraphicsContext((100, 100))
+
+        gc.render_component(plot)
+
+
+class ScatterPlotDensityTestCase(unittest.TestCase):
+    def setUp(self):
+        rs = random.RandomState(0)
+        self.index = rs.uniform(0.0, 10.0, 20000)
+        self.value = rs.uniform(0.0, 10.0, 20000)
+        self.plot = create_scatter_plot(
+            (self.index, self.value), border_visible=False
+        )
+        self.plot.index_range.set_bounds(0.0, 10.0)
+        self.plot.value_range.set_bounds(0.0, 10.0)
+        self.plot.outer_bounds = [50, 50]
+        self.gc = PlotGraphicsContext((50, 50))
+
+    def test_density(self):
+        self.plot.render_mode = "density"
+        self.gc.render_component(self.plot)
+
+        actual = self.gc.bmp_array[:, :, :]
+        self.assertFalse(alltrue(actual == 255))
+        # The points in view cover the 49 x 49 pixels between the bounds
+        counts = self.plot.density_data_source.get_data()
+        self.assertEqual(counts.sum(), 20000)
+        self.assertEqual(len(counts), 49 * 49)
+
+    def test_bin_size(self):
+        self.plot.render_mode = "density"
+        self.plot.density_bin_size = 5.0
+        self.gc.render_component(self.plot)
+
+        counts = self.plot.density_data_source.get_data()
+        self.assertEqual(counts.sum(), 20000)
+        self.assertEqual(len(counts), 10 * 10)
+        self.assertEqual(self.plot._density_shape(), (10, 10))
+
+    def test_max(self):
+        self.plot.render_mode = "density"
+        self.plot.density_reduction = "max"
+        values = zeros(20000)
+        values[::2] = 1.0
+        values[0] = 2.0
+        self.plot.density_data = ArrayDataSource(values)
+        self.gc.render_component(self.plot)
+
+        bins = self.plot.density_data_source.get_data()
+        self.assertEqual(len(bins), 49 * 49)
+        self.assertEqual(bins.max(), 2.0)
+        self.assertEqual((bins == 2.0).sum(), 1)
+
+    def test_auto(self):
+        self.plot.render_mode = "auto"
+        with mock.patch.object(
+            self.plot, "_render_density", wraps=self.plot._render_density
+        ) as render_density:
+            self.gc.render_component(self.plot)
+            self.assertEqual(render_density.call_count, 1)
+
+            # Zooming in shows the markers again
+            self.plot.index_range.set_bounds(0.0, 1.0)
+            self.plot.value_range.set_bounds(0.0, 1.0)
+            self.gc.render_component(self.plot)
+            self.assertEqual(render_density.call_count, 1)
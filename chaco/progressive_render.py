@@ -0,0 +1,143 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+""" Defines the ProgressiveRender class.
+"""
+
+from numpy import around, clip, divide
+
+from .plot_graphics_context import PlotGraphicsContext
+
+
+class ProgressiveRender(object):
+    """An off-screen bitmap of a renderer which is drawn one chunk at a time
+
+    The chunks are drawn onto a transparent bitmap, which is then drawn over
+    the layers below the renderer, so that a renderer can be drawn with the
+    chunks drawn so far while the others are still waiting.
+
+    Parameters
+    ----------
+    key : hashable
+        Identifies what is drawn: the renderer starts over when it changes.
+    rect : tuple of float
+        The x, y, width and height of the area drawn.
+    pixel_scale : float
+        The number of pixels per unit of the area drawn.
+    chunks : list
+        The chunks to draw, in order.
+    coarse : object
+        An approximation of the whole drawing, which is drawn below the
+        bitmap until all the chunks are drawn, or None.
+    """
+
+    def __init__(self, key, rect, pixel_scale, chunks, coarse=None):
+        self.key = key
+        self.chunks = chunks
+        self.coarse = coarse
+        self.n_drawn = 0
+
+        x, y, width, height = rect
+        self._position = (x, y)
+        self._size = (width, height)
+        self._pixel_scale = pixel_scale
+        self._bitmap = self._new_bitmap()
+        self._image = self._new_bitmap()
+        self._coarse_image = None
+
+    @property
+    def progress(self):
+        """The fraction of the chunks drawn"""
+        return self.n_drawn / len(self.chunks)
+
+    @property
+    def finished(self):
+        """Whether all the chunks are drawn"""
+        return self.n_drawn == len(self.chunks)
+
+    def draw_coarse(self, render_chunk):
+        """Draws the coarse chunk, if any, onto a bitmap of its own
+
+        Parameters
+        ----------
+        render_chunk : callable
+            Called as ``render_chunk(gc, chunk, last)`` to draw the chunk.
+        """
+        if self.coarse is None:
+            return
+        bitmap = self._new_bitmap()
+        render_chunk(bitmap, self.coarse, False)
+        self._coarse_image = self._new_bitmap()
+        self._update_image(bitmap, self._coarse_image)
+
+    def draw_next_chunk(self, render_chunk):
+        """Draws the next chunk onto the bitmap
+
+        Parameters
+        ----------
+        render_chunk : callable
+            Called as ``render_chunk(gc, chunk, last)`` to draw the chunk,
+            where ``last`` is True for the last chunk.
+        """
+        chunk = self.chunks[self.n_drawn]
+        self.n_drawn += 1
+        render_chunk(self._bitmap, chunk, self.finished)
+        self._update_image(self._bitmap, self._image)
+
+    def draw(self, gc):
+        """Draws the chunks drawn so far, over the coarse chunk until all
+        the chunks are drawn.
+        """
+        images = [self._image]
+        if not self.finished and self._coarse_image is not None:
+            images.insert(0, self._coarse_image)
+
+        # The pixels of the bitmap are offset by half a pixel, like those of
+        # the graphics context, so that they line up exactly.
+        x, y = self._position
+        pixel_scale = self._pixel_scale
+        with gc:
+            gc.set_image_interpolation("nearest")
+            for image in images:
+                gc.draw_image(
+                    image,
+                    (
+                        x - 0.5 / pixel_scale,
+                        y - 0.5 / pixel_scale,
+                        image.width() / pixel_scale,
+                        image.height() / pixel_scale,
+                    ),
+                )
+
+    def _new_bitmap(self):
+        """A transparent bitmap of the area drawn"""
+        x, y = self._position
+        bitmap = PlotGraphicsContext(
+            self._size, dpi=72.0 * self._pixel_scale
+        )
+        bitmap.clear((0.0, 0.0, 0.0, 0.0))
+        bitmap.translate_ctm(-x, -y)
+        return bitmap
+
+    def _update_image(self, bitmap, image):
+        """Copies a bitmap to the image which is drawn"""
+        # Blending onto a transparent bitmap leaves colors premultiplied by
+        # their alpha, but images are drawn as if they were not.
+        pixels = bitmap.bmp_array
+        alpha = pixels[..., 3:]
+        colors = image.bmp_array
+        colors[..., 3:] = alpha
+        straight = divide(
+            pixels[..., :3] * 255.0,
+            alpha,
+            out=pixels[..., :3].astype(float),
+            where=alpha > 0,
+        )
+        colors[..., :3] = clip(around(straight), 0, 255)
@@ -0,0 +1,457 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+""" Defines the RingBufferDataSource and MultiRingBufferDataSource classes,
+fixed-capacity data sources for rolling, real-time plots.
+"""
+
+# Major library imports
+from numpy import (
+    arange,
+    asarray,
+    ascontiguousarray,
+    empty,
+    fmax,
+    fmin,
+    inf,
+    int64,
+    integer,
+    isnan,
+    minimum,
+    nan,
+    searchsorted,
+)
+
+# Enthought library imports
+from traits.api import Any, Instance, Int, List
+
+# Chaco imports
+from .array_data_source import (
+    ArrayDataSource,
+    bounded_nanargmax,
+    bounded_nanargmin,
+)
+from .multi_array_data_source import MultiArrayDataSource
+
+
+class RingBufferDataSource(ArrayDataSource):
+    """A data source holding the most recent values pushed into it, up to a
+    fixed capacity.
+
+    New values are pushed with :meth:`push`, which discards the oldest values
+    once the capacity is reached.  The values are stored in a buffer of twice
+    the capacity and get_data() returns a contiguous view of it, so neither
+    pushing nor getting the data copies the values in the window: the window
+    only has to be moved back to the start of the buffer after the capacity's
+    worth of values has been pushed.
+
+    The bounds are maintained with monotonic deques of the extrema of blocks
+    of values, so that pushing values only examines the new values and the
+    blocks at either end of the window.
+
+    The arrays returned by get_data() are views of the buffer, and are only
+    valid until the next push.
+    """
+
+    #: The maximum number of values held.  Set when the data source is
+    #: created.
+    capacity = Int(1024)
+
+    # ------------------------------------------------------------------------
+    # Private traits
+    # ------------------------------------------------------------------------
+
+    # The buffer which the data is a view of.
+    _storage = Any
+
+    # The position in the buffer after the last value.
+    _end = Int(0)
+
+    # The number of values pushed since the data was last set.
+    _total = Int(0)
+
+    # The number of blocks of values whose extrema have been pushed into the
+    # deques.
+    _n_blocks = Int(0)
+
+    # The candidate blocks for the minimum and maximum values of the window.
+    _min_deque = Any
+    _max_deque = Any
+
+    def __init__(self, capacity=1024, dtype=float, sort_order="none", **kw):
+        # The storage may be shared with a MultiRingBufferDataSource.
+        if "_storage" not in kw:
+            kw["_storage"] = empty(2 * capacity, dtype=dtype)
+        super().__init__(
+            data=kw["_storage"][:0],
+            sort_order=sort_order,
+            capacity=capacity,
+            **kw
+        )
+
+    def set_data(self, newdata, sort_order=None):
+        """Replaces the data with the last **capacity** values of *newdata*.
+
+        Parameters
+        ----------
+        newdata : array
+            The data to use.
+        sort_order : SortOrderTrait
+            The sort order of the data
+        """
+        if sort_order is not None:
+            self.sort_order = sort_order
+        self._data = self._storage[:0]
+        self._end = 0
+        self._total = 0
+        self._cached_mask = None
+        self._reset_deques()
+        self._push(newdata)
+        self.data_changed = True
+
+    def push(self, values):
+        """Adds values after the most recent ones, discarding the oldest
+        values beyond the capacity.
+
+        Any mask is removed.
+
+        Parameters
+        ----------
+        values : array
+            The values to add, oldest first.
+        """
+        if len(values) == 0:
+            return
+        self._cached_mask = None
+        self._push(values)
+        self.data_changed = True
+
+    def append(self, values):
+        """Adds values after the most recent ones; the same as push()."""
+        self.push(values)
+
+    # ------------------------------------------------------------------------
+    # Private methods
+    # ------------------------------------------------------------------------
+
+    def _push(self, values):
+        values = asarray(values)
+        storage = self._storage
+        capacity = self.capacity
+        size = len(self._data)
+        n_values = len(values)
+
+        if n_values >= capacity:
+            storage[:capacity] = values[-capacity:]
+            self._end = size = capacity
+        else:
+            if self._end + n_values > len(storage):
+                # Move the values which stay in the window to the start of
+                # the buffer to make room after them.
+                kept = min(size, capacity - n_values)
+                storage[:kept] = storage[self._end - kept:self._end]
+                self._end = size = kept
+            storage[self._end:self._end + n_values] = values
+            self._end += n_values
+            size = min(size + n_values, capacity)
+
+        self._total += n_values
+        self._data = storage[self._end - size:self._end]
+        self._update_bounds()
+
+    def _reset_deques(self):
+        self._n_blocks = 0
+        self._min_deque = _BlockDeque()
+        self._max_deque = _BlockDeque()
+
+    def _update_bounds(self):
+        """Updates the bounds after values were pushed."""
+        data = self._data
+        size = len(data)
+        if size == 0:
+            self._min_index = 0
+            self._max_index = 0
+            self._cached_bounds = (0.0, 0.0)
+            return
+        if self.sort_order != "none" or data.dtype.kind not in "iuf":
+            # The bounds of sorted data are its ends, and the bounds of
+            # non-numeric data are not meaningful.
+            super()._compute_bounds(data)
+            return
+
+        # Positions count the values pushed since the data was set, and the
+        # window holds the positions from first to total.
+        total = self._total
+        first = total - size
+        first_block = -(-first // _BLOCK_SIZE)
+        end_block = total // _BLOCK_SIZE
+
+        # Push the extrema of the blocks which were completed.
+        start_block = max(self._n_blocks, first_block)
+        if end_block > start_block:
+            values = data[start_block * _BLOCK_SIZE - first:
+                          end_block * _BLOCK_SIZE - first]
+            starts = arange(0, len(values), _BLOCK_SIZE)
+            values = values.astype(float, copy=False)
+            self._min_deque.push(start_block, fmin.reduceat(values, starts))
+            self._max_deque.push(start_block, -fmax.reduceat(values, starts))
+        self._n_blocks = max(self._n_blocks, end_block)
+        self._min_deque.expire(first_block)
+        self._max_deque.expire(first_block)
+
+        # The extremes are in the incomplete block at the start of the window,
+        # the best complete block, or the incomplete block at the end.
+        head_end = min(first_block * _BLOCK_SIZE, total) - first
+        tail_start = max(end_block * _BLOCK_SIZE, first_block * _BLOCK_SIZE)
+        tail_start -= first
+        min_index = max_index = None
+        for start, end in ((0, head_end),
+                           self._deque_span(self._min_deque, first),
+                           (tail_start, size)):
+            if end > start:
+                i = start + _nanargmin(data[start:end])
+                if (
+                    min_index is None
+                    or data[i] < data[min_index]
+                    or isnan(data[min_index])
+                ):
+                    min_index = i
+        for start, end in ((0, head_end),
+                           self._deque_span(self._max_deque, first),
+                           (tail_start, size)):
+            if end > start:
+                i = start + _nanargmax(data[start:end])
+                if (
+                    max_index is None
+                    or data[i] > data[max_index]
+                    or isnan(data[max_index])
+                ):
+                    max_index = i
+
+        # A NaN extreme is replaced by any later value, so it only remains if
+        # all the values are NaN, as with ArrayDataSource.
+        self._min_index = min_index
+        self._max_index = max_index
+        self._cached_bounds = (data[min_index], data[max_index])
+
+    def _deque_span(self, deque, first):
+        """The span of the data in the best block of *deque*, or an empty
+        span.
+        """
+        block = deque.first_block()
+        if block is None:
+            return (0, 0)
+        return (block * _BLOCK_SIZE - first, (block + 1) * _BLOCK_SIZE - first)
+
+    def _compute_bounds(self, data=None):
+        """Recomputes the bounds of the whole window."""
+        if data is not None:
+            # The bounds of other data, for subclasses.
+            return super()._compute_bounds(data)
+        self._reset_deques()
+        self._update_bounds()
+
+    def _sort_order_changed(self):
+        if self._data is not None:
+            self._compute_bounds()
+
+
+class MultiRingBufferDataSource(MultiArrayDataSource):
+    """A data source holding the most recent rows of several channels pushed
+    into it, up to a fixed capacity.
+
+    The data has one row per channel, so that each channel is contiguous in
+    memory.  The data source for each channel is available as a
+    :class:`RingBufferDataSource` in **column_sources**, which can be used as
+    the value of a LinePlot.  All of them share the same storage, so pushing
+    copies each value once.
+    """
+
+    #: The dimensionality of the indices into this data source (overrides
+    #: MultiArrayDataSource).
+    index_dimension = Int(1)
+
+    #: The dimensionality of the value at each index point (overrides
+    #: MultiArrayDataSource).
+    value_dimension = Int(0)
+
+    #: The maximum number of values held for each channel.  Set when the data
+    #: source is created.
+    capacity = Int(1024)
+
+    #: The data source of each channel.
+    column_sources = List(Instance(RingBufferDataSource))
+
+    # ------------------------------------------------------------------------
+    # Private traits
+    # ------------------------------------------------------------------------
+
+    # The buffer which the data is a view of, with one row per channel.
+    _storage = Any
+
+    def __init__(self, capacity=1024, n_columns=1, dtype=float, **traits):
+        storage = empty((n_columns, 2 * capacity), dtype=dtype)
+        column_sources = [
+            RingBufferDataSource(capacity, _storage=storage[i])
+            for i in range(n_columns)
+        ]
+        super().__init__(
+            data=storage[:, :0],
+            capacity=capacity,
+            column_sources=column_sources,
+            _storage=storage,
+            **traits
+        )
+
+    def push(self, rows):
+        """Adds rows of values after the most recent ones, discarding the
+        oldest values beyond the capacity.
+
+        Parameters
+        ----------
+        rows : array
+            The values to add as an array with one row per sample, oldest
+            first, and one column per channel.
+
+        Raises
+        ------
+        ValueError
+            If *rows* is not 2 dimensional with one column per channel.
+        """
+        rows = asarray(rows)
+        n_columns = len(self.column_sources)
+        if rows.ndim != 2 or rows.shape[1] != n_columns:
+            msg = (
+                "Rows of shape %s were pushed, but they must have one column "
+                "for each of the %d channels." % (rows.shape, n_columns)
+            )
+            raise ValueError(msg)
+        if len(rows) == 0:
+            return
+        # Transpose once so that each channel is read contiguously.
+        columns = ascontiguousarray(rows.T)
+        for source, column in zip(self.column_sources, columns):
+            source.push(column)
+        first = self.column_sources[0]
+        self._set_data(self._storage[:, first._end - len(first._data):
+                                     first._end])
+        self.data_changed = True
+
+    def get_bounds(self, value=None, index=None):
+        """Returns the minimum and maximum values of the data, or of a
+        channel if *value* is given.
+
+        Overrides MultiArrayDataSource to use the bounds maintained by the
+        channels.
+        """
+        if isinstance(value, (int, integer)):
+            return self.column_sources[value].get_bounds()
+        elif index is not None or self._data.shape[1] == 0:
+            return super().get_bounds(value, index)
+
+        bounds = [
+            source.get_bounds()
+            for source in self.column_sources
+            if not isnan(source.get_bounds()[0])
+        ]
+        if len(bounds) == 0:
+            return (nan, nan)
+        return (min(low for low, high in bounds),
+                max(high for low, high in bounds))
+
+
+def _nanargmin(values):
+    """The position of the minimum of numerical values, ignoring NaNs."""
+    i = values.argmin()
+    if isnan(values[i]):
+        # argmin finds the first NaN, so leave it to NumPy to skip them.
+        return bounded_nanargmin(values)
+    return i
+
+
+def _nanargmax(values):
+    """The position of the maximum of numerical values, ignoring NaNs."""
+    i = values.argmax()
+    if isnan(values[i]):
+        return bounded_nanargmax(values) % len(values)
+    return i
+
+
+#: The number of values summarized by each element of the deques.
+_BLOCK_SIZE = 256
+
+
+class _BlockDeque(object):
+    """A monotonic deque of the blocks which can hold the minimum of a
+    sliding window.
+
+    A block can only hold the minimum of the window if its minimum is smaller
+    than the minimum of every block after it, so the candidates have
+    increasing block numbers and strictly increasing minima, and the first
+    candidate which has not left the window holds the minimum of its complete
+    blocks.  Several blocks are pushed at once, so the candidates are kept in
+    arrays rather than a collections.deque.  Blocks of NaN values are never
+    candidates.
+    """
+
+    def __init__(self):
+        self._blocks = empty(16, dtype=int64)
+        self._minima = empty(16)
+        self._head = 0
+        self._tail = 0
+
+    def push(self, first_block, minima):
+        """Adds the minima of the consecutive blocks from *first_block*."""
+        minima = minima.copy()
+        minima[isnan(minima)] = inf
+        later = empty(len(minima))
+        later[-1] = inf
+        later[:-1] = minimum.accumulate(minima[:0:-1])[::-1]
+        candidates = (minima < later).nonzero()[0]
+        if len(candidates) == 0:
+            return
+        blocks = first_block + candidates
+        minima = minima[candidates]
+
+        # The old candidates which are not smaller than the minimum of the
+        # new blocks can't hold the minimum any more.
+        self._tail = self._head + searchsorted(
+            self._minima[self._head:self._tail], minima[0], "left"
+        )
+
+        count = self._tail - self._head
+        n_new = len(minima)
+        if self._tail + n_new > len(self._minima):
+            capacity = max(len(self._minima), 2 * (count + n_new))
+            new_blocks = empty(capacity, dtype=int64)
+            new_minima = empty(capacity)
+            new_blocks[:count] = self._blocks[self._head:self._tail]
+            new_minima[:count] = self._minima[self._head:self._tail]
+            self._blocks = new_blocks
+            self._minima = new_minima
+            self._head = 0
+            self._tail = count
+        self._blocks[self._tail:self._tail + n_new] = blocks
+        self._minima[self._tail:self._tail + n_new] = minima
+        self._tail += n_new
+
+    def expire(self, first_block):
+        """Removes the candidates before *first_block*."""
+        self._head += searchsorted(
+            self._blocks[self._head:self._tail], first_block, "left"
+        )
+
+    def first_block(self):
+        """The block holding the minimum, or None if there are no
+        candidates.
+        """
+        if self._head == self._tail:
+            return None
+        return self._blocks[self._head]
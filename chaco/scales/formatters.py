@@ -12,10 +12,21 @@
 Classes for formatting labels for values or times.
 """
 
-from math import ceil, floor, fmod, log10
+from collections import OrderedDict
+from math import ceil, fabs, floor, fmod, log10
 
+import numpy as np
 from numpy import abs, all, array, asarray, amax, amin
-from .safetime import strftime, time, safe_fromtimestamp, localtime
+from . import safetime
+from .safetime import (
+    strftime,
+    struct_time,
+    time,
+    safe_fromtimestamp,
+    localtime,
+    MINYEAR,
+    MAXYEAR,
+)
 import warnings
 
 
@@ -55,7 +66,20 @@ class BasicFormatter(object):
     # will be represented using scientific notiation.
     scientific_limits = (-3, 5)
 
+    # The number of most recently formatted lists of ticks whose labels are
+    # remembered.
+    label_cache_size = 256
+
+    # The average size of the labels of the ends of recent intervals, keyed
+    # by the formatter class and settings and by the interval.  It is shared
+    # by all the formatters, so that the scales of a scale system, which
+    # each have their own formatter, only format an interval once when they
+    # estimate their label widths for it.
+    _end_label_sizes = {}
+
     def __init__(self, **kwds):
+        # The most recently formatted labels, by settings and ticks
+        self._labels = OrderedDict()
         # Allow the user to override the class-level defaults.
         self.__dict__.update(kwds)
 
@@ -115,11 +139,35 @@ class BasicFormatter(object):
     def format(self, ticks, numlabels=None, char_width=None, fill_ratio=0.3):
         """Does "nice" formatting of floating-point numbers.  *numlabels* is
         ignored in this method.
+
+        The labels of recently formatted ticks are reused, which saves
+        formatting the same ticks again while a view is panned by less than
+        the distance between them.
         """
         if len(ticks) == 0:
             return []
 
         ticks = asarray(ticks)
+        key = (
+            self.use_scientific,
+            tuple(self.scientific_limits),
+            char_width,
+            fill_ratio,
+            ticks.dtype.str,
+            ticks.tobytes(),
+        )
+        labels = self._labels.get(key, None)
+        if labels is None:
+            labels = self._format_labels(ticks, char_width, fill_ratio)
+            self._labels[key] = labels
+            while len(self._labels) > self.label_cache_size:
+                self._labels.popitem(last=False)
+        else:
+            self._labels.move_to_end(key)
+        return list(labels)
+
+    def _format_labels(self, ticks, char_width, fill_ratio):
+        """Formats an array of ticks, as described in :meth:`format`."""
         if self.use_scientific:
             scientific = (
                 ((ticks % 10 ** self.scientific_limits[1]) == 0)
@@ -238,9 +286,7 @@ class BasicFormatter(object):
         if numlabels == 0 or char_width == 0:
             return 0, 0
 
-        # use the start and end points as ticks and average their label sizes
-        labelsizes = map(len, self.format([start, end]))
-        avg_size = sum(labelsizes) / 2.0
+        avg_size = self._end_label_size(start, end)
 
         if ticker:
             if numlabels:
@@ -259,6 +305,30 @@ class BasicFormatter(object):
         return est_ticks, est_ticks * avg_size
 
 
+    def _end_label_size(self, start, end):
+        """Returns the average size of the labels of the start and end of an
+        interval.
+        """
+        if type(self).format is not BasicFormatter.format:
+            # Other formats may depend on settings which aren't in the key.
+            return sum(map(len, self.format([start, end]))) / 2.0
+
+        key = (
+            type(self),
+            self.use_scientific,
+            tuple(self.scientific_limits),
+            start,
+            end,
+        )
+        size = self._end_label_sizes.get(key, None)
+        if size is None:
+            size = sum(map(len, self.format([start, end]))) / 2.0
+            if len(self._end_label_sizes) >= self.label_cache_size:
+                self._end_label_sizes.clear()
+            self._end_label_sizes[key] = size
+        return size
+
+
 class IntegerFormatter(BasicFormatter):
     """Format integer tick labels as integers."""
 
@@ -461,6 +531,42 @@ def _four_digit_year(t):
     return str(year)
 
 
+def _localtimes(ticks):
+    """Returns the :func:`localtime` of each of the ticks, computed together
+    with numpy.datetime64 arithmetic.
+
+    Returns None if some ticks can't be converted this way, in which case
+    they should be converted one at a time.
+    """
+    ticks = asarray(ticks, dtype=float)
+    if not (np.isfinite(ticks).all() and (np.abs(ticks) < 1e12).all()):
+        return None
+    # Like safe_fromtimestamp(), round to the microsecond
+    microseconds = np.round(ticks * 1e6).astype(np.int64)
+    dates = np.datetime64(safetime.EPOCH, "us") + microseconds.astype(
+        "timedelta64[us]"
+    )
+    years = dates.astype("datetime64[Y]")
+    months = dates.astype("datetime64[M]")
+    days = dates.astype("datetime64[D]")
+    year = years.astype(np.int64) + 1970
+    if ((year < MINYEAR) | (year > MAXYEAR)).any():
+        return None
+    month = (months - years.astype("datetime64[M]")).astype(np.int64) + 1
+    day = (days - months.astype("datetime64[D]")).astype(np.int64) + 1
+    seconds = (dates - days).astype("timedelta64[s]").astype(np.int64)
+    hour, seconds = np.divmod(seconds, 3600)
+    minute, second = np.divmod(seconds, 60)
+    # January 1st, 1970 was a Thursday
+    weekday = (days.astype(np.int64) + 3) % 7
+    yday = (days - years.astype("datetime64[D]")).astype(np.int64) + 1
+    fields = np.column_stack(
+        [year, month, day, hour, minute, second, weekday, yday,
+         np.full(len(ticks), -1)]
+    )
+    return [struct_time(tm) for tm in fields.tolist()]
+
+
 class TimeFormatter(object):
     """Formatter for time values."""
 
@@ -500,7 +606,18 @@ class TimeFormatter(object):
     # Whether or not to strip the leading zeros on tick labels.
     strip_leading_zeros = True
 
+    # The number of most recently formatted labels which are remembered.
+    label_cache_size = 1024
+
+    # The number of ticks from which their local times are computed together,
+    # which is slower for a few ticks.
+    min_batch_ticks = 64
+
     def __init__(self, **kwds):
+        # The resolution name and format widths for each tick resolution
+        self._resolution_widths = {}
+        # The most recently formatted labels, by format and tick
+        self._labels = OrderedDict()
         self.__dict__.update(kwds)
         self._compute_format_weights()
 
@@ -543,6 +660,23 @@ class TimeFormatter(object):
             resol = "years"
         return resol
 
+    def _get_resolution_widths(self, resolution, interval):
+        """Returns the name of the resolution of ticks with the given
+        resolution and span, and the widths of its formats as a tuple.
+
+        The results are cached per tick resolution, so that estimating the
+        width of the labels of each scale of a scale system is cheap.
+        """
+        # The name only depends on the span through these thresholds.
+        key = (resolution, interval > 60, interval > 3600)
+        result = self._resolution_widths.get(key, None)
+        if result is None:
+            resol = self._get_resolution(resolution, interval)
+            widths = tuple(int(width) for width in self.formats[resol][0])
+            result = (resol, widths)
+            self._resolution_widths[key] = result
+        return result
+
     def format(
         self,
         ticks,
@@ -583,18 +717,16 @@ class TimeFormatter(object):
             r = ticker.resolution
         else:
             r = span / (len(ticks) - 1)
-        resol = self._get_resolution(r, span)
+        resol, widths = self._get_resolution_widths(r, span)
 
-        widths, formats = self.formats[resol]
+        formats = self.formats[resol][1]
         format = formats[0]
         if char_width:
             # If a width is provided, then we pick the most appropriate scale,
             # otherwise just use the widest format
-            good_formats = array(formats)[
-                widths * len(ticks) < fill_ratio * char_width
-            ]
-            if len(good_formats) > 0:
-                format = good_formats[-1]
+            for width, fmt in zip(widths, formats):
+                if width * len(ticks) < fill_ratio * char_width:
+                    format = fmt
 
         # Apply the format to the tick values
         labels = []
@@ -621,9 +753,26 @@ class TimeFormatter(object):
         # from that resolution.  This is not the best heuristic in the world,
         # but it works!  There is some trickiness here due to having to deal
         # with hybrid formats in a reasonable manner.
-        for t in ticks:
+        #
+        # Labels which were formatted before are reused, and the local times
+        # of many ticks are computed together.
+        label_key = (safetime.EPOCH, resol, format, self.strip_leading_zeros)
+        localtimes = None
+        if len(ticks) >= self.min_batch_ticks:
+            localtimes = _localtimes(ticks)
+        for i, t in enumerate(ticks):
+            key = label_key + (t,)
+            label = self._labels.get(key, None)
+            if label is not None:
+                self._labels.move_to_end(key)
+                labels.append(label)
+                continue
+
             try:
-                tm = localtime(t)
+                if localtimes is None:
+                    tm = localtime(t)
+                else:
+                    tm = localtimes[i]
                 s = strftimeEx(format, t, tm)
             except ValueError as e:
                 warnings.warn("Unable to convert tick for timestamp " + str(t))
@@ -667,9 +816,11 @@ class TimeFormatter(object):
                 if ss != s and (ss == "" or not ss[0].isdigit()):
                     # A label such as '000ms' should leave one zero.
                     ss = "0" + ss
-                labels.append(ss)
-            else:
-                labels.append(s)
+                s = ss
+            labels.append(s)
+            self._labels[key] = s
+            while len(self._labels) > self.label_cache_size:
+                self._labels.popitem(last=False)
 
         return labels
 
@@ -713,28 +864,24 @@ class TimeFormatter(object):
         if not numlabels:
             numlabels = ticker.num_ticks(start, end)
 
-        span = abs(end - start)
+        span = fabs(end - start)
         if ticker:
             r = ticker.resolution
         else:
             r = span / numlabels
-        unit = self._get_resolution(r, span)
+        unit, widths = self._get_resolution_widths(r, span)
 
         if unit == "milliseconds":
             return numlabels, numlabels * 6
 
-        widths, strings = self.formats[unit]
-
         if char_width:
             # Find an appropriate resolution in self.formats and pick between
-            # the various format strings
-            good_widths = widths[widths * numlabels < fill_ratio * char_width]
-            if len(good_widths) == 0:
-                # All too big, pick the first label
-                width = widths[0]
-            else:
-                # Pick the largest label that fits
-                width = good_widths[-1]
+            # the various format strings.  If all are too big, pick the first
+            # label, otherwise pick the largest label that fits.
+            width = widths[0]
+            for fmt_width in widths:
+                if fmt_width * numlabels < fill_ratio * char_width:
+                    width = fmt_width
             width *= numlabels
         else:
             # Just pick the middle of the pack of format widths
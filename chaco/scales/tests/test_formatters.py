@@ -9,8 +9,17 @@
 # Thanks for using Enthought open source!
 
 import unittest
+from unittest import mock
 
-from chaco.scales.formatters import strftimeEx, TimeFormatter
+import numpy as np
+
+from chaco.scales import formatters
+from chaco.scales.formatters import (
+    BasicFormatter,
+    strftimeEx,
+    TimeFormatter,
+)
+from chaco.scales.time_scale import TimeScale
 
 
 # ----------------------------------------------------------------
@@ -87,6 +96,54 @@ class TestStrftimeEx(unittest.TestCase):
 # ----------------------------------------------------------------
 
 
+class TestBasicFormatter(unittest.TestCase):
+    def test_labels_cached(self):
+        formatter = BasicFormatter()
+        ticks = np.array([0.0, 2.5, 5.0, 7.5])
+        labels = formatter.format(ticks)
+        self.assertEqual(labels, ["0.0", "2.5", "5.0", "7.5"])
+
+        labels[0] = "changed"
+        with mock.patch.object(
+            formatter, "_format_labels", wraps=formatter._format_labels
+        ) as format_labels:
+            self.assertEqual(
+                formatter.format(ticks), ["0.0", "2.5", "5.0", "7.5"]
+            )
+            formatter.format(ticks.astype(int))
+
+        # Only the integer ticks are formatted
+        format_labels.assert_called_once()
+
+    def test_settings_change(self):
+        formatter = BasicFormatter()
+        ticks = [0.0, 1e5, 2e5]
+        self.assertEqual(formatter.format(ticks), ["0.0", "1.0e5", "2.0e5"])
+
+        formatter.use_scientific = False
+
+        self.assertEqual(formatter.format(ticks), ["0", "100000", "200000"])
+
+    def test_estimate_width_shared(self):
+        start, end = 0.125, 1000.375
+        expected = BasicFormatter().estimate_width(start, end, char_width=100)
+
+        # Another formatter with the same settings doesn't format the ends
+        formatter = BasicFormatter()
+        with mock.patch.object(formatter, "format") as format:
+            width = formatter.estimate_width(start, end, char_width=100)
+        format.assert_not_called()
+        self.assertEqual(width, expected)
+
+        # but one with other settings does.
+        formatter = BasicFormatter(scientific_limits=[-2, 2])
+        with mock.patch.object(
+            formatter, "format", wraps=formatter.format
+        ) as format:
+            formatter.estimate_width(start, end, char_width=100)
+        format.assert_called_once()
+
+
 class TestTimeFormatter(unittest.TestCase):
     def test_time_formatter_01(self):
         tf = TimeFormatter()
@@ -94,3 +151,47 @@ class TestTimeFormatter(unittest.TestCase):
         labels = tf.format(ticks, char_width=130)
         expected = ["5.000ms", "5.300ms", "5.600ms"]
         self.assertEqual(labels, expected)
+
+    def test_time_formatter_labels_cached(self):
+        tf = TimeFormatter()
+        ticks = [3600.0 * i for i in range(6)]
+        expected = tf.format(ticks, char_width=130)
+
+        with mock.patch.object(
+            formatters, "strftimeEx", wraps=formatters.strftimeEx
+        ) as strftime_ex:
+            labels = tf.format(ticks[1:] + [6 * 3600.0], char_width=130)
+
+        self.assertEqual(labels[:-1], expected[1:])
+        # Only the new tick is formatted
+        self.assertEqual(strftime_ex.call_count, 1)
+
+    def test_time_formatter_batch(self):
+        # Times with many resolutions, before and after the epoch
+        rs = np.random.RandomState(0)
+        for span in (1e-3, 1.0, 3e2, 5e3, 2e5, 5e6, 1e8, 1e9):
+            ticks = list(
+                np.sort(rs.uniform(-1e9, 1e9) + rs.uniform(0, span, 80))
+            )
+            expected = TimeFormatter(min_batch_ticks=1000).format(
+                ticks, char_width=1000
+            )
+            labels = TimeFormatter(min_batch_ticks=1).format(
+                ticks, char_width=1000
+            )
+            self.assertEqual(labels, expected)
+
+    def test_time_formatter_estimate_width(self):
+        tf = TimeFormatter()
+        scale = TimeScale(hours=1)
+        start, end = 0.0, 8 * 3600.0
+
+        # "%Hh" and "%H:%M" are 3 and 5 characters wide
+        self.assertEqual(
+            tf.estimate_width(start, end, char_width=100, ticker=scale),
+            (8, 24),
+        )
+        self.assertEqual(
+            tf.estimate_width(start, end, char_width=300, ticker=scale),
+            (8, 40),
+        )
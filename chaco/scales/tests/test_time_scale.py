@@ -12,6 +12,7 @@ import datetime
 import os
 import contextlib
 import unittest
+from unittest import mock
 
 import numpy as np
 import numpy.testing as nptest
@@ -487,6 +488,45 @@ class TestTimeScale(unittest.TestCase):
         ts = TimeScale(seconds=1, formatter=TimeFormatter())
         ts = TimeScale(minutes=1, formatter=TimeFormatter())
 
+    def test_time_scale_month_of_year(self):
+        ts = TimeScale(month_of_year=(1, 7))
+        with set_timezone(UTC):
+            ticks = ts.ticks(946684800.0, 978307200.0)
+        # 2000-01-01, 2000-07-01 and 2001-01-01
+        self.assertEqual(ticks, [946684800.0, 962409600.0, 978307200.0])
+
+    def test_time_scale_day_of_month(self):
+        ts = TimeScale(day_of_month=(1, 15))
+        with set_timezone(UTC):
+            ticks = ts.ticks(946684800.0, 951868800.0)
+        # 2000-01-01, 2000-01-15, 2000-02-01, 2000-02-15 and 2000-03-01
+        self.assertEqual(
+            ticks,
+            [946684800.0, 947894400.0, 949363200.0, 950572800.0, 951868800.0],
+        )
+
+    def test_time_scale_day_out_of_range(self):
+        ts = TimeScale(day_of_month=(1, 31))
+        with self.assertRaises(ValueError):
+            ts.ticks(946684800.0, 978307200.0)
+
+    def test_time_scale_ticks_memoized(self):
+        ts = TimeScale(month_of_year=(1, 7))
+        with set_timezone(UTC):
+            ticks = ts.ticks(946684800.0, 978307200.0)
+            ticks.append(0.0)
+            with mock.patch.object(ts, "_compute_ticks") as compute_ticks:
+                self.assertEqual(
+                    ts.ticks(946684800.0, 978307200.0),
+                    [946684800.0, 962409600.0, 978307200.0],
+                )
+            compute_ticks.assert_not_called()
+
+        # The ticks depend on the timezone
+        with set_timezone(HONOLULU):
+            ticks = ts.ticks(946684800.0, 978307200.0)
+        self.assertEqual(ticks, [946720800.0, 962445600.0])
+
 
 # ----------------------------------------------------------------
 # CalendarScaleSystem tests
@@ -12,8 +12,11 @@
 A scale for time and calendar intervals.
 """
 
+from collections import OrderedDict
 from math import floor
 
+import numpy as np
+
 from .scales import AbstractScale, ScaleSystem, frange, heckbert_interval
 from .formatters import TimeFormatter
 from .safetime import (
@@ -123,12 +126,17 @@ def tfrac(t, **time_unit):
     return dt_to_sec(whole), frac
 
 
-def _advance_month(dt, months):
-    """Advance a datetime object by a given number of months."""
-    new_month = dt.month + months
-    years, extra_months = divmod(new_month - 1, 12)
-    new_month = extra_months + 1
-    return dt.replace(year=dt.year + years, month=new_month)
+def _datetime64_to_sec(dates):
+    """Returns the floating point numbers of seconds since the UNIX epoch
+    corresponding to an array of naive numpy.datetime64 values.
+
+    This is the vectorized equivalent of :func:`dt_to_sec`.
+    """
+    delta = (np.asarray(dates) - np.datetime64(EPOCH, "us")).astype(
+        "timedelta64[us]"
+    ).astype(np.int64)
+    seconds, microseconds = np.divmod(delta, 1000000)
+    return seconds + microseconds * 1e-6
 
 
 def trange_months(start, end, months):
@@ -136,25 +144,19 @@ def trange_months(start, end, months):
 
     The start of the iteration is always aligned to Jan 1 2000.
     """
-    dt_start = safe_fromtimestamp(start)
-    dt_end = safe_fromtimestamp(end)
-    dmonths = (12 * (dt_start.year - 2000) + dt_start.month - 1) % months
-    dt = _advance_month(
-        dt_start.replace(day=1, hour=0, minute=0, second=0, microsecond=0),
-        -dmonths,
-    )
-    while dt < dt_start:
-        dt = _advance_month(dt, months)
-    timestamps = []
-    while dt <= dt_end:
-        timestamps.append(dt_to_sec(dt))
-        dt = _advance_month(dt, months)
-    return timestamps
-
-
-def _advance_years(dt, years):
-    """Advance a datetime object by a given number of years."""
-    return dt.replace(year=dt.year + years)
+    dt_start = np.datetime64(safe_fromtimestamp(start), "us")
+    dt_end = np.datetime64(safe_fromtimestamp(end), "us")
+    # The first start of a month which is not before the start
+    first = dt_start.astype("datetime64[M]")
+    if first < dt_start:
+        first += 1
+    offset = (np.datetime64("2000-01", "M") - first).astype(int) % months
+    first += offset
+    last = dt_end.astype("datetime64[M]")
+    if last < first:
+        return []
+    dates = np.arange(first, last + 1, months, dtype="datetime64[M]")
+    return _datetime64_to_sec(dates).tolist()
 
 
 def trange_years(start, end, years):
@@ -162,19 +164,19 @@ def trange_years(start, end, years):
 
     The start of the iteration is aligned to Jan 1 2000.
     """
-    dt_start = safe_fromtimestamp(start)
-    dt_end = safe_fromtimestamp(end)
-    dyears = (dt_start.year - 2000) % years
-    if dyears < 0:
-        dyears += years
-    dt = datetime(dt_start.year - dyears, 1, 1, 0, 0, 0, 0)
-    while dt < dt_start:
-        dt = _advance_years(dt, years)
-    timestamps = []
-    while dt <= dt_end:
-        timestamps.append(dt_to_sec(dt))
-        dt = _advance_years(dt, years)
-    return timestamps
+    dt_start = np.datetime64(safe_fromtimestamp(start), "us")
+    dt_end = np.datetime64(safe_fromtimestamp(end), "us")
+    # The first start of a year which is not before the start
+    first = dt_start.astype("datetime64[Y]")
+    if first < dt_start:
+        first += 1
+    offset = (np.datetime64("2000", "Y") - first).astype(int) % years
+    first += offset
+    last = dt_end.astype("datetime64[Y]")
+    if last < first:
+        return []
+    dates = np.arange(first, last + 1, years, dtype="datetime64[Y]")
+    return _datetime64_to_sec(dates).tolist()
 
 
 def trange(start, end, **time_unit):
@@ -238,8 +240,8 @@ def trange(start, end, **time_unit):
     delta = td_to_sec(timedelta(**time_unit))
     count = (end_whole - start_whole) / delta
 
-    ticks = [start_whole + i * delta for i in range(int(round(count)) + 1)]
-    return ticks[first_tick_ndx:]
+    ticks = start_whole + np.arange(int(round(count)) + 1) * delta
+    return ticks[first_tick_ndx:].tolist()
 
 
 class TimeScale(AbstractScale):
@@ -270,8 +272,12 @@ class TimeScale(AbstractScale):
 
     CALENDAR_UNITS = ("day_of_month", "month_of_year")
 
+    # The maximum number of intervals whose ticks are remembered.
+    TICK_CACHE_SIZE = 64
+
     def __init__(self, **kw_interval):
         """Defines the time period that this scale uses."""
+        self._tick_cache = OrderedDict()
         self.formatter = kw_interval.pop("formatter", TimeFormatter())
         unit, val = list(kw_interval.items())[0]
         self.unit = unit
@@ -307,9 +313,23 @@ class TimeScale(AbstractScale):
         fall inside the interval (*start*,*end*).
 
         Implements AbstractScale. The *start* and *end* parameters are
-        floating-point seconds since the epoch.
+        floating-point seconds since the epoch.  The ticks of the most
+        recently used intervals are remembered, so that a scale system
+        probing the scales again for the same interval is cheap.
         """
+        key = (EPOCH, start, end, desired_ticks)
+        ticks = self._tick_cache.get(key, None)
+        if ticks is None:
+            ticks = self._compute_ticks(start, end, desired_ticks)
+            self._tick_cache[key] = ticks
+            while len(self._tick_cache) > self.TICK_CACHE_SIZE:
+                self._tick_cache.popitem(last=False)
+        else:
+            self._tick_cache.move_to_end(key)
+        return list(ticks)
 
+    def _compute_ticks(self, start, end, desired_ticks=None):
+        """Computes the ticks returned by ticks()."""
         if self.unit in self.CALENDAR_UNITS:
             return self.cal_ticks(start, end)
         elif self.unit in ("milliseconds", "microseconds"):
@@ -347,35 +367,35 @@ class TimeScale(AbstractScale):
         # get range of years of interest
         # add 2 because of python ranges + guard against timezone shifts
         # eg. if 20000101 -> 19991231 because of local timezone, end is 1999+2
-        years = range(start_dt.year, min(end_dt.year + 2, MAXYEAR + 1))
+        years = np.arange(start_dt.year, min(end_dt.year + 2, MAXYEAR + 1))
+        # the months of the years, counted from January 1970
+        months = (years[:, np.newaxis] - 1970) * 12
+        vals = np.asarray(self.vals, dtype=int)
         if self.unit == "day_of_month":
-            # get naive datetimes for start of each day of each month
+            # get naive dates for start of each day of each month
             # in range of years.  Excess will be discarded later.
-            months = range(1, 13)
-            dates = [
-                datetime(year, month, i)
-                for year in years
-                for month in months
-                for i in self.vals
-            ]
+            months = (months + np.arange(12)).astype("datetime64[M]")
+            dates = (
+                months.astype("datetime64[D]")[..., np.newaxis] + (vals - 1)
+            )
+            if (vals < 1).any() or (
+                dates.astype("datetime64[M]") != months[..., np.newaxis]
+            ).any():
+                raise ValueError("day is out of range for month")
 
         elif self.unit == "month_of_year":
-            # get naive datetimes for start of each month in range of years
-            dates = [
-                datetime(year, month, 1)
-                for year in years
-                for month in self.vals
-            ]
+            # get naive dates for start of each month in range of years
+            if ((vals < 1) | (vals > 12)).any():
+                raise ValueError("month must be in 1..12")
+            dates = (months + (vals - 1)).astype("datetime64[M]")
         else:
             raise ValueError("Unknown calendar unit '%s'" % self.unit)
 
         # safely convert to seconds since epoch
-        ticks = [dt_to_sec(date) for date in dates]
+        ticks = _datetime64_to_sec(dates.ravel())
 
         # trim excess timestamps
-        ticks = [t for t in ticks if start <= t <= end]
-
-        return ticks
+        return ticks[(start <= ticks) & (ticks <= end)].tolist()
 
     def labels(self, start, end, numlabels=None, char_width=None):
         """Returns a series of ticks and corresponding strings for labels
@@ -0,0 +1,119 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+""" Defines the SubdivisionGrid class, a uniform data-space grid used to
+accelerate hit-testing on XY renderers.
+"""
+
+from math import floor, sqrt
+
+from numpy import (
+    argsort,
+    asarray,
+    bincount,
+    concatenate,
+    cumsum,
+    empty,
+    flatnonzero,
+    int64,
+    isfinite,
+    sort,
+    zeros,
+)
+
+
+class SubdivisionGrid(object):
+    """ A uniform grid over the finite (x, y) points of a data set.
+
+    The bounding box of the points is divided into roughly
+    ``len(x) / points_per_cell`` equally-sized cells.  The point indices are
+    stored sorted by cell, so that all the points which fall within a
+    rectangular region of data space can be found by touching only the cells
+    which overlap it.  Points with a NaN or infinite coordinate are not
+    indexed.
+    """
+
+    def __init__(self, x, y, points_per_cell=16):
+        x = asarray(x)
+        y = asarray(y)
+        ndx = flatnonzero(isfinite(x) & isfinite(y))
+        self.size = len(ndx)
+
+        if self.size == 0:
+            self.nx = self.ny = 0
+            self._indices = empty(0, dtype=int64)
+            self._offsets = zeros(1, dtype=int64)
+            return
+
+        x = x[ndx].astype(float)
+        y = y[ndx].astype(float)
+        self.xmin, self.xmax = x.min(), x.max()
+        self.ymin, self.ymax = y.min(), y.max()
+
+        ncells = max(self.size // points_per_cell, 1)
+        self.nx = self.ny = max(int(sqrt(ncells)), 1)
+        self.cell_width = _cell_size(self.xmin, self.xmax, self.nx)
+        self.cell_height = _cell_size(self.ymin, self.ymax, self.ny)
+
+        ix = ((x - self.xmin) / self.cell_width).astype(int64)
+        iy = ((y - self.ymin) / self.cell_height).astype(int64)
+        ix.clip(0, self.nx - 1, out=ix)
+        iy.clip(0, self.ny - 1, out=iy)
+        cells = ix * self.ny + iy
+
+        # A stable sort keeps the points of each cell in index order.
+        order = argsort(cells, kind="stable")
+        self._indices = ndx[order]
+        counts = bincount(cells, minlength=self.nx * self.ny)
+        self._offsets = concatenate(([0], cumsum(counts)))
+
+    def query(self, xlow, xhigh, ylow, yhigh):
+        """ Returns the indices of the points in all of the cells which
+        overlap the given region of data space.
+
+        The result is a superset of the points inside the region, sorted in
+        ascending order.
+        """
+        if (
+            self.size == 0
+            or xhigh < self.xmin
+            or xlow > self.xmax
+            or yhigh < self.ymin
+            or ylow > self.ymax
+        ):
+            return empty(0, dtype=int64)
+
+        ix0, ix1 = self._cell_span(xlow, xhigh, self.xmin, self.cell_width,
+                                   self.nx)
+        iy0, iy1 = self._cell_span(ylow, yhigh, self.ymin, self.cell_height,
+                                   self.ny)
+
+        # Cells are stored in column-major order, so the cells of a single
+        # column that overlap the region form one contiguous block.
+        offsets = self._offsets
+        chunks = [
+            self._indices[offsets[i * self.ny + iy0]:
+                          offsets[i * self.ny + iy1 + 1]]
+            for i in range(ix0, ix1 + 1)
+        ]
+        return sort(concatenate(chunks))
+
+    def _cell_span(self, low, high, origin, size, count):
+        first = int(floor(max(low - origin, 0.0) / size))
+        last = int(floor(min(high - origin, size * count) / size))
+        return min(first, count - 1), min(last, count - 1)
+
+
+def _cell_size(low, high, count):
+    size = (high - low) / count
+    if size <= 0.0:
+        # All points share the same coordinate; any positive size will do.
+        return 1.0
+    return size
@@ -59,3 +59,29 @@ class ArrayPlotDataTestCase(unittest.TestCase):
         with self.monitor_events(plot_data) as events:
             plot_data.del_data("Grumpy")
             self.assertEqual(events, [{"removed": ["Grumpy"]}])
+
+    def test_append_data(self):
+        plot_data = ArrayPlotData(x=numpy.arange(3.0))
+
+        with self.monitor_events(plot_data) as events:
+            plot_data.append_data("x", [3.0, 4.0])
+            self.assertEqual(events, [{"appended": ["x"]}])
+
+        numpy.testing.assert_array_equal(
+            plot_data.get_data("x"), numpy.arange(5.0)
+        )
+
+        # A new name is added.
+        with self.monitor_events(plot_data) as events:
+            plot_data.append_data("y", [1.0])
+            self.assertEqual(events, [{"added": ["y"]}])
+
+    def test_append_data_after_set_data(self):
+        plot_data = ArrayPlotData(x=numpy.arange(3.0))
+        plot_data.append_data("x", [3.0])
+        plot_data.set_data("x", numpy.zeros(2))
+        plot_data.append_data("x", [1.0])
+
+        numpy.testing.assert_array_equal(
+            plot_data.get_data("x"), [0.0, 0.0, 1.0]
+        )
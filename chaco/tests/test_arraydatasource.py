@@ -69,6 +69,60 @@ class ArrayDataSourceTestCase(UnittestTools, unittest.TestCase):
         self.assertEqual(self.data_source.get_bounds(), (2, 20))
         self.assertEqual(self.data_source.sort_order, "descending")
 
+    def test_append(self):
+        with self.assertTraitChanges(
+            self.data_source, "data_changed", count=1
+        ) as result:
+            self.data_source.append([-3, 20])
+
+        assert_array_equal(
+            self.data_source.get_data(), list(range(10)) + [-3, 20]
+        )
+        self.assertEqual(self.data_source.get_bounds(), (-3, 20))
+        self.assertEqual(result.events[0][3], {"appended": (10, 12)})
+        # the data passed in is not modified
+        assert_array_equal(self.myarray, arange(10))
+
+    def test_append_reuses_buffer(self):
+        self.data_source.append([10])
+        old_data = self.data_source.get_data()
+        buffer = self.data_source._buffer
+
+        self.data_source.append([11, 12])
+
+        self.assertIs(self.data_source._buffer, buffer)
+        assert_array_equal(old_data, arange(11))
+        assert_array_equal(self.data_source.get_data(), arange(13))
+
+    def test_append_bounds_ignore_nans(self):
+        data_source = ArrayDataSource(array([nan, 3.0, 1.0]))
+        data_source.append([nan, 1.0, 5.0])
+        self.assertEqual(data_source.get_bounds(), (1.0, 5.0))
+        # ties keep the first position
+        self.assertEqual(data_source._min_index, 2)
+
+        all_nans = ArrayDataSource(array([nan, nan]))
+        all_nans.append([2.0])
+        self.assertEqual(all_nans.get_bounds(), (2.0, 2.0))
+
+    def test_append_ordered(self):
+        data_source = ArrayDataSource(arange(10), sort_order="ascending")
+        data_source.append([10, 11])
+        self.assertEqual(data_source.get_bounds(), (0, 11))
+        self.assertEqual(data_source.reverse_map(10.5), 10)
+
+    def test_append_empty(self):
+        data_source = ArrayDataSource()
+        data_source.append(array([4.0, 2.0]))
+        assert_array_equal(data_source.get_data(), [4.0, 2.0])
+        self.assertEqual(data_source.get_bounds(), (2.0, 4.0))
+
+    def test_append_masked(self):
+        self.data_source.set_mask(self.mymask)
+        self.data_source.append([10, 11])
+        data, mask = self.data_source.get_data_mask()
+        assert_array_equal(mask, list(self.mymask) + [True, True])
+
     def test_set_mask(self):
         with self.assertTraitChanges(
             self.data_source, "data_changed", count=1
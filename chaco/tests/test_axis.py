@@ -0,0 +1,63 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+import unittest
+
+from chaco.api import (
+    DataRange1D,
+    LinearMapper,
+    PlotAxis,
+    PlotGraphicsContext,
+)
+
+
+class PlotAxisTickLabelsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.range = DataRange1D(low=0.0, high=10.0)
+        self.axis = PlotAxis(
+            mapper=LinearMapper(range=self.range, low_pos=0, high_pos=200),
+            orientation="bottom",
+            bounds=[200, 30],
+        )
+        self.gc = PlotGraphicsContext((200, 30))
+
+    def labels_by_text(self):
+        return {
+            label.text: label for label in self.axis.ticklabel_cache
+        }
+
+    def test_labels_reused_when_panning(self):
+        self.gc.render_component(self.axis)
+        labels = self.labels_by_text()
+        self.assertIn("4", labels)
+
+        self.range.set_bounds(2.0, 12.0)
+        self.gc.render_component(self.axis)
+        new_labels = self.labels_by_text()
+
+        self.assertIn("12", new_labels)
+        self.assertNotIn("0", new_labels)
+        for text in ("4", "6", "8", "10"):
+            self.assertIs(new_labels[text], labels[text])
+        self.assertEqual(
+            len(self.axis._tick_label_bounding_boxes),
+            len(self.axis.ticklabel_cache),
+        )
+
+    def test_labels_rebuilt_when_style_changes(self):
+        self.gc.render_component(self.axis)
+        labels = self.labels_by_text()
+
+        self.axis.tick_label_rotate_angle = 90.0
+        self.gc.render_component(self.axis)
+        new_labels = self.labels_by_text()
+
+        self.assertIsNot(new_labels["4"], labels["4"])
+        self.assertEqual(new_labels["4"].rotate_angle, 90.0)
@@ -13,13 +13,15 @@ Unit tests for utility functions in chaco.base
 """
 import unittest
 from math import sqrt
-from numpy import arange, array, linspace, nan, ones
+from numpy import arange, array, linspace, nan, ones, random
 from numpy.testing import assert_equal, assert_almost_equal, assert_array_equal
 
 from chaco.base import (
     arg_find_runs,
+    arg_range_window,
     arg_true_runs,
     bin_search,
+    buffered_append,
     find_runs,
     intersect_range,
     reverse_map_1d,
@@ -549,3 +551,70 @@ class IntersectRangeTestCase(unittest.TestCase):
         mask = (x <= 1.4) | (x >= 1.6)
         result = intersect_range(x, 0.0, 3.0, mask)
         assert_array_equal(result, mask)
+
+
+class ArgRangeWindowTestCase(unittest.TestCase):
+    def test_ascending(self):
+        x = arange(10.0)
+        self.assertEqual(arg_range_window(x, 2.5, 5.0, "ascending"), (2, 7))
+
+    def test_descending(self):
+        x = arange(10.0)[::-1]
+        self.assertEqual(arg_range_window(x, 2.5, 5.0, "descending"), (3, 8))
+
+    def test_outside(self):
+        x = arange(10.0)
+        self.assertEqual(arg_range_window(x, 20.0, 30.0, "ascending"), (9, 10))
+        self.assertEqual(arg_range_window(x, -3.0, -1.0, "ascending"), (0, 1))
+
+    def test_unsorted(self):
+        with self.assertRaises(NotImplementedError):
+            arg_range_window(arange(10.0), 0.0, 1.0, "none")
+
+    def test_matches_intersect_range(self):
+        rs = random.RandomState(0)
+        for i in range(50):
+            x = linspace(-2.0, 3.0, rs.randint(0, 30))
+            x = x[rs.uniform(size=len(x)) < 0.6]
+            for sort_order, data in (("ascending", x), ("descending", x[::-1])):
+                full = intersect_range(data, 0.0, 1.0)
+                start, end = arg_range_window(data, 0.0, 1.0, sort_order)
+
+                self.assertFalse(full[:start].any())
+                self.assertFalse(full[end:].any())
+                assert_array_equal(
+                    full[start:end],
+                    intersect_range(data[start:end], 0.0, 1.0),
+                )
+
+
+class BufferedAppendTestCase(unittest.TestCase):
+    def test_append_grows_buffer(self):
+        data = arange(4.0)
+        buffer = None
+        for i in range(4, 100):
+            old_buffer = buffer
+            data, buffer = buffered_append(data, buffer, [float(i)])
+            if old_buffer is not None and buffer is not old_buffer:
+                # the capacity doubles when it runs out
+                self.assertEqual(len(buffer), 2 * len(data))
+        assert_array_equal(data, arange(100.0))
+        self.assertIs(data.base, buffer)
+
+    def test_append_does_not_modify_views(self):
+        data, buffer = buffered_append(arange(4.0), None, [4.0])
+        old_data = data
+        data, buffer = buffered_append(data, buffer, [5.0])
+        assert_array_equal(data, arange(6.0))
+        assert_array_equal(old_data, arange(5.0))
+
+    def test_append_to_other_array(self):
+        data, buffer = buffered_append(arange(4.0), None, [4.0])
+        other = ones(3)
+        data, new_buffer = buffered_append(other, buffer, [2.0])
+        self.assertIsNot(new_buffer, buffer)
+        assert_array_equal(data, [1.0, 1.0, 1.0, 2.0])
+
+    def test_append_promotes_dtype(self):
+        data, buffer = buffered_append(arange(3), None, [0.5])
+        assert_array_equal(data, [0.0, 1.0, 2.0, 0.5])
@@ -10,9 +10,14 @@
 
 import unittest
 
-from numpy import allclose, array, ravel
+from unittest import mock
+
+from numpy import allclose, arange, array, random, ravel, uint16
+from numpy.testing import assert_array_equal
 
 from chaco.api import ArrayDataSource, ColorMapper, DataRange1D
+from chaco import color_mapper
+from chaco.default_colormaps import viridis
 
 
 class ColormapperTestCase(unittest.TestCase):
@@ -140,3 +145,75 @@ class ColormapperTestCase(unittest.TestCase):
             "red": [(0.0, 0.0, 0.0), (1.0, 1.0, 1.0)],
         }
         assert self.colormap._segmentdata == sd
+
+
+class ColormapperMapUint8TestCase(unittest.TestCase):
+    def setUp(self):
+        self.colormap = viridis(DataRange1D(low=1000.0, high=50000.0))
+        self.colormap._recalculate()
+        self.data = random.RandomState(0).randint(0, 65536, (300, 400))
+
+    def map_as_float(self, data):
+        return color_mapper.map_colors_uint8(
+            data.astype(float),
+            self.colormap.steps,
+            self.colormap.range.low,
+            self.colormap.range.high,
+            self.colormap._red_lut_uint8,
+            self.colormap._green_lut_uint8,
+            self.colormap._blue_lut_uint8,
+            self.colormap._alpha_lut_uint8,
+        )
+
+    def test_uint16_lut_matches_float(self):
+        data = self.data.astype(uint16)
+
+        result = self.colormap.map_uint8(data)
+
+        self.assertIn("<u2", self.colormap._uint8_luts)
+        assert_array_equal(result, self.map_as_float(data))
+
+    def test_uint8_lut_matches_float(self):
+        self.colormap.range.set_bounds(10.0, 200.0)
+        data = (self.data % 256).astype("uint8")[::2, ::3]
+
+        result = self.colormap.map_uint8(data)
+
+        self.assertIn("|u1", self.colormap._uint8_luts)
+        assert_array_equal(result, self.map_as_float(data))
+
+    def test_lut_follows_range(self):
+        data = self.data.astype(uint16)
+        self.colormap.map_uint8(data)
+
+        self.colormap.range.set_bounds(0.0, 2000.0)
+        result = self.colormap.map_uint8(data)
+
+        assert_array_equal(result, self.map_as_float(data))
+
+    def test_lut_follows_colormap(self):
+        data = self.data.astype(uint16)
+        self.colormap.map_uint8(data)
+
+        self.colormap.reverse_colormap()
+        result = self.colormap.map_uint8(data)
+
+        assert_array_equal(result, self.map_as_float(data))
+
+    def test_small_integer_array(self):
+        data = arange(0, 60000, 1000, dtype=uint16)
+
+        result = self.colormap.map_uint8(data)
+
+        self.assertEqual(self.colormap._uint8_luts, {})
+        assert_array_equal(result, self.map_as_float(data))
+
+    def test_threads(self):
+        data = self.data.astype(float)
+        expected = self.map_as_float(data)
+
+        for map_threads in (1, 3):
+            self.colormap.map_threads = map_threads
+            with mock.patch.object(color_mapper, "_MIN_THREAD_SIZE", 1000):
+                result = self.colormap.map_uint8(data)
+            assert_array_equal(result, expected)
@@ -9,14 +9,18 @@
 # Thanks for using Enthought open source!
 
 import unittest
+from unittest import mock
 
-from numpy import linspace, sin
+from numpy import cos, linspace, sin
 
 from traits.api import Enum, HasTraits, Instance
 from traitsui.api import UItem, View
 from chaco.api import (
-    ArrayPlotData, DataRange2D, DataView, GridDataSource, Plot
+    ArrayPlotData, DataRange2D, DataView, GridDataSource, Plot,
+    PlotGraphicsContext
 )
+from chaco.plots.lineplot import LinePlot
+from chaco.tools.api import LineInspector
 from enable.api import ComponentEditor
 
 
@@ -84,3 +88,137 @@ class DataViewTestCase(unittest.TestCase):
             self.assertEqual(
                 getattr(dummy_plot.plot, "padding_" + orientation), 80
             )
+
+
+class DataViewLayerCacheTestCase(unittest.TestCase):
+    def create_plot(self, use_layer_cache):
+        x = linspace(0, 10, 100)
+        data = ArrayPlotData(x=x, y=sin(x))
+        plot = Plot(data, use_layer_cache=use_layer_cache, title="Title")
+        renderer = plot.plot(("x", "y"))[0]
+        renderer.overlays.append(LineInspector(renderer, axis="index_x"))
+        plot.outer_bounds = [300, 200]
+        plot.do_layout(force=True)
+        return plot
+
+    def render(self, plot):
+        gc = PlotGraphicsContext(plot.outer_bounds)
+        gc.render_component(plot)
+        return gc.bmp_array.copy()
+
+    def assert_same_rendering(self, plot, cached_plot):
+        self.assertEqual(
+            (self.render(plot) != self.render(cached_plot)).sum(), 0
+        )
+
+    def test_same_rendering(self):
+        plot = self.create_plot(False)
+        cached_plot = self.create_plot(True)
+        self.assert_same_rendering(plot, cached_plot)
+        # Drawn from the cached layers
+        self.assert_same_rendering(plot, cached_plot)
+
+    def test_overlay_change_reuses_cache(self):
+        plot = self.create_plot(True)
+        self.render(plot)
+
+        with mock.patch.object(LinePlot, "_render") as render_line:
+            plot.plots["plot0"][0].request_redraw()
+            plot.title = "New title"
+            self.render(plot)
+        render_line.assert_not_called()
+
+    def test_invalidations(self):
+        plot = self.create_plot(False)
+        cached_plot = self.create_plot(True)
+        self.render(cached_plot)
+
+        changes = [
+            lambda p: p.data.set_data("y", cos(p.data["x"])),
+            lambda p: setattr(p.plots["plot0"][0], "color", "red"),
+            lambda p: setattr(p.x_axis, "title", "X"),
+            lambda p: setattr(p.y_grid, "line_color", "blue"),
+            lambda p: setattr(p.x_axis, "visible", False),
+            lambda p: setattr(p.plots["plot0"][0], "visible", False),
+            lambda p: setattr(p.index_range, "low_setting", 2.0),
+            lambda p: setattr(p, "bgcolor", "lightgray"),
+            lambda p: p.plot(("x", "x")),
+            lambda p: setattr(p, "outer_bounds", [250, 150]),
+        ]
+        for change in changes:
+            change(plot)
+            change(cached_plot)
+            plot.do_layout()
+            cached_plot.do_layout()
+            self.assert_same_rendering(plot, cached_plot)
+
+
+class DataViewBlitPanningTestCase(unittest.TestCase):
+    def create_plot(self, kind="line"):
+        x = linspace(0, 100, 10000)
+        data = ArrayPlotData(x=x, y=sin(x))
+        plot = Plot(data)
+        plot.plot(("x", "y"), type=kind)
+        # The dashes of the grid lines restart in each strip
+        plot.x_grid.visible = False
+        plot.y_grid.visible = False
+        plot.outer_bounds = [300, 200]
+        plot.do_layout(force=True)
+        return plot
+
+    def render(self, plot):
+        gc = PlotGraphicsContext(plot.outer_bounds)
+        gc.render_component(plot)
+        return gc.bmp_array.copy()
+
+    def pan(self, plot, dx, dy):
+        for mapper, pixels in ((plot.x_mapper, dx), (plot.y_mapper, dy)):
+            low, high = mapper.range.low, mapper.range.high
+            scale = (high - low) / (mapper.high_pos - mapper.low_pos)
+            shift = pixels * scale
+            mapper.range.set_bounds(low - shift, high - shift)
+
+    def test_pan_only_draws_uncovered_strips(self):
+        for kind in ("line", "scatter"):
+            plot = self.create_plot(kind)
+            panned_plot = self.create_plot(kind)
+            panned_plot.blit_panning = True
+            self.render(plot)
+            self.render(panned_plot)
+
+            for dx, dy in [(5, 0), (-3, 0), (0, 4), (3, -2)]:
+                self.pan(plot, dx, dy)
+                self.pan(panned_plot, dx, dy)
+                renderer = panned_plot.plots["plot0"][0]
+                with mock.patch.object(
+                    type(renderer), "_render", wraps=renderer._render
+                ) as render:
+                    panned_image = self.render(panned_plot)
+                if dy == 0:
+                    # Each strip only gathers the points near it
+                    for args, kwargs in render.call_args_list:
+                        gathered = sum(len(points) for points in args[1])
+                        self.assertLess(gathered, 2000)
+                self.assertEqual((self.render(plot) != panned_image).sum(), 0)
+
+            panned_plot.blit_panning = False
+            self.assertEqual(
+                (self.render(plot) != self.render(panned_plot)).sum(), 0
+            )
+
+    def test_zoom_draws_in_full(self):
+        plot = self.create_plot()
+        panned_plot = self.create_plot()
+        panned_plot.blit_panning = True
+        self.render(plot)
+        self.render(panned_plot)
+
+        for p in (plot, panned_plot):
+            p.index_range.set_bounds(10.0, 20.0)
+        with mock.patch.object(
+            LinePlot, "draw_index_strip"
+        ) as draw_index_strip:
+            self.assertEqual(
+                (self.render(plot) != self.render(panned_plot)).sum(), 0
+            )
+        draw_index_strip.assert_not_called()
@@ -8,6 +8,7 @@
 #
 # Thanks for using Enthought open source!
 
+from threading import Event, Thread
 import unittest
 
 from numpy import arange, array, zeros, inf
@@ -15,7 +16,7 @@ from numpy.testing import assert_equal
 
 from traits.api import HasTraits, Instance, Bool, observe
 
-from chaco.api import DataRange1D, ArrayDataSource
+from chaco.api import DataRange1D, ArrayDataSource, deferred_refresh
 
 
 class Foo(HasTraits):
@@ -293,3 +294,81 @@ class DataRangeTestCase(unittest.TestCase):
         r.sources.append(ds1)
         self.assertEqual(r.low, -inf)
         self.assertEqual(r.high, inf)
+
+    def test_deferred_refresh(self):
+        sources = [ArrayDataSource(arange(10.0)) for i in range(5)]
+        r = DataRange1D(*sources)
+        updates = []
+        r.observe(updates.append, "updated")
+
+        with deferred_refresh():
+            for i, source in enumerate(sources):
+                source.set_data(arange(10.0) + i)
+            # The range is only refreshed at the end of the block
+            self.assertEqual(r.high, 9.0)
+            self.assertEqual(updates, [])
+
+        self.assertEqual(r.high, 13.0)
+        self.assertEqual(len(updates), 1)
+
+    def test_nested_deferred_refresh(self):
+        source = ArrayDataSource(arange(10.0))
+        r = DataRange1D(source)
+
+        with deferred_refresh():
+            with deferred_refresh():
+                source.set_data(arange(20.0))
+            self.assertEqual(r.high, 9.0)
+        self.assertEqual(r.high, 19.0)
+
+    def test_deferred_refresh_error(self):
+        source = ArrayDataSource(arange(10.0))
+        r = DataRange1D(source)
+
+        with self.assertRaises(ZeroDivisionError):
+            with deferred_refresh():
+                source.set_data(arange(20.0))
+                1 / 0
+        self.assertEqual(r.high, 19.0)
+
+        # Outside of a block, the range is refreshed right away
+        source.set_data(arange(30.0))
+        self.assertEqual(r.high, 29.0)
+
+    def test_deferred_refresh_threads(self):
+        source = ArrayDataSource(arange(10.0))
+        r = DataRange1D(source)
+        other_source = ArrayDataSource(arange(10.0))
+        other_r = DataRange1D(other_source)
+        entered = Event()
+        changed = Event()
+        other_highs = []
+
+        def other_thread():
+            with deferred_refresh():
+                entered.set()
+                changed.wait(10.0)
+                other_source.set_data(arange(40.0))
+                other_highs.append(other_r.high)
+            other_highs.append(other_r.high)
+
+        thread = Thread(target=other_thread)
+        thread.start()
+        try:
+            entered.wait(10.0)
+            # The block of the other thread doesn't defer this change
+            source.set_data(arange(20.0))
+            self.assertEqual(r.high, 19.0)
+
+            with deferred_refresh():
+                changed.set()
+                thread.join(10.0)
+                # and this block doesn't defer the other thread's change
+                source.set_data(arange(30.0))
+                self.assertEqual(r.high, 19.0)
+        finally:
+            changed.set()
+            thread.join(10.0)
+
+        self.assertEqual(r.high, 29.0)
+        self.assertEqual(other_highs, [9.0, 39.0])
@@ -0,0 +1,80 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+import unittest
+from unittest import mock
+
+from numpy import arange
+
+from chaco.api import ArrayPlotData, FrameScheduler, Plot
+
+
+class FrameSchedulerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.time = 0.0
+        self.scheduled = []
+        self.scheduler = FrameScheduler(
+            max_fps=50.0,
+            clock=lambda: self.time,
+            call_later=lambda delay, callback: self.scheduled.append(
+                (delay, callback)
+            ),
+        )
+        self.data = ArrayPlotData(x=arange(10), y=arange(10))
+        self.plot = Plot(self.data)
+        self.renderer = self.plot.plot(("x", "y"))[0]
+
+    def test_redraws_pass_through_without_scheduler(self):
+        with mock.patch.object(self.plot, "_request_redraw") as redraw:
+            self.renderer.request_redraw()
+        redraw.assert_called_once_with()
+
+    def test_requests_are_merged_into_one_frame(self):
+        self.plot.frame_scheduler = self.scheduler
+
+        with mock.patch.object(self.plot, "_request_redraw") as redraw:
+            for i in range(100):
+                self.data.set_data("y", arange(10) + i)
+            self.assertEqual(len(self.scheduled), 1)
+            self.assertEqual(self.scheduled[0][0], 0)
+            self.assertGreaterEqual(self.scheduler.merged_requests, 99)
+            redraw.assert_not_called()
+
+            self.scheduled.pop()[1]()
+            self.assertEqual(self.scheduler.frame_count, 1)
+            redraw.assert_called()
+
+    def test_frame_rate_is_capped(self):
+        self.renderer.frame_scheduler = self.scheduler
+
+        with mock.patch.object(self.plot, "_request_redraw"):
+            self.renderer.request_redraw()
+            self.scheduled.pop()[1]()
+
+            self.time = 0.005
+            self.renderer.request_redraw()
+            # The next frame is due 20 ms after the first one
+            self.assertEqual(self.scheduled[0][0], 15)
+
+    def test_dropped_frames(self):
+        self.renderer.frame_scheduler = self.scheduler
+
+        with mock.patch.object(self.plot, "_request_redraw"):
+            self.renderer.request_redraw()
+            # The frame is drawn 100 ms, or 5 frame intervals, late
+            self.time = 0.1
+            self.scheduled.pop()[1]()
+
+        self.assertEqual(self.scheduler.dropped_frames, 5)
+        self.assertEqual(self.scheduler.frame_count, 1)
+
+    def test_flush_without_pending_frame(self):
+        self.scheduler.flush()
+        self.assertEqual(self.scheduler.frame_count, 0)
@@ -12,10 +12,22 @@
 Test of ImageData behavior.
 """
 
+import json
 import os
+import shutil
+import tempfile
 
 import unittest
-from numpy import arange, swapaxes
+from numpy import (
+    arange,
+    array,
+    memmap,
+    nan,
+    save,
+    shares_memory,
+    swapaxes,
+    uint8,
+)
 from numpy.testing import assert_array_equal
 from pkg_resources import resource_filename
 
@@ -155,3 +167,119 @@ class ImageDataTestCase(UnittestTools, unittest.TestCase):
             self.data_source, "metadata_changed", count=1
         ):
             self.data_source.metadata["new_metadata"] = True
+
+    def test_pyramid_level_mean(self):
+        data_source = ImageData(data=arange(20.0).reshape(4, 5))
+
+        assert_array_equal(data_source.get_pyramid_level(0), data_source.data)
+        assert_array_equal(
+            data_source.get_pyramid_level(1),
+            [[3.0, 5.0, 6.5], [13.0, 15.0, 16.5]],
+        )
+        assert_array_equal(data_source.get_pyramid_level(2), [[9.0, 11.5]])
+        assert_array_equal(data_source.get_pyramid_level(3), [[10.25]])
+
+    def test_pyramid_level_max(self):
+        data = arange(20.0).reshape(4, 5)
+        data[3, 1] = nan
+        data_source = ImageData(data=data, pyramid_reduction="max")
+
+        assert_array_equal(
+            data_source.get_pyramid_level(1), [[6, 8, 9], [15, 18, 19]]
+        )
+
+    def test_pyramid_level_rgb(self):
+        data = array(
+            [[[0, 10, 255], [1, 20, 255]], [[2, 30, 255], [4, 40, 255]]],
+            dtype=uint8,
+        )
+        data_source = ImageData(data=data, value_depth=3)
+
+        level = data_source.get_pyramid_level(1)
+
+        self.assertEqual(level.dtype, uint8)
+        assert_array_equal(level, [[[2, 25, 255]]])
+
+    def test_pyramid_level_transposed(self):
+        data_source = ImageData(
+            data=arange(8.0).reshape(2, 4), transposed=True
+        )
+        assert_array_equal(data_source.get_pyramid_level(1), [[2.5], [4.5]])
+
+    def test_pyramid_reset(self):
+        data_source = ImageData(data=arange(16.0).reshape(4, 4))
+        assert_array_equal(data_source.get_pyramid_level(2), [[7.5]])
+
+        with self.assertTraitChanges(data_source, "data_changed"):
+            data_source.pyramid_reduction = "max"
+        assert_array_equal(data_source.get_pyramid_level(2), [[15]])
+
+        data_source.set_data(arange(4.0).reshape(2, 2))
+        assert_array_equal(data_source.get_pyramid_level(1), [[3]])
+
+    def test_pyramid_level_sample(self):
+        data_source = ImageData(
+            data=arange(20.0).reshape(4, 5), pyramid_reduction="sample"
+        )
+
+        level = data_source.get_pyramid_level(1)
+
+        assert_array_equal(level, [[0, 2, 4], [10, 12, 14]])
+        self.assertTrue(shares_memory(level, data_source.data))
+
+    def test_bounds_sample_size(self):
+        data = arange(10000.0).reshape(100, 100)
+        data_source = ImageData(data=data, bounds_sample_size=100)
+
+        self.assertEqual(data_source.get_bounds(), (0.0, 9090.0))
+
+        data_source.bounds_sample_size = 0
+        self.assertEqual(data_source.get_bounds(), (0.0, 9999.0))
+
+
+class ImageDataMemmapTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.image = arange(600.0).reshape(20, 30)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_from_npy(self):
+        filename = os.path.join(self.tmpdir, "image.npy")
+        save(filename, self.image)
+
+        data_source = ImageData.from_memmap(filename, bounds_sample_size=20)
+
+        self.assertIsInstance(data_source.raw_value, memmap)
+        assert_array_equal(data_source.data, self.image)
+        self.assertTrue(data_source.use_pyramid)
+        self.assertEqual(data_source.pyramid_reduction, "sample")
+        # estimated from a grid of every 6th row and column
+        self.assertEqual(data_source.get_bounds(), (0.0, 564.0))
+
+    def test_from_raw(self):
+        filename = os.path.join(self.tmpdir, "image.raw")
+        rgb = arange(2 * 20 * 30 * 3).astype(uint8)
+        rgb.tofile(filename)
+
+        data_source = ImageData.from_memmap(
+            filename, shape=(20, 30, 3), dtype=uint8, offset=20 * 30 * 3
+        )
+
+        self.assertEqual(data_source.value_depth, 3)
+        assert_array_equal(
+            data_source.data, rgb[20 * 30 * 3:].reshape(20, 30, 3)
+        )
+
+    def test_bounds_from_summary(self):
+        filename = os.path.join(self.tmpdir, "image.npy")
+        save(filename, self.image)
+        with open(filename + ".json", "w") as summary_file:
+            json.dump({"min": -1.0, "max": 1000.0}, summary_file)
+
+        data_source = ImageData.from_memmap(filename)
+        self.assertEqual(data_source.get_bounds(), (-1.0, 1000.0))
+
+        data_source = ImageData.from_memmap(filename, bounds=(2.0, 3.0))
+        self.assertEqual(data_source.get_bounds(), (2.0, 3.0))
@@ -0,0 +1,77 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+import unittest
+
+from numpy import arange
+from numpy.testing import assert_array_equal
+
+from chaco.image_tile_cache import ImageTileCache
+
+
+class ImageTileCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.image = arange(30 * 50).reshape(30, 50)
+        self.mapped = []
+
+    def map_tile(self, rows, cols):
+        self.mapped.append((rows, cols))
+        return self.image[rows, cols, None] * 2
+
+    def get_region(self, cache, row_min, row_max, col_min, col_max, key=0):
+        return cache.get_region(
+            self.image.shape, row_min, row_max, col_min, col_max, key,
+            self.map_tile,
+        )
+
+    def test_region(self):
+        cache = ImageTileCache(tile_size=16)
+
+        region = self.get_region(cache, 5, 30, 10, 40)
+
+        assert_array_equal(region, self.image[5:30, 10:40, None] * 2)
+        self.assertEqual(len(self.mapped), 6)
+        self.assertIn((slice(16, 30), slice(32, 48)), self.mapped)
+
+    def test_single_tile(self):
+        cache = ImageTileCache(tile_size=16)
+
+        region = self.get_region(cache, 17, 20, 33, 40)
+
+        assert_array_equal(region, self.image[17:20, 33:40, None] * 2)
+        self.assertEqual(self.mapped, [(slice(16, 30), slice(32, 48))])
+
+    def test_cached_tiles_reused(self):
+        cache = ImageTileCache(tile_size=16)
+        self.get_region(cache, 0, 10, 0, 10)
+        self.get_region(cache, 5, 20, 5, 10)
+        self.assertEqual(len(self.mapped), 2)
+
+        # a different key maps the tile again
+        self.get_region(cache, 0, 10, 0, 10, key=1)
+        self.assertEqual(len(self.mapped), 3)
+
+        cache.clear()
+        self.get_region(cache, 0, 10, 0, 10)
+        self.assertEqual(len(self.mapped), 4)
+
+    def test_least_recently_used_evicted(self):
+        cache = ImageTileCache(tile_size=16, max_tiles=2)
+        self.get_region(cache, 0, 1, 0, 1)
+        self.get_region(cache, 0, 1, 20, 21)
+        self.get_region(cache, 0, 1, 0, 1)
+        self.get_region(cache, 20, 21, 0, 1)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(len(self.mapped), 3)
+
+        self.get_region(cache, 0, 1, 0, 1)
+        self.assertEqual(len(self.mapped), 3)
+        self.get_region(cache, 0, 1, 20, 21)
+        self.assertEqual(len(self.mapped), 4)
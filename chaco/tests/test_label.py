@@ -0,0 +1,69 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+import unittest
+from unittest import mock
+
+from kiva.api import Font
+
+from chaco import label
+from chaco.api import PlotGraphicsContext
+from chaco.label import Label, get_full_text_extent
+
+
+class TextExtentCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        label._text_extent_cache.clear()
+        self.addCleanup(label._text_extent_cache.clear)
+        self.gc = mock.Mock()
+        self.gc.get_full_text_extent.return_value = (10.0, 12.0, 2.0, 0.0)
+
+    def test_cached(self):
+        font = Font(size=10)
+        extent = get_full_text_extent(self.gc, font, "1.0")
+        self.assertEqual(extent, (10.0, 12.0, 2.0, 0.0))
+        extent = get_full_text_extent(self.gc, Font(size=10), "1.0")
+        self.assertEqual(extent, (10.0, 12.0, 2.0, 0.0))
+
+        self.gc.set_font.assert_called_once_with(font)
+        self.gc.get_full_text_extent.assert_called_once_with("1.0")
+
+    def test_font_and_text_are_keys(self):
+        get_full_text_extent(self.gc, Font(size=10), "1.0")
+        get_full_text_extent(self.gc, Font(size=12), "1.0")
+        get_full_text_extent(self.gc, Font(size=10), "2.0")
+
+        self.assertEqual(self.gc.get_full_text_extent.call_count, 3)
+
+    def test_least_recently_used_removed(self):
+        font = Font(size=10)
+        with mock.patch.object(label, "TEXT_EXTENT_CACHE_SIZE", 2):
+            get_full_text_extent(self.gc, font, "a")
+            get_full_text_extent(self.gc, font, "b")
+            get_full_text_extent(self.gc, font, "a")
+            get_full_text_extent(self.gc, font, "c")
+            self.assertEqual(len(label._text_extent_cache), 2)
+            self.assertEqual(self.gc.get_full_text_extent.call_count, 3)
+
+            # "b" was removed, but "a" was kept
+            get_full_text_extent(self.gc, font, "a")
+            self.assertEqual(self.gc.get_full_text_extent.call_count, 3)
+            get_full_text_extent(self.gc, font, "b")
+            self.assertEqual(self.gc.get_full_text_extent.call_count, 4)
+
+    def test_label_bounding_box(self):
+        gc = PlotGraphicsContext((50, 50))
+        expected = Label(text="12.5\nabc").get_bounding_box(gc)
+
+        # A new label with the same text uses the cached extents
+        bounding_box = Label(text="12.5\nabc").get_bounding_box(gc)
+
+        self.assertEqual(bounding_box, expected)
+        self.assertEqual(len(label._text_extent_cache), 2)
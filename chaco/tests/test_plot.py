@@ -52,6 +52,24 @@ class PlotTestCase(unittest.TestCase):
         self.assertIs(renderer_2d.index_range, new_range)
         self.assertIs(renderer_1d.index_range, new_range)
 
+    def test_update_data_refreshes_range_once(self):
+        names = ["y{}".format(i) for i in range(10)]
+        data = ArrayPlotData(x=arange(10))
+        for name in names:
+            data.set_data(name, arange(10))
+        plot = Plot(data)
+        for name in names:
+            plot.plot(("x", name))
+        updates = []
+        plot.value_range.observe(updates.append, "updated")
+
+        data.update_data(
+            {name: arange(10) + i for i, name in enumerate(names)}
+        )
+
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(plot.value_range.high, 18.0)
+
     def test_segment_plot(self):
         x = arange(10)
         y = arange(1, 11)
@@ -141,6 +159,20 @@ class PlotTestCase(unittest.TestCase):
         self.assertEqual(screen_point.shape, (0, 2))
 
     # serves as a regression test for enthought/chaco#272
+    def test_append_data(self):
+        plot_data = ArrayPlotData(x=arange(10.0), y=arange(10.0))
+        plot = Plot(plot_data)
+        renderer, = plot.plot(("x", "y"))
+        index = renderer.index
+
+        plot_data.append_data("x", [10.0, 11.0])
+        plot_data.append_data("y", [-5.0, 20.0])
+
+        self.assertIs(renderer.index, index)
+        np.testing.assert_array_equal(index.get_data(), arange(12.0))
+        self.assertEqual(renderer.value.get_bounds(), (-5.0, 20.0))
+        self.assertEqual(plot.value_range.high, 20.0)
+
     def test_xy_plot_map_screen(self):
         renderers = ["line", "scatter", "bar", "polygon"]
         for renderer in renderers:
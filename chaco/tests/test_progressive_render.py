@@ -0,0 +1,144 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+import unittest
+
+from numpy import abs, linspace, random, sin
+
+from chaco.api import ArrayPlotData, Plot, PlotGraphicsContext
+from chaco.progressive_render import ProgressiveRender
+
+
+class ProgressiveRenderTestCase(unittest.TestCase):
+    def draw_lines(self, gc, chunk, last):
+        gc.set_antialias(True)
+        gc.set_line_width(2.0)
+        for color, (x0, y0, x1, y1) in chunk:
+            gc.set_stroke_color(color)
+            gc.move_to(x0, y0)
+            gc.line_to(x1, y1)
+            gc.stroke_path()
+
+    def test_translucent_chunks(self):
+        chunks = [
+            [((1.0, 0.0, 0.0, 1.0), (0, 0, 39, 17))],
+            [((0.0, 0.0, 1.0, 0.5), (0, 17, 39, 0))],
+        ]
+        render = ProgressiveRender(None, (0, 0, 40, 20), 1.0, chunks)
+        while not render.finished:
+            render.draw_next_chunk(self.draw_lines)
+        self.assertEqual(render.progress, 1.0)
+
+        gc = PlotGraphicsContext((40, 20))
+        gc.clear((0.2, 0.8, 0.2, 1.0))
+        render.draw(gc)
+
+        expected = PlotGraphicsContext((40, 20))
+        expected.clear((0.2, 0.8, 0.2, 1.0))
+        for chunk in chunks:
+            self.draw_lines(expected, chunk, False)
+        difference = abs(gc.bmp_array.astype(int) - expected.bmp_array)
+        self.assertLessEqual(difference.max(), 1)
+
+
+class ProgressiveRenderingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.scheduled = []
+        x = linspace(0, 100, 20000)
+        y = sin(x) + random.RandomState(0).normal(0, 0.1, len(x))
+        self.data = ArrayPlotData(x=x, y=y)
+
+    def create_plot(self, kind, progressive, **traits):
+        plot = Plot(self.data)
+        renderer = plot.plot(("x", "y"), type=kind, **traits)[0]
+        if progressive:
+            renderer.trait_set(
+                use_progressive_rendering=True,
+                progressive_chunk_size=5000,
+                call_later=lambda delay, callback: self.scheduled.append(
+                    callback
+                ),
+            )
+        plot.outer_bounds = [300, 200]
+        plot.do_layout(force=True)
+        return plot, renderer
+
+    def render(self, plot):
+        gc = PlotGraphicsContext(plot.outer_bounds)
+        gc.render_component(plot)
+        return gc.bmp_array.copy()
+
+    def refine(self):
+        while self.scheduled:
+            self.scheduled.pop(0)()
+
+    def test_scatter_plot(self):
+        plot, _ = self.create_plot("scatter", False)
+        progressive_plot, renderer = self.create_plot("scatter", True)
+
+        self.render(progressive_plot)
+        self.assertEqual(renderer.render_progress, 0.25)
+        self.assertEqual(len(self.scheduled), 1)
+
+        self.scheduled.pop()()
+        self.assertEqual(renderer.render_progress, 0.5)
+        self.refine()
+        self.assertEqual(renderer.render_progress, 1.0)
+        self.assertEqual(
+            (self.render(plot) != self.render(progressive_plot)).sum(), 0
+        )
+
+    def test_line_plot(self):
+        plot, _ = self.create_plot("line", False)
+        progressive_plot, renderer = self.create_plot("line", True)
+
+        self.render(progressive_plot)
+        self.assertEqual(renderer.render_progress, 0.25)
+        self.refine()
+        self.assertEqual(renderer.render_progress, 1.0)
+        # The strokes of the chunks only differ where they meet
+        difference = abs(
+            self.render(plot).astype(int) - self.render(progressive_plot)
+        )
+        self.assertLess((difference.max(axis=2) > 0).sum(), 50)
+
+    def test_range_change_restarts(self):
+        plot, _ = self.create_plot("scatter", False)
+        progressive_plot, renderer = self.create_plot("scatter", True)
+        self.render(progressive_plot)
+        self.scheduled.pop()()
+        stale_callback = self.scheduled.pop()
+
+        for p in (plot, progressive_plot):
+            p.index_range.set_bounds(10.0, 90.0)
+        stale_callback()
+        self.assertEqual(self.scheduled, [])
+
+        self.render(progressive_plot)
+        self.assertEqual(renderer.render_progress, 0.25)
+        self.refine()
+        self.assertEqual(
+            (self.render(plot) != self.render(progressive_plot)).sum(), 0
+        )
+
+    def test_few_points_drawn_at_once(self):
+        plot, renderer = self.create_plot("scatter", True)
+        renderer.progressive_chunk_size = 20000
+        self.render(plot)
+        self.assertEqual(renderer.render_progress, 1.0)
+        self.assertEqual(self.scheduled, [])
+
+    def test_density_drawn_at_once(self):
+        plot, renderer = self.create_plot(
+            "scatter", True, render_mode="density"
+        )
+        self.render(plot)
+        self.assertEqual(renderer.render_progress, 1.0)
+        self.assertEqual(self.scheduled, [])
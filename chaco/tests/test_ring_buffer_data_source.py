@@ -0,0 +1,182 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+"""
+Tests of RingBufferDataSource and MultiRingBufferDataSource behavior.
+"""
+
+import unittest
+
+from numpy import (
+    arange,
+    array,
+    int64,
+    isnan,
+    nan,
+    nanmax,
+    nanmin,
+    ones,
+    random,
+)
+from numpy.testing import assert_array_equal
+
+from chaco.api import (
+    create_line_plot,
+    DataRange1D,
+    MultiRingBufferDataSource,
+    RingBufferDataSource,
+)
+from traits.testing.api import UnittestTools
+
+
+class RingBufferDataSourceTestCase(UnittestTools, unittest.TestCase):
+    def test_push(self):
+        data_source = RingBufferDataSource(capacity=5)
+
+        with self.assertTraitChanges(data_source, "data_changed", count=1):
+            data_source.push([3.0, 1.0, 2.0])
+
+        assert_array_equal(data_source.get_data(), [3.0, 1.0, 2.0])
+        self.assertEqual(data_source.get_bounds(), (1.0, 3.0))
+        self.assertEqual(data_source.get_size(), 3)
+
+    def test_push_discards_oldest(self):
+        data_source = RingBufferDataSource(capacity=5)
+        for i in range(4):
+            data_source.push(arange(3.0 * i, 3.0 * i + 3))
+
+        assert_array_equal(data_source.get_data(), arange(7.0, 12.0))
+        self.assertEqual(data_source.get_bounds(), (7.0, 11.0))
+
+    def test_push_more_than_capacity(self):
+        data_source = RingBufferDataSource(capacity=5)
+        data_source.push(arange(12.0))
+        assert_array_equal(data_source.get_data(), arange(7.0, 12.0))
+
+    def test_data_is_contiguous_view(self):
+        data_source = RingBufferDataSource(capacity=100)
+        for i in range(50):
+            data_source.push(arange(7.0))
+            data = data_source.get_data()
+            self.assertTrue(data.flags.c_contiguous)
+            self.assertIs(data.base, data_source._storage)
+
+    def test_bounds_match_window(self):
+        rs = random.RandomState(0)
+        data_source = RingBufferDataSource(capacity=1000)
+        pushed = []
+        for i in range(200):
+            values = rs.normal(size=rs.randint(0, 300))
+            values[rs.uniform(size=len(values)) < 0.05] = nan
+            pushed.extend(values)
+            data_source.push(values)
+
+            window = array(pushed[-1000:])
+            assert_array_equal(data_source.get_data(), window)
+            self.assertEqual(
+                data_source.get_bounds(), (nanmin(window), nanmax(window))
+            )
+
+    def test_bounds_all_nans(self):
+        data_source = RingBufferDataSource(capacity=5)
+        data_source.push([nan, nan])
+        low, high = data_source.get_bounds()
+        self.assertTrue(isnan(low))
+        self.assertTrue(isnan(high))
+
+        data_source.push([2.0])
+        self.assertEqual(data_source.get_bounds(), (2.0, 2.0))
+
+    def test_set_data(self):
+        data_source = RingBufferDataSource(capacity=5)
+        data_source.push(arange(4.0))
+        data_source.set_data(arange(10.0, 17.0))
+
+        assert_array_equal(data_source.get_data(), arange(12.0, 17.0))
+        self.assertEqual(data_source.get_bounds(), (12.0, 16.0))
+
+    def test_ascending(self):
+        data_source = RingBufferDataSource(capacity=5, sort_order="ascending")
+        data_source.push(arange(8.0))
+        self.assertEqual(data_source.get_bounds(), (3.0, 7.0))
+        self.assertEqual(data_source.reverse_map(5.5), 2)
+
+    def test_tracking_data_range(self):
+        data_source = RingBufferDataSource(capacity=100)
+        data_range = DataRange1D(
+            data_source, low_setting="track", tracking_amount=10.0
+        )
+        data_source.push(arange(50.0))
+        self.assertEqual((data_range.low, data_range.high), (39.0, 49.0))
+
+        data_source.push(arange(50.0, 60.0))
+        self.assertEqual((data_range.low, data_range.high), (49.0, 59.0))
+
+    def test_line_plot(self):
+        index = RingBufferDataSource(capacity=100, sort_order="ascending")
+        value = RingBufferDataSource(capacity=100)
+        plot = create_line_plot(([], []))
+        plot.index = index
+        plot.value = value
+        plot.index_range.add(index)
+        plot.value_range.add(value)
+        plot.outer_bounds = [200, 100]
+        plot.do_layout(force=True)
+
+        index.push(arange(150.0))
+        value.push(arange(150.0) ** 2)
+        plot._gather_points()
+
+        self.assertEqual(plot.index_range.low, 50.0)
+        points = plot._cached_data_pts
+        self.assertEqual(len(points), 1)
+        assert_array_equal(points[0][:, 0], arange(50.0, 150.0))
+
+
+class MultiRingBufferDataSourceTestCase(unittest.TestCase):
+    def test_push(self):
+        data_source = MultiRingBufferDataSource(capacity=4, n_columns=3)
+        data_source.push(arange(18.0).reshape(6, 3))
+
+        self.assertEqual(data_source.get_size(), 4)
+        self.assertEqual(data_source.get_value_size(), 3)
+        assert_array_equal(data_source.get_data(1), [7.0, 10.0, 13.0, 16.0])
+        self.assertTrue(data_source.get_data(1).flags.c_contiguous)
+        self.assertEqual(data_source.get_bounds(), (6.0, 17.0))
+        self.assertEqual(data_source.get_bounds(value=2), (8.0, 17.0))
+        self.assertEqual(data_source.get_bounds(value=int64(2)), (8.0, 17.0))
+
+    def test_push_too_few_columns(self):
+        data_source = MultiRingBufferDataSource(capacity=4, n_columns=3)
+        with self.assertRaises(ValueError):
+            data_source.push(ones((2, 2)))
+        self.assertEqual(data_source.get_size(), 0)
+
+    def test_push_too_many_columns(self):
+        data_source = MultiRingBufferDataSource(capacity=4, n_columns=3)
+        with self.assertRaises(ValueError):
+            data_source.push(ones((2, 4)))
+        self.assertEqual(data_source.get_size(), 0)
+
+    def test_push_1d_row(self):
+        data_source = MultiRingBufferDataSource(capacity=4, n_columns=3)
+        with self.assertRaises(ValueError):
+            data_source.push(ones(3))
+        self.assertEqual(data_source.get_size(), 0)
+
+    def test_column_sources(self):
+        data_source = MultiRingBufferDataSource(capacity=4, n_columns=2)
+        column = data_source.column_sources[1]
+        data_range = DataRange1D(column)
+
+        data_source.push(array([[0.0, 5.0], [1.0, -5.0]]))
+
+        assert_array_equal(column.get_data(), [5.0, -5.0])
+        self.assertEqual((data_range.low, data_range.high), (-5.0, 5.0))
@@ -10,16 +10,15 @@
 
 import unittest
 
-from numpy import alltrue, array, ravel, zeros, isinf, linspace
+from numpy import arange, array, full, inf, linspace, nan, random, zeros
+from numpy.testing import assert_array_almost_equal, assert_array_equal
 
+from chaco import _speedups_fallback
 
-def assert_close(desired, actual):
-    diff_allowed = 1e-5
-    diff = abs(ravel(actual) - ravel(desired))
-    for d in diff:
-        if not isinf(d):
-            assert alltrue(d <= diff_allowed)
-            return
+try:
+    from chaco import _cython_speedups
+except ImportError:
+    _cython_speedups = None
 
 
 class GatherPointsBase(object):
@@ -31,15 +30,35 @@ class GatherPointsBase(object):
     def test_basic(self):
         index = linspace(0.0, 20.0, 21)
         value = linspace(0.0, 1.0, 21)
-        points, selection = self.func(index, 4.5, 14.5, value, -1.0, 2.4)
+        points, point_mask, selection = self.func(
+            index, 4.5, 14.5, value, -1.0, 2.4
+        )
         desired = array(
             [
                 [5, 6, 7, 8, 9, 10, 11, 12, 13, 14],
-                [0.25, 0.3, 0.35, 0.4, 0.45, 0.5, 0.55, 0.6, 0.65, 0.8],
+                [0.25, 0.3, 0.35, 0.4, 0.45, 0.5, 0.55, 0.6, 0.65, 0.7],
             ]
         ).T
-        self.assertTrue(selection == None)
-        assert_close(desired, points)
+        self.assertIsNone(selection)
+        assert_array_almost_equal(points, desired)
+        assert_array_equal(point_mask.nonzero()[0], arange(5, 15))
+
+    def test_inclusive_range(self):
+        index = array([0.0, 1.0, 2.0])
+        value = array([5.0, 6.0, 7.0])
+        points, point_mask, selection = self.func(
+            index, 1.0, 2.0, value, 5.0, 6.0
+        )
+        assert_array_equal(points, [[1.0, 6.0]])
+
+    def test_non_finite(self):
+        index = array([0.0, nan, 2.0, inf, 4.0])
+        value = array([0.0, 1.0, nan, 3.0, 4.0])
+        points, point_mask, selection = self.func(
+            index, -inf, inf, value, -inf, inf
+        )
+        assert_array_equal(points, [[0.0, 0.0], [4.0, 4.0]])
+        assert_array_equal(point_mask, [True, False, False, False, True])
 
     def test_masked(self):
         index = linspace(0.0, 10.0, 11)
@@ -49,13 +68,13 @@ class GatherPointsBase(object):
         value_mask = zeros(11, dtype=bool)
         value_mask[4:8] = 1
 
-        points, selection = self.func(
+        points, point_mask, selection = self.func(
             index, 0, 10, value, 0, 1, index_mask=index_mask
         )
         desired = array([[2, 3, 4, 5], [0.2, 0.3, 0.4, 0.5]]).T
-        assert_close(desired, points)
+        assert_array_almost_equal(points, desired)
 
-        points, selection = self.func(
+        points, point_mask, selection = self.func(
             index,
             0,
             10,
@@ -66,14 +85,289 @@ class GatherPointsBase(object):
             value_mask=value_mask,
         )
         desired = array([[4, 0.4], [5, 0.5]])
-        assert_close(desired, points)
+        assert_array_almost_equal(points, desired)
 
     def test_selection(self):
-        pass
+        index = linspace(0.0, 10.0, 11)
+        value = linspace(0.0, 1.0, 11)
+        selection_mask = zeros(11, dtype=bool)
+        selection_mask[[1, 3, 8]] = True
 
-    def test_selection_range(self):
-        pass
+        points, point_mask, selection = self.func(
+            index, 2.0, 9.0, value, 0, 1, selection_mask=selection_mask
+        )
+
+        self.assertEqual(len(selection), len(points))
+        assert_array_almost_equal(points[selection], [[3, 0.3], [8, 0.8]])
+
+    def test_unmasked_points_not_copied(self):
+        index = linspace(0.0, 10.0, 11)
+        value = linspace(0.0, 1.0, 11)
+        points, point_mask, selection = self.func(
+            index, 0.0, 10.0, value, 0.0, 1.0
+        )
+        self.assertTrue(point_mask.all())
+        assert_array_equal(points[:, 0], index)
+        assert_array_equal(points[:, 1], value)
 
     @property
     def func(self):
-        return self.module.scatterplot_gather_points
+        return self.module.scatterplot_gather_points_and_mask
+
+
+class GatherPointsFallbackTestCase(GatherPointsBase, unittest.TestCase):
+    module = _speedups_fallback
+
+
+@unittest.skipIf(_cython_speedups is None, "Cython speedups not available")
+class GatherPointsCythonTestCase(GatherPointsBase, unittest.TestCase):
+    module = _cython_speedups
+
+    def test_matches_fallback(self):
+        rs = random.RandomState(0)
+        for i in range(100):
+            n = rs.randint(0, 30)
+            index = rs.uniform(-2.0, 3.0, n)
+            value = rs.uniform(-2.0, 3.0, n)
+            index[rs.uniform(size=n) < 0.1] = nan
+            value[rs.uniform(size=n) < 0.1] = inf
+            masks = [rs.uniform(size=n) < 0.8 for j in range(3)]
+            expected = _speedups_fallback.scatterplot_gather_points_and_mask(
+                index, 0.0, 1.0, value, -1.0, 2.0, *masks
+            )
+            result = self.func(index, 0.0, 1.0, value, -1.0, 2.0, *masks)
+            for actual, desired in zip(result, expected):
+                assert_array_equal(actual, desired)
+
+
+class GatherPointsCompatibilityTestCase(unittest.TestCase):
+    def test_basic(self):
+        index = linspace(0.0, 20.0, 21)
+        value = linspace(0.0, 1.0, 21)
+        points, selection = _speedups_fallback.scatterplot_gather_points(
+            index, 4.5, 14.5, value, -1.0, 2.4
+        )
+        self.assertIsNone(selection)
+        assert_array_equal(points[:, 0], arange(5.0, 15.0))
+
+    def test_masked(self):
+        index = linspace(0.0, 10.0, 11)
+        value = linspace(0.0, 1.0, 11)
+        index_mask = zeros(11, dtype=int)
+        index_mask[2:6] = 1
+        value_mask = zeros(11, dtype=bool)
+        value_mask[4:8] = True
+
+        points, selection = _speedups_fallback.scatterplot_gather_points(
+            index, 0, 10, value, 0, 1, index_mask, None, None, value_mask
+        )
+
+        assert_array_almost_equal(points, [[4, 0.4], [5, 0.5]])
+
+    def test_selection(self):
+        index = linspace(0.0, 10.0, 11)
+        value = linspace(0.0, 1.0, 11)
+        sel_mask = zeros(11, dtype=bool)
+        sel_mask[2:9] = True
+
+        points, selection = _speedups_fallback.scatterplot_gather_points(
+            index,
+            1,
+            10,
+            value,
+            0,
+            1,
+            index_sel=[0, 3, 8, 10],
+            value_sel_mask=sel_mask,
+        )
+
+        self.assertEqual(len(selection), len(points))
+        assert_array_almost_equal(points[selection], [[3, 0.3], [8, 0.8]])
+
+
+@unittest.skipIf(_cython_speedups is None, "Cython speedups not available")
+class IntersectRangeSpeedupTestCase(unittest.TestCase):
+    def test_matches_fallback(self):
+        rs = random.RandomState(0)
+        for i in range(100):
+            n = rs.randint(0, 30)
+            x = rs.uniform(-2.0, 3.0, n)
+            x[rs.uniform(size=n) < 0.2] = nan
+            x[rs.uniform(size=n) < 0.05] = inf
+            mask = rs.uniform(size=n) < 0.8
+            for m in (None, mask):
+                assert_array_equal(
+                    _cython_speedups.intersect_range(x, 0.0, 1.0, m),
+                    _speedups_fallback.intersect_range(x, 0.0, 1.0, m),
+                )
+
+    def test_integer_data(self):
+        x = array([-2, -1, 0, 1, 2, 3])
+        assert_array_equal(
+            _cython_speedups.intersect_range(x, 0.5, 1.5),
+            [False, False, True, True, True, False],
+        )
+
+
+class MapColorsUint8Base(object):
+
+    # The module to look for the color mapping functions in; subclasses
+    # should override this.
+    module = None
+
+    def setUp(self):
+        ramp = arange(256, dtype="uint8")
+        self.luts = [
+            ramp, ramp[::-1].copy(), ramp // 2, full(256, 255, "uint8")
+        ]
+
+    def test_map_colors_out(self):
+        data = array([[0.0, 0.5], [1.0, nan]])
+        out = zeros((2, 2, 4), dtype="uint8")
+
+        result = self.module.map_colors_uint8(
+            data, 256, 0.0, 1.0, *self.luts, out=out
+        )
+
+        self.assertIs(result, out)
+        assert_array_equal(
+            result,
+            [
+                [[0, 255, 0, 255], [127, 128, 63, 255]],
+                [[255, 0, 127, 255], [0, 0, 0, 0]],
+            ],
+        )
+
+    def test_map_colors_bad_out(self):
+        with self.assertRaises(ValueError):
+            self.module.map_colors_uint8(
+                zeros(4), 256, 0.0, 1.0, *self.luts, out=zeros((4, 3), "uint8")
+            )
+
+    def test_gather_colors(self):
+        lut = random.RandomState(0).randint(0, 256, (65536, 4)).astype("uint8")
+        data = array([[0, 1], [65535, 300]], dtype="uint16")
+
+        result = self.module.gather_colors_uint8(data, lut)
+
+        assert_array_equal(result, lut[data])
+
+    def test_gather_colors_out(self):
+        lut = random.RandomState(0).randint(0, 256, (256, 4)).astype("uint8")
+        data = arange(256, dtype="uint8")[::-3]
+        out = zeros(data.shape + (4,), dtype="uint8")
+
+        result = self.module.gather_colors_uint8(data, lut, out=out)
+
+        self.assertIs(result, out)
+        assert_array_equal(result, lut[data])
+
+    def test_gather_colors_bad_input(self):
+        lut = zeros((256, 4), dtype="uint8")
+        with self.assertRaises(ValueError):
+            self.module.gather_colors_uint8(zeros(4, "int32"), lut)
+        with self.assertRaises(ValueError):
+            self.module.gather_colors_uint8(zeros(4, "uint16"), lut)
+
+
+class MapColorsUint8FallbackTestCase(MapColorsUint8Base, unittest.TestCase):
+    module = _speedups_fallback
+
+
+@unittest.skipIf(_cython_speedups is None, "Cython speedups not available")
+class MapColorsUint8CythonTestCase(MapColorsUint8Base, unittest.TestCase):
+    module = _cython_speedups
+
+    def test_float_types_match(self):
+        data = random.RandomState(0).uniform(-0.5, 1.5, (50, 40))
+
+        expected = self.module.map_colors_uint8(
+            data.astype("float32"), 256, 0.0, 1.0, *self.luts
+        )
+        result = self.module.map_colors_uint8(data, 256, 0.0, 1.0, *self.luts)
+
+        assert_array_equal(result, expected)
+
+
+class BinPointsBase(object):
+
+    # The module to look for the bin_points function in; subclasses should
+    # override this.
+    module = None
+
+    def setUp(self):
+        self.points = array(
+            [
+                [0.5, 0.5],
+                [1.5, 0.5],
+                [1.2, 0.9],
+                [0.5, 2.5],
+                [-0.5, 0.5],
+                [3.0, 0.5],
+                [nan, 0.5],
+            ]
+        )
+        self.values = array([1.0, 2.0, 4.0, nan, 8.0, 16.0, 32.0])
+
+    def test_count(self):
+        bins = self.module.bin_points(self.points, 0.0, 0.0, 1.0, 3, 3)
+
+        assert_array_equal(bins, [[1, 2, 0], [0, 0, 0], [1, 0, 0]])
+
+    def test_bin_size(self):
+        bins = self.module.bin_points(self.points, 0.0, 0.0, 2.0, 2, 2)
+
+        assert_array_equal(bins, [[3, 1], [1, 0]])
+
+    def test_mean(self):
+        bins = self.module.bin_points(
+            self.points, 0.0, 0.0, 1.0, 3, 3, self.values, "mean"
+        )
+
+        assert_array_equal(
+            bins, [[1, 3, nan], [nan, nan, nan], [nan, nan, nan]]
+        )
+
+    def test_max(self):
+        bins = self.module.bin_points(
+            self.points, 0.0, 0.0, 1.0, 3, 3, self.values, "max"
+        )
+
+        assert_array_equal(
+            bins, [[1, 4, nan], [nan, nan, nan], [nan, nan, nan]]
+        )
+
+    def test_bad_input(self):
+        with self.assertRaises(ValueError):
+            self.module.bin_points(self.points, 0.0, 0.0, 1.0, 3, 3, None,
+                                   "mean")
+        with self.assertRaises(ValueError):
+            self.module.bin_points(self.points, 0.0, 0.0, 1.0, 3, 3,
+                                   self.values[:3], "max")
+        with self.assertRaises(ValueError):
+            self.module.bin_points(self.points, 0.0, 0.0, 1.0, 3, 3,
+                                   self.values, "median")
+
+
+class BinPointsFallbackTestCase(BinPointsBase, unittest.TestCase):
+    module = _speedups_fallback
+
+
+@unittest.skipIf(_cython_speedups is None, "Cython speedups not available")
+class BinPointsCythonTestCase(BinPointsBase, unittest.TestCase):
+    module = _cython_speedups
+
+    def test_matches_fallback(self):
+        rs = random.RandomState(0)
+        points = rs.uniform(-1.0, 11.0, (5000, 2))
+        points[rs.uniform(size=5000) < 0.05] = nan
+        values = rs.normal(size=5000)
+        values[rs.uniform(size=5000) < 0.1] = nan
+        for reduction in ("count", "mean", "max"):
+            expected = _speedups_fallback.bin_points(
+                points, 0.0, 0.0, 0.75, 12, 9, values, reduction
+            )
+            result = self.module.bin_points(
+                points, 0.0, 0.0, 0.75, 12, 9, values, reduction
+            )
+            assert_array_almost_equal(result, expected)
@@ -0,0 +1,103 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+"""
+Tests for the spatial subdivision used to accelerate hit-testing.
+"""
+import unittest
+
+from numpy import array, arange, nan, random
+from numpy.testing import assert_array_equal
+
+from chaco.api import create_scatter_plot
+from chaco.subdivision_grid import SubdivisionGrid
+
+
+class SubdivisionGridTestCase(unittest.TestCase):
+    def test_query_contains_region(self):
+        rs = random.RandomState(0)
+        x = rs.uniform(0, 10, 1000)
+        y = rs.uniform(0, 10, 1000)
+        grid = SubdivisionGrid(x, y)
+
+        result = grid.query(2.0, 3.0, 5.0, 7.5)
+
+        inside = (x >= 2.0) & (x <= 3.0) & (y >= 5.0) & (y <= 7.5)
+        self.assertTrue(set(inside.nonzero()[0]).issubset(result))
+        assert_array_equal(result, sorted(result))
+
+    def test_nans_not_indexed(self):
+        x = array([0.0, nan, 2.0, 3.0])
+        y = array([0.0, 1.0, nan, 3.0])
+        grid = SubdivisionGrid(x, y)
+
+        self.assertEqual(grid.size, 2)
+        assert_array_equal(grid.query(-1.0, 4.0, -1.0, 4.0), [0, 3])
+
+    def test_query_outside(self):
+        grid = SubdivisionGrid(arange(10.0), arange(10.0))
+        self.assertEqual(len(grid.query(20.0, 30.0, 0.0, 10.0)), 0)
+
+    def test_empty(self):
+        grid = SubdivisionGrid(array([nan]), array([nan]))
+        self.assertEqual(len(grid.query(0.0, 1.0, 0.0, 1.0)), 0)
+
+
+class ScatterSubdivisionTestCase(unittest.TestCase):
+    def make_plots(self, orientation):
+        rs = random.RandomState(1)
+        x = rs.normal(size=5000)
+        y = rs.normal(size=5000)
+        # Points that are not drawn can't be hit.
+        x[::50] = nan
+        y[::50] = nan
+        plots = []
+        for use_subdivision in (False, True):
+            plot = create_scatter_plot(
+                (x, y),
+                orientation=orientation,
+                use_subdivision=use_subdivision,
+            )
+            plot.outer_bounds = [400, 300]
+            plot.do_layout(force=True)
+            plots.append(plot)
+        return plots
+
+    def test_matches_brute_force(self):
+        rs = random.RandomState(2)
+        screen_pts = rs.uniform(-10, 410, size=(30, 2))
+        for orientation in ("h", "v"):
+            brute, subdivided = self.make_plots(orientation)
+            self.assertIsNotNone(subdivided._subdivision)
+            for screen_pt in screen_pts:
+                for threshold in (0.0, 2.0, 8.0):
+                    for index_only in (False, True):
+                        self.assertEqual(
+                            brute.map_index(
+                                screen_pt, threshold, index_only=index_only
+                            ),
+                            subdivided.map_index(
+                                screen_pt, threshold, index_only=index_only
+                            ),
+                        )
+                self.assertEqual(
+                    brute.hittest(screen_pt), subdivided.hittest(screen_pt)
+                )
+
+    def test_rebuilt_on_data_changed(self):
+        plot = create_scatter_plot(
+            (arange(10.0), arange(10.0)), use_subdivision=True
+        )
+        old_subdivision = plot._subdivision
+
+        plot.index.set_data(arange(10.0) + 100)
+
+        self.assertIsNot(plot._subdivision, old_subdivision)
+        self.assertEqual(plot._subdivision.xmin, 100.0)
@@ -0,0 +1,30 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+import os
+import threading
+import unittest
+
+from chaco.thread_pool import get_thread_pool
+
+
+class ThreadPoolTestCase(unittest.TestCase):
+    def test_pool_is_shared(self):
+        self.assertIs(get_thread_pool(), get_thread_pool())
+
+    def test_pool_size(self):
+        pool = get_thread_pool()
+
+        self.assertEqual(pool._max_workers, os.cpu_count() or 1)
+
+    def test_runs_in_other_thread(self):
+        future = get_thread_pool().submit(threading.get_ident)
+
+        self.assertNotEqual(future.result(), threading.get_ident())
@@ -0,0 +1,36 @@
+# (C) Copyright 2005-2021 Enthought, Inc., Austin, TX
+# All rights reserved.
+#
+# This software is provided without warranty under the terms of the BSD
+# license included in LICENSE.txt and may be redistributed only under
+# the conditions described in the aforementioned license. The license
+# is also available online at http://www.enthought.com/licenses/BSD.txt
+#
+# Thanks for using Enthought open source!
+
+""" Defines the thread pool shared by the renderers for parallel work.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+from threading import Lock
+
+# The shared pool, created the first time it is needed
+_thread_pool = None
+_thread_pool_lock = Lock()
+
+
+def get_thread_pool():
+    """The thread pool shared by the renderers, with one thread per CPU
+
+    The pool is created by the first call and reused afterwards, so the cost
+    of starting the threads is only paid once rather than on every redraw.
+    Work submitted to the pool must not wait for other work in the pool.
+    """
+    global _thread_pool
+    with _thread_pool_lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(
+                os.cpu_count() or 1, thread_name_prefix="chaco"
+            )
+        return _thread_pool
@@ -76,15 +76,15 @@ class ImageInspectorTool(BaseTool):
                 x_index, y_index = ndx
                 image_data = plot.value
                 if (
-                    hasattr(plot, "_cached_mapped_image")
-                    and plot._cached_mapped_image is not None
+                    hasattr(plot, "_tile_cache")
+                    and len(plot._tile_cache) > 0
                 ):
                     self.new_value = {
                         "indices": ndx,
                         "data_value": image_data.data[y_index, x_index],
-                        "color_value": plot._cached_mapped_image[
-                            y_index, x_index
-                        ],
+                        "color_value": plot._mapped_sub_image(
+                            y_index, y_index + 1, x_index, x_index + 1
+                        )[0, 0],
                     }
 
                 else:
@@ -15,7 +15,10 @@ from numpy import inf
 
 # Enthought library imports
 from enable.api import BaseTool, Pointer, KeySpec
-from traits.api import Bool, Enum, Float, Tuple, Instance
+from traits.api import Any, Bool, Enum, Float, Tuple, Instance
+
+# Chaco imports
+from chaco.data_view import DataView
 
 
 class PanTool(BaseTool):
@@ -61,6 +64,12 @@ class PanTool(BaseTool):
     #: Restrict to the bounds of the plot data
     restrict_to_data = Bool(False)
 
+    #: While dragging, shift the previously drawn plot and only draw the
+    #: strips that the drag uncovers, instead of drawing the whole plot for
+    #: every mouse move (see **DataView.blit_panning**).  The plot is drawn
+    #: in full again when the drag ends.
+    blit_panning = Bool(False)
+
     # (x,y) of the point where the mouse button was pressed.
     _original_xy = Tuple
 
@@ -72,6 +81,9 @@ class PanTool(BaseTool):
     # set programmatically.
     _auto_constrain = Bool(False)
 
+    # The data view whose **blit_panning** was turned on by this drag.
+    _blit_view = Any
+
     # ------------------------------------------------------------------------
     # Inherited BaseTool traits
     # ------------------------------------------------------------------------
@@ -255,6 +267,8 @@ class PanTool(BaseTool):
                 self._auto_constrain = True
                 self.constrain_direction = None
         self.event_state = "panning"
+        if self.blit_panning:
+            self._start_blit_panning()
         if capture_mouse:
             event.window.set_pointer(self.drag_pointer)
             event.window.set_mouse_owner(self, event.net_transform())
@@ -265,7 +279,23 @@ class PanTool(BaseTool):
             self.constrain = False
             self.constrain_direction = None
         self.event_state = "normal"
+        self._end_blit_panning()
         event.window.set_pointer("arrow")
         if event.window.mouse_owner == self:
             event.window.set_mouse_owner(None)
         event.handled = True
+
+    def _start_blit_panning(self):
+        """Turns on the blit panning of the data view being panned"""
+        component = self.component
+        while component is not None and not isinstance(component, DataView):
+            component = component.container
+        if component is not None and not component.blit_panning:
+            component.blit_panning = True
+            self._blit_view = component
+
+    def _end_blit_panning(self):
+        """Turns off the blit panning, which draws the whole plot again"""
+        if self._blit_view is not None:
+            self._blit_view.blit_panning = False
+            self._blit_view = None
@@ -42,3 +42,27 @@ class PanToolTestCase(EnableTestAssistant, unittest.TestCase):
         self.mouse_up(interactor=tool, x=1.0, y=1.0)
         self.assertEqual((x_range.low, x_range.high), x_bounds)
         self.assertEqual((y_range.low, y_range.high), y_bounds)
+
+    def test_blit_panning_during_drag(self):
+        plot_data = ArrayPlotData(x=np.arange(10.0), y=np.arange(10.0))
+        plot = Plot(plot_data)
+        renderer = plot.plot(("x", "y"))[0]
+        tool = PanTool(renderer, blit_panning=True)
+        renderer.tools.append(tool)
+
+        self.mouse_down(tool, 0.0, 0.0)
+        self.assertTrue(plot.blit_panning)
+        self.mouse_move(interactor=tool, x=1.0, y=1.0)
+        self.assertTrue(plot.blit_panning)
+        self.mouse_up(interactor=tool, x=1.0, y=1.0)
+        self.assertFalse(plot.blit_panning)
+
+    def test_no_blit_panning_by_default(self):
+        plot_data = ArrayPlotData(x=np.arange(10.0), y=np.arange(10.0))
+        plot = Plot(plot_data)
+        tool = PanTool(plot)
+        plot.tools.append(tool)
+
+        self.mouse_down(tool, 0.0, 0.0)
+        self.assertFalse(plot.blit_panning)
+        self.mouse_up(interactor=tool, x=1.0, y=1.0)
@@ -312,8 +312,25 @@ if __name__ == "__main__":
         include_dirs=[numpy_include_dir],
     )
 
+    downsampling_m4 = Extension(
+        'chaco.downsample._m4',
+        sources=['chaco/downsample/_m4.pyx'],
+        include_dirs=[numpy_include_dir],
+    )
+
+    downsampling_simplify = Extension(
+        'chaco.downsample._simplify',
+        sources=['chaco/downsample/_simplify.pyx'],
+        include_dirs=[numpy_include_dir],
+    )
+
     cython_extensions = cythonize(
-        [cython_speedups, downsampling_lttb],
+        [
+            cython_speedups,
+            downsampling_lttb,
+            downsampling_m4,
+            downsampling_simplify,
+        ],
         language_level="3",
     )
     extensions = [contour] + cython_extensions